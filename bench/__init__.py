@@ -0,0 +1,5 @@
+"""
+Benchmarks for the NBT and world handling code paths.
+
+Run `python -m bench.run --help` from the project root.
+"""
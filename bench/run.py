@@ -0,0 +1,241 @@
+"""
+Benchmark runner
+
+Generates a synthetic saves folder in a temp directory and times the main
+operations on it:
+- WorldManager.scan_worlds (sequential, parallel, warm index)
+- WorldManager.load_world_data
+- WorldManager.save_attributes
+- mc_forcefill.forcefill_file
+- mc_best_equipment.process_file
+- mc_containers.world_containers (when --region-chunks is set)
+
+For every operation it reports calls, throughput, p50/p95 latency and the
+peak Python memory allocated during one pass (tracemalloc), plus the peak
+RSS of the whole run. Everything runs offline.
+
+Usage:
+    python -m bench.run
+    python -m bench.run --worlds 200 --inventory 36 --containers 27 --depth 2
+    python -m bench.run --json bench_output.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import tracemalloc
+
+from config.settings import Config
+from bench.synthetic import generate_saves, FORMATS
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if unknown)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Benchmark:
+    """Times a callable over a list of arguments"""
+
+    def __init__(self):
+        self.results = []
+
+    def measure(self, name, fn, args_list, setup=None):
+        """
+        Call fn(*args) for every args in args_list.
+
+        The timed pass runs without tracemalloc; a second, untimed pass
+        measures peak allocations. setup() runs before each pass.
+        """
+        if setup:
+            setup()
+        latencies = []
+        total_start = time.perf_counter()
+        for args in args_list:
+            start = time.perf_counter()
+            fn(*args)
+            latencies.append(time.perf_counter() - start)
+        total = time.perf_counter() - total_start
+
+        if setup:
+            setup()
+        tracemalloc.start()
+        for args in args_list:
+            fn(*args)
+        _, peak_alloc = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        result = {
+            "name": name,
+            "calls": len(latencies),
+            "total_s": total,
+            "per_s": len(latencies) / total if total > 0 else 0.0,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "peak_alloc_mb": peak_alloc / (1024 * 1024),
+        }
+        self.results.append(result)
+        return result
+
+    def report(self):
+        header = f"{'operation':<32} {'calls':>6} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'alloc MB':>9}"
+        lines = [header, "-" * len(header)]
+        for r in self.results:
+            lines.append(
+                f"{r['name']:<32} {r['calls']:>6} {r['per_s']:>9.1f} "
+                f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['peak_alloc_mb']:>9.2f}"
+            )
+        rss = peak_rss_mb()
+        if rss is not None:
+            lines.append(f"\nPeak RSS: {rss:.1f} MB")
+        return "\n".join(lines)
+
+
+def run(args):
+    # Imported here so the benchmark measures them in a configured process
+    from core.world_manager import WorldManager
+    from core.player_files import expand_targets
+    from core.mc_forcefill import forcefill_file
+    from core.mc_best_equipment import process_file
+    from core.mc_containers import world_containers
+
+    work_dir = tempfile.mkdtemp(prefix="mc_bench_")
+    saves = os.path.join(work_dir, "saves")
+    # Keep benchmark backups out of the user's real backup store
+    Config.BACKUP_STORE_PATH = os.path.join(work_dir, "backups")
+
+    def regenerate():
+        shutil.rmtree(saves, ignore_errors=True)
+        generate_saves(
+            saves,
+            worlds=args.worlds,
+            formats=args.formats,
+            players_per_world=args.players,
+            inventory_size=args.inventory,
+            container_items=args.containers,
+            depth=args.depth,
+            region_chunks=args.region_chunks,
+            seed=args.seed,
+        )
+
+    bench = Benchmark()
+    try:
+        regenerate()
+        player_files = [(f,) for f in expand_targets([saves])]
+
+        manager = WorldManager()
+        bench.measure(
+            "scan_worlds (sequential)",
+            lambda: manager.scan_worlds(saves, workers=1, use_index=False),
+            [()] * args.repeat
+        )
+        bench.measure(
+            f"scan_worlds ({args.workers} threads)",
+            lambda: manager.scan_worlds(saves, workers=args.workers, use_index=False),
+            [()] * args.repeat
+        )
+        manager.scan_worlds(saves)  # build the index
+        bench.measure(
+            "scan_worlds (warm index)",
+            lambda: manager.scan_worlds(saves),
+            [()] * args.repeat
+        )
+
+        singleplayer = [
+            (info.path,) for info in manager.worlds.values()
+            if info.is_singleplayer and info.player_data_path
+        ]
+
+        def load_uncached(world_path):
+            manager.nbt_cache.clear()
+            manager.load_world_data(world_path)
+
+        bench.measure("load_world_data (cold)", load_uncached, singleplayer)
+        bench.measure("load_world_data (cached)", manager.load_world_data, singleplayer)
+
+        counter = iter(range(10 ** 9))
+
+        def save_attributes(world_path):
+            manager.save_attributes(world_path, {
+                "XpLevel": next(counter) % 100,
+                "minecraft:max_health": 20.0,
+            })
+
+        bench.measure("save_attributes", save_attributes, singleplayer)
+
+        if args.region_chunks:
+            world_paths = [(info.path,) for info in manager.worlds.values()]
+            bench.measure(
+                "world_containers",
+                lambda world_path: sum(1 for _ in world_containers(world_path)),
+                world_paths
+            )
+
+        bench.measure("forcefill_file", forcefill_file, player_files, setup=regenerate)
+        bench.measure("best_equipment.process_file", process_file, player_files, setup=regenerate)
+    finally:
+        if args.keep:
+            print(f"Synthetic saves kept in {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return bench
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--worlds", type=int, default=30, help="Number of worlds (default: 30)")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS),
+                        help="World layouts to cycle through")
+    parser.add_argument("--players", type=int, default=4, help="Players per multiplayer world")
+    parser.add_argument("--inventory", type=int, default=36, help="Filled inventory slots")
+    parser.add_argument("--containers", type=int, default=0,
+                        help="Items inside every 4th slot's shulker box (default: 0)")
+    parser.add_argument("--depth", type=int, default=1, help="Shulker box nesting depth")
+    parser.add_argument("--region-chunks", type=int, default=0,
+                        help="Chunks with chests in each world's region file (default: 0)")
+    parser.add_argument("--workers", type=int, default=Config.SCAN_WORKERS, help="Parallel scan workers")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions of the scan benchmarks")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--json", metavar="FILE", help="Also write the results as JSON")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated saves")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    bench = run(args)
+    print(bench.report())
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "args": vars(args),
+                "results": bench.results,
+                "peak_rss_mb": peak_rss_mb(),
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Start up budget check
+
+Imports each entry module in a fresh interpreter and fails (exit status 1)
+when:
+- a module that must load lazily (nbtlib, numpy, the process pool) is
+  imported at start up, or
+- the median cold import time is over the budget.
+
+Run it after changing imports, or in CI:
+    python -m bench.startup
+    python -m bench.startup --budget-ms 150 --repeat 7
+"""
+import sys
+import json
+import argparse
+import subprocess
+
+from bench.run import percentile
+
+# Modules whose start up cost is checked
+ENTRY_MODULES = ["ui.main_window", "cli"]
+
+# Modules that must only load on first use
+LAZY_MODULES = ["nbtlib", "numpy", "concurrent.futures.process"]
+
+# Runs in the child interpreter: time the import, report what got loaded
+_PROBE = """
+import sys, json, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [m for m in {lazy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure_import(module, repeat):
+    """
+    Import module in `repeat` fresh interpreters
+
+    Returns:
+        tuple: (list of import times in seconds, lazy modules that got loaded)
+    """
+    times = []
+    loaded = set()
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, lazy=LAZY_MODULES)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output)
+        times.append(result["seconds"])
+        loaded.update(result["loaded"])
+    return times, sorted(loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="Maximum median import time per module (default: 150)")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module")
+    args = parser.parse_args()
+
+    failures = 0
+    for module in ENTRY_MODULES:
+        times, loaded = measure_import(module, args.repeat)
+        median_ms = percentile(times, 0.50) * 1000
+        ok = median_ms <= args.budget_ms and not loaded
+        failures += not ok
+
+        print(f"{'✓' if ok else '✗'} {module:<20} {median_ms:7.1f} ms (budget {args.budget_ms:.0f} ms)")
+        for name in loaded:
+            print(f"    {name} is imported at start up, it should load on first use")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
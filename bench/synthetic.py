@@ -0,0 +1,221 @@
+"""
+Synthetic Saves - Generate fake Minecraft saves folders for benchmarks
+
+Every world gets a level.dat and player data in one of three layouts:
+- "old": player embedded in level.dat (Data.Player)
+- "new": Data.singleplayer_uuid + players/data/<uuid>.dat
+- "multi": no player in level.dat, several playerdata/<uuid>.dat files
+
+Player inventories can be filled with shulker boxes holding nested
+containers (minecraft:container components), which is what makes real
+player files big.
+
+Worlds can also get a region/r.0.0.mca with chests in every chunk, plus
+block data padding so chunks are as big as real ones.
+"""
+import io
+import os
+import uuid
+import zlib
+import struct
+import random
+
+import nbtlib
+from nbtlib.tag import Compound, List, String, Byte, Int, Long, Double, Float, IntArray, LongArray
+
+FORMATS = ("old", "new", "multi")
+
+ITEM_IDS = [
+    "minecraft:stone", "minecraft:dirt", "minecraft:oak_log", "minecraft:torch",
+    "minecraft:diamond", "minecraft:iron_ingot", "minecraft:bread",
+    "minecraft:diamond_sword", "minecraft:iron_pickaxe", "minecraft:bow",
+    "minecraft:ender_pearl", "minecraft:oak_sign", "minecraft:bucket",
+]
+
+ATTRIBUTES = {
+    "minecraft:max_health": 20.0,
+    "minecraft:movement_speed": 0.1,
+    "minecraft:attack_damage": 1.0,
+    "minecraft:armor": 0.0,
+    "minecraft:luck": 0.0,
+}
+
+
+def _uuid_ints(player_uuid):
+    raw = player_uuid.bytes
+    return [int.from_bytes(raw[i:i + 4], "big", signed=True) for i in range(0, 16, 4)]
+
+
+def make_item(rng, slot=None, container_items=0, depth=0):
+    """A random item; shulker boxes hold container_items items, nested depth levels"""
+    if container_items and depth > 0:
+        contents = [
+            Compound({
+                "slot": Int(i),
+                "item": make_item(rng, None, container_items, depth - 1),
+            })
+            for i in range(container_items)
+        ]
+        item = Compound({
+            "id": String("minecraft:shulker_box"),
+            "count": Int(1),
+            "components": Compound({
+                "minecraft:container": List[Compound](contents),
+            }),
+        })
+    else:
+        item = Compound({
+            "id": String(rng.choice(ITEM_IDS)),
+            "count": Int(rng.randint(1, 16)),
+        })
+
+    if slot is not None:
+        item["Slot"] = Byte(slot)
+    return item
+
+
+def make_player(rng, inventory_size=36, container_items=0, depth=1, ender_size=0):
+    """A player compound with inventory, ender chest and attributes"""
+    inventory = [
+        make_item(rng, slot, container_items if slot % 4 == 0 else 0, depth)
+        for slot in range(inventory_size)
+    ]
+    ender_items = [make_item(rng, slot) for slot in range(ender_size)]
+    attributes = [
+        Compound({"id": String(name), "base": Double(value)})
+        for name, value in ATTRIBUTES.items()
+    ]
+    return Compound({
+        "Inventory": List[Compound](inventory),
+        "EnderItems": List[Compound](ender_items),
+        "attributes": List[Compound](attributes),
+        "XpLevel": Int(rng.randint(0, 30)),
+        "Health": Float(20.0),
+        "Pos": List[Double]([Double(rng.uniform(-1000, 1000)) for _ in range(3)]),
+    })
+
+
+def make_chunk(rng, chunk_x, chunk_z, containers=4, container_size=27):
+    """A chunk compound with `containers` chests and some block data"""
+    block_entities = [
+        Compound({
+            "id": String("minecraft:chest"),
+            "x": Int(chunk_x * 16 + i % 16),
+            "y": Int(64 + i // 16),
+            "z": Int(chunk_z * 16),
+            "Items": List[Compound]([make_item(rng, slot) for slot in range(container_size)]),
+        })
+        for i in range(containers)
+    ]
+    sections = [
+        Compound({
+            "Y": Byte(y),
+            "block_states": Compound({
+                "data": LongArray([rng.getrandbits(63) for _ in range(256)]),
+            }),
+        })
+        for y in range(-4, 4)
+    ]
+    return Compound({
+        "xPos": Int(chunk_x),
+        "zPos": Int(chunk_z),
+        "DataVersion": Int(4189),
+        "sections": List[Compound](sections),
+        "block_entities": List[Compound](block_entities),
+    })
+
+
+def make_region(path, rng, chunks=64, containers=4, container_size=27):
+    """
+    Write an Anvil region file with the first `chunks` chunks of r.0.0
+    (zlib compressed, one or more 4 KiB sectors each)
+    """
+    locations = [0] * 1024
+    body = io.BytesIO()
+    sector = 2  # after the location and timestamp tables
+
+    for index in range(min(chunks, 1024)):
+        raw = io.BytesIO()
+        chunk = make_chunk(rng, index % 32, index // 32, containers, container_size)
+        nbtlib.File(chunk).write(raw, "big")
+        data = zlib.compress(raw.getvalue())
+        payload = struct.pack(">iB", len(data) + 1, 2) + data
+        sectors = -(-len(payload) // 4096)
+        body.write(payload.ljust(sectors * 4096, b"\0"))
+        locations[index] = (sector << 8) | sectors
+        sector += sectors
+
+    with open(path, "wb") as f:
+        f.write(struct.pack(">1024I", *locations))
+        f.write(b"\0" * 4096)
+        f.write(body.getvalue())
+
+
+def _save(compound, path):
+    nbtlib.File(compound, gzipped=True).save(path)
+
+
+def generate_saves(root, worlds=10, formats=FORMATS, players_per_world=4,
+                   inventory_size=36, container_items=0, depth=1, region_chunks=0,
+                   seed=0):
+    """
+    Create `worlds` worlds under root, cycling through `formats`
+
+    Args:
+        root: Saves directory to create
+        worlds: Number of worlds
+        formats: Layouts to cycle through ("old", "new", "multi")
+        players_per_world: Player files in "multi" worlds
+        inventory_size: Filled inventory slots per player
+        container_items: Items inside every 4th slot's shulker box (0 = none)
+        depth: Nesting depth of shulker boxes inside shulker boxes
+        region_chunks: Chunks (with chests) in each world's region/r.0.0.mca
+        seed: Random seed, the same arguments always give the same files
+
+    Returns:
+        list of world directory paths
+    """
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    world_paths = []
+
+    def player():
+        return make_player(rng, inventory_size, container_items, depth)
+
+    for index in range(worlds):
+        world_format = formats[index % len(formats)]
+        world_path = os.path.join(root, f"world_{index:04d}")
+        os.makedirs(world_path, exist_ok=True)
+
+        data = Compound({
+            "LevelName": String(f"Synthetic {index}"),
+            "DataVersion": Int(4189),
+            "Time": Long(rng.randint(0, 10 ** 6)),
+            "GameRules": Compound({f"rule{i}": String("true") for i in range(40)}),
+        })
+
+        if world_format == "old":
+            data["Player"] = player()
+        elif world_format == "new":
+            player_uuid = uuid.UUID(int=rng.getrandbits(128))
+            data["singleplayer_uuid"] = IntArray(_uuid_ints(player_uuid))
+            players_dir = os.path.join(world_path, "players", "data")
+            os.makedirs(players_dir, exist_ok=True)
+            _save(player(), os.path.join(players_dir, f"{player_uuid}.dat"))
+        elif world_format == "multi":
+            players_dir = os.path.join(world_path, "playerdata")
+            os.makedirs(players_dir, exist_ok=True)
+            for _ in range(players_per_world):
+                player_uuid = uuid.UUID(int=rng.getrandbits(128))
+                _save(player(), os.path.join(players_dir, f"{player_uuid}.dat"))
+        else:
+            raise ValueError(f"Unknown world format: {world_format}")
+
+        _save(Compound({"Data": data}), os.path.join(world_path, "level.dat"))
+        if region_chunks:
+            region_dir = os.path.join(world_path, "region")
+            os.makedirs(region_dir, exist_ok=True)
+            make_region(os.path.join(region_dir, "r.0.0.mca"), rng, region_chunks)
+        world_paths.append(world_path)
+
+    return world_paths
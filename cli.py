@@ -0,0 +1,467 @@
+"""
+Minecraft Swiss Knife - Headless command line entry point
+
+Everything the window can do, without a window (and without tkinter), so it
+can run from cron on servers with no display. Every command accepts many
+worlds at once. Modules are imported inside each command, so a command only
+loads what it needs.
+
+Usage:
+    python cli.py scan
+    python cli.py show MyWorld --mode inventory
+    python cli.py players ServerWorld --page 2
+    python cli.py show ServerWorld --player <uuid>
+    python cli.py containers MyWorld --item diamond
+    python cli.py search netherite_sword
+    python cli.py search diamond --min 100
+    python cli.py fill MyWorld OtherWorld            # or paths / glob patterns
+    python cli.py equip MyWorld
+    python cli.py set-attr MyWorld OtherWorld --set XpLevel=30 --set minecraft:max_health=40
+    python cli.py edit MyWorld --set XpLevel=30 --fill --equip --give 20 diamond 64
+    python cli.py datapack add mc_buildings MyWorld OtherWorld
+    python cli.py datapack sync mc_buildings MyWorld OtherWorld   # update installed copies
+    python cli.py datapack remove mc_buildings MyWorld
+    python cli.py datapacks                          # datapacks x worlds report, with drift
+    python cli.py optimize datapacks/mc_buildings --write   # merge setblocks into fills
+    python cli.py --profile --trace trace.json show MyWorld
+
+Worlds are looked up by name in --saves (default: ~/.minecraft/saves/);
+paths to world folders work too.
+"""
+import os
+import sys
+import glob
+import logging
+import argparse
+
+from config.settings import Config
+from utils.log import setup_logging, add_logging_arguments
+from utils import profiler
+
+logger = logging.getLogger("cli")
+
+
+def resolve_world(saves, world):
+    """World name inside the saves folder, or a path to a world folder"""
+    if os.path.isdir(world):
+        return os.path.abspath(world)
+    return os.path.abspath(os.path.join(os.path.expanduser(saves), world))
+
+
+def load_worlds(args):
+    """
+    Create a WorldManager that knows the worlds given on the command line
+
+    Returns:
+        tuple: (WorldManager, list of world paths)
+    """
+    from core.world_manager import WorldManager, WorldInfo
+
+    manager = WorldManager()
+    world_paths = []
+    for world in args.worlds:
+        world_path = resolve_world(args.saves, world)
+        if not os.path.isfile(os.path.join(world_path, "level.dat")):
+            raise SystemExit(f"Not a world (no level.dat): {world_path}")
+        world_info = WorldInfo(os.path.basename(world_path), world_path)
+        world_info.detect_player_data_location()
+        manager.worlds[world_info.name] = world_info
+        world_paths.append(world_path)
+    return manager, world_paths
+
+
+def cmd_scan(args):
+    from core.world_manager import WorldManager
+
+    manager = WorldManager()
+    manager.scan_worlds(args.saves, workers=args.workers)
+    for name, info in manager.worlds.items():
+        if info.is_singleplayer:
+            kind = "singleplayer"
+        elif info.is_singleplayer is None:
+            kind = "unreadable"
+        else:
+            kind = "multiplayer"
+        print(f"{name:<32} {kind:<13} {info.player_data_path or '-'}")
+    return 0
+
+
+def cmd_show(args):
+    manager, world_paths = load_worlds(args)
+    failures = 0
+    for world_path in world_paths:
+        print(f"\n=== {os.path.basename(world_path)} ===")
+        try:
+            if args.player:
+                data = manager.load_player_data(world_path, args.player)
+            else:
+                data = manager.load_world_data(world_path)
+        except Exception as e:
+            logger.error("✗ %s: %s", world_path, e)
+            failures += 1
+            continue
+
+        if args.mode in ("inventory", "all"):
+            print("--- Player Inventory ---")
+            for slot, item in sorted(data["inventory"].items()):
+                print(f"[Slot {slot:03d}]: {item['count']:02d}x {item['id']}")
+        if args.mode in ("attributes", "all"):
+            print("--- Player Attributes ---")
+            for name, value in sorted(data["attributes"].items()):
+                print(f"{name:<40} | {value:<10.2f}")
+        if args.mode in ("datapacks", "all"):
+            print("--- Datapacks ---")
+            for datapack in data["datapacks"]:
+                mark = Config.SYMBOL_CHECKED if datapack["installed"] else Config.SYMBOL_UNCHECKED
+                print(f"{mark} {datapack['label']}")
+    return 1 if failures else 0
+
+
+def cmd_players(args):
+    manager, world_paths = load_worlds(args)
+    for world_path in world_paths:
+        listing = manager.list_players(world_path, args.page - 1, args.page_size)
+        print(f"\n=== {os.path.basename(world_path)}: {listing['total']} player(s), "
+              f"page {listing['page'] + 1}/{listing['pages']} ===")
+        for player in listing['players']:
+            print(f"{player['uuid']}  {player['name'] or '-':<16} {player['size']:>8} bytes")
+    return 0
+
+
+def cmd_containers(args):
+    from core.mc_containers import world_containers
+
+    item_filter = args.item.split(":")[-1] if args.item else None
+    for world in args.worlds:
+        world_path = world if os.path.isfile(world) else resolve_world(args.saves, world)
+        found = 0
+        print(f"\n=== {os.path.basename(world_path)} ===")
+        for container in world_containers(world_path, args.dimension):
+            items = container["items"]
+            if item_filter and not any(item["id"] == item_filter for item in items.values()):
+                continue
+            found += 1
+            print(f"{container['id']} at {container['x']} {container['y']} {container['z']}")
+            for slot, item in sorted(items.items()):
+                print(f"  [Slot {slot:03d}]: {item['count']:02d}x {item['id']}")
+        print(f"{found} container(s)")
+    return 0
+
+
+def cmd_search(args):
+    from core.world_manager import WorldManager
+
+    hits = WorldManager().search_items(args.saves, args.item, args.min, args.workers)
+    for hit in hits:
+        slots = ", ".join(f"{where}[{slot}]={count}" for where, slot, count in hit["slots"])
+        print(f"{hit['world']:<24} {hit['player']:<36} {hit['item']:<24} {hit['total']:>6}  {slots}")
+    print(f"{len(hits)} match(es)")
+    return 0
+
+
+def fill_targets(args):
+    """World names become world paths; files, folders and globs pass through"""
+    targets = []
+    for target in args.targets:
+        if glob.has_magic(target) or os.path.exists(target):
+            targets.append(target)
+        else:
+            targets.append(resolve_world(args.saves, target))
+    return targets
+
+
+def cmd_fill(args):
+    from core.mc_forcefill import forcefill_batch
+
+    results, summary = forcefill_batch(fill_targets(args), args.workers)
+    for result in results:
+        if result["error"]:
+            logger.error("✗ %s: %s", result["path"], result["error"])
+        else:
+            logger.info("✓ %s: %d slot(s)", result["path"], result["modified"])
+    print(
+        f"{summary['files']} file(s), {summary['changed_files']} changed, "
+        f"{summary['modified_slots']} slot(s) modified, {summary['errors']} error(s) "
+        f"in {summary['seconds']:.2f}s ({summary['files_per_second']:.1f} files/s)"
+    )
+    return 1 if summary["errors"] else 0
+
+
+def cmd_equip(args):
+    from core.player_files import expand_targets
+    from core.mc_best_equipment import process_file
+
+    failures = 0
+    for filepath in expand_targets(fill_targets(args)):
+        try:
+            process_file(filepath)
+            logger.info("✓ %s", filepath)
+        except Exception as e:
+            logger.error("✗ %s: %s", filepath, e)
+            failures += 1
+    return 1 if failures else 0
+
+
+def parse_assignments(assignments):
+    """Turn ["XpLevel=30", "minecraft:max_health=40"] into a dict"""
+    values = {}
+    for assignment in assignments:
+        name, sep, value = assignment.partition("=")
+        if not sep or not name:
+            raise SystemExit(f"Expected NAME=VALUE, got: {assignment}")
+        values[name.strip()] = float(value)
+    return values
+
+
+def cmd_set_attr(args):
+    values = parse_assignments(args.set)
+    manager, world_paths = load_worlds(args)
+    failures = 0
+    for world_path in world_paths:
+        try:
+            # save_attributes rewrites the whole attribute list, so start
+            # from the current values and only change the requested ones
+            current = manager.load_world_data(world_path)["attributes"]
+            current.update(values)
+            changed = manager.save_attributes(world_path, current)
+            logger.info("✓ %s: %s", world_path, ", ".join(changed) or "no changes")
+        except Exception as e:
+            logger.error("✗ %s: %s", world_path, e)
+            failures += 1
+    return 1 if failures else 0
+
+
+def cmd_edit(args):
+    values = parse_assignments(args.set or [])
+    manager, world_paths = load_worlds(args)
+    failures = 0
+    for world_path in world_paths:
+        try:
+            # Every edit goes into one session: one backup, one write
+            with manager.session(world_path) as session:
+                if values:
+                    session.set_attributes(values)
+                for slot in args.clear or []:
+                    session.clear_slot(slot)
+                for slot, item_id, count in args.give or []:
+                    session.set_slot(int(slot), item_id, int(count))
+                if args.equip:
+                    session.equip()
+                if args.fill:
+                    session.fill()
+            logger.info("✓ %s: %s", world_path, ", ".join(session.changes) or "no changes")
+        except Exception as e:
+            logger.error("✗ %s: %s", world_path, e)
+            failures += 1
+    return 1 if failures else 0
+
+
+def cmd_datapacks(args):
+    from core.mc_datapacks import MC_DATAPACKS, STATE_MISSING, STATE_OK
+
+    if args.worlds:
+        world_paths = [resolve_world(args.saves, world) for world in args.worlds]
+    else:
+        saves = os.path.expanduser(args.saves)
+        world_paths = sorted(
+            entry.path for entry in os.scandir(saves)
+            if entry.is_dir() and os.path.isfile(os.path.join(entry.path, "level.dat"))
+        )
+
+    status = MC_DATAPACKS.fleetStatus(world_paths, verify=not args.no_verify, workers=args.workers)
+    packs = [pack["path"] for pack in status["packs"]]
+
+    if args.json:
+        import json
+        print(json.dumps(status, indent=1))
+        return 0
+
+    width = max([len(os.path.basename(path)) for path in world_paths] + [5])
+    print(f"{'world':<{width}}  " + "  ".join(f"{pack:<12}" for pack in packs) + "  other")
+    for row in status["rows"]:
+        cells = "  ".join(f"{row['cells'][pack]:<12}" for pack in packs)
+        others = row.get("error") or ", ".join(row["others"])
+        print(f"{os.path.basename(row['world']):<{width}}  {cells}  {others}")
+
+    # One summary line per pack
+    problems = 0
+    for pack in packs:
+        states = [row["cells"][pack] for row in status["rows"]]
+        counts = {state: states.count(state) for state in sorted(set(states))}
+        problems += sum(n for state, n in counts.items() if state not in (STATE_MISSING, STATE_OK))
+        print(f"{pack}: " + ", ".join(f"{n} {state}" for state, n in counts.items()))
+    return 1 if problems and not args.no_verify else 0
+
+
+def cmd_datapack(args):
+    from core.mc_datapacks import MC_DATAPACKS
+
+    names = [dp["path"] for dp in MC_DATAPACKS.getAll()]
+    if args.datapack not in names:
+        raise SystemExit(f"Unknown datapack '{args.datapack}'. Available: {', '.join(names)}")
+    index = args.datapack
+
+    failures = 0
+    for world in args.worlds:
+        world_path = resolve_world(args.saves, world)
+        try:
+            if args.action == "add":
+                methods = MC_DATAPACKS.add(world_path, index, args.mode, args.extract or None)
+                logger.info("✓ %s: %s", world_path, ", ".join(f"{n} {m}" for m, n in methods.items()))
+            elif args.action == "sync":
+                result = MC_DATAPACKS.sync(world_path, index, args.mode)
+                logger.info("✓ %s: %s", world_path, ", ".join(f"{n} {k}" for k, n in result.items()))
+            else:
+                MC_DATAPACKS.delete(world_path, index)
+                logger.info("✓ %s", world_path)
+        except Exception as e:
+            logger.error("✗ %s: %s", world_path, e)
+            failures += 1
+    return 1 if failures else 0
+
+
+def cmd_optimize(args):
+    from core.mc_functions import function_files, optimize_file
+
+    total_before = total_after = 0
+    for filepath in function_files(args.paths):
+        result = optimize_file(filepath, write=args.write)
+        total_before += result["before"]
+        total_after += result["after"]
+        print(f"{filepath}: {result['before']} -> {result['after']} commands")
+    print(f"Total: {total_before} -> {total_after} commands"
+          + ("" if args.write or total_after == total_before else " (use --write to save)"))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--saves",
+        default=Config.DEFAULT_MINECRAFT_PATH,
+        help=f"Minecraft saves folder (default: {Config.DEFAULT_MINECRAFT_PATH})"
+    )
+    add_logging_arguments(parser)
+    profiler.add_profile_arguments(parser)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan = commands.add_parser("scan", help="List the worlds in the saves folder")
+    scan.add_argument("--workers", type=int, default=None, help="Parallel scan workers")
+    scan.set_defaults(func=cmd_scan)
+
+    show = commands.add_parser("show", help="Print inventory, attributes and datapacks")
+    show.add_argument("worlds", nargs="+", help="World names or folders")
+    show.add_argument(
+        "--mode",
+        choices=["inventory", "attributes", "datapacks", "all"],
+        default="all"
+    )
+    show.add_argument("--player", metavar="UUID", help="Player to show in a multiplayer world")
+    show.set_defaults(func=cmd_show)
+
+    players = commands.add_parser("players", help="List the players of multiplayer worlds")
+    players.add_argument("worlds", nargs="+", help="World names or folders")
+    players.add_argument("--page", type=int, default=1, help="Page to show (default: 1)")
+    players.add_argument(
+        "--page-size",
+        type=int,
+        default=Config.PLAYER_PAGE_SIZE,
+        help=f"Players per page (default: {Config.PLAYER_PAGE_SIZE})"
+    )
+    players.set_defaults(func=cmd_players)
+
+    containers = commands.add_parser("containers", help="List chests, barrels and other containers")
+    containers.add_argument("worlds", nargs="+", help="World names, folders, region folders or .mca files")
+    containers.add_argument(
+        "--dimension",
+        choices=["overworld", "nether", "end"],
+        default="overworld"
+    )
+    containers.add_argument("--item", help="Only show containers holding this item id")
+    containers.set_defaults(func=cmd_containers)
+
+    search = commands.add_parser("search", help="Find which worlds and players hold an item")
+    search.add_argument("item", help="Item id, with or without minecraft:, or part of one")
+    search.add_argument("--min", type=int, default=0, metavar="N",
+                        help="Only players holding at least N in total")
+    search.add_argument("--workers", type=int, default=None, help="Processes used to index changed files")
+    search.set_defaults(func=cmd_search)
+
+    fill = commands.add_parser("fill", help="Force fill every player's inventory")
+    fill.add_argument("targets", nargs="+", help="World names, folders, .dat files or glob patterns")
+    fill.add_argument("--workers", type=int, default=None, help="Number of processes")
+    fill.set_defaults(func=cmd_fill)
+
+    equip = commands.add_parser("equip", help="Give every player the best equipment")
+    equip.add_argument("targets", nargs="+", help="World names, folders, .dat files or glob patterns")
+    equip.set_defaults(func=cmd_equip)
+
+    set_attr = commands.add_parser("set-attr", help="Set player attributes")
+    set_attr.add_argument("worlds", nargs="+", help="World names or folders")
+    set_attr.add_argument(
+        "--set",
+        action="append",
+        required=True,
+        metavar="NAME=VALUE",
+        help="Attribute to set, e.g. XpLevel=30 or minecraft:max_health=40 (repeatable)"
+    )
+    set_attr.set_defaults(func=cmd_set_attr)
+
+    edit = commands.add_parser("edit", help="Apply several edits to a player with a single write")
+    edit.add_argument("worlds", nargs="+", help="World names or folders")
+    edit.add_argument("--set", action="append", metavar="NAME=VALUE", help="Attribute to set (repeatable)")
+    edit.add_argument("--clear", action="append", type=int, metavar="SLOT", help="Empty an inventory slot (repeatable)")
+    edit.add_argument(
+        "--give",
+        action="append",
+        nargs=3,
+        metavar=("SLOT", "ITEM", "COUNT"),
+        help="Put COUNT x ITEM in an inventory slot (repeatable)"
+    )
+    edit.add_argument("--equip", action="store_true", help="Give the best equipment")
+    edit.add_argument("--fill", action="store_true", help="Fill every stack to its maximum size")
+    edit.set_defaults(func=cmd_edit)
+
+    datapacks = commands.add_parser("datapacks", help="Report which datapacks are installed in which worlds")
+    datapacks.add_argument("worlds", nargs="*", help="World names or folders (default: every world)")
+    datapacks.add_argument("--no-verify", action="store_true", help="Only check presence, not content")
+    datapacks.add_argument("--workers", type=int, default=None, help="Worlds checked in parallel")
+    datapacks.add_argument("--json", action="store_true", help="Print the report as JSON")
+    datapacks.set_defaults(func=cmd_datapacks)
+
+    datapack = commands.add_parser("datapack", help="Install, update or remove a datapack")
+    datapack.add_argument("action", choices=["add", "sync", "remove"])
+    datapack.add_argument("datapack", help="Datapack folder name, e.g. mc_buildings")
+    datapack.add_argument("worlds", nargs="+", help="World names or folders")
+    datapack.add_argument(
+        "--mode",
+        choices=["auto", "reflink", "hardlink", "copy"],
+        default=None,
+        help=f"How files are installed (default: {Config.DATAPACK_INSTALL_MODE})"
+    )
+    datapack.add_argument("--extract", action="store_true", help="Install a .zip datapack as a folder")
+    datapack.set_defaults(func=cmd_datapack)
+
+    optimize = commands.add_parser("optimize", help="Shorten datapack functions by merging setblocks into fills")
+    optimize.add_argument("paths", nargs="+", help=".mcfunction files or folders holding them")
+    optimize.add_argument("--write", action="store_true", help="Rewrite the files (default: only report)")
+    optimize.set_defaults(func=cmd_optimize)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    setup_logging(verbose=args.verbose, quiet=args.quiet)
+    profiler.setup_profiling(args)
+    try:
+        return args.func(args)
+    finally:
+        profiler.finish_profiling(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,8 +15,35 @@ class Config:
     # Paths
     DEFAULT_MINECRAFT_PATH = os.path.expanduser("~/.minecraft/saves/")
     
+    # World scanning
+    SCAN_WORKERS = min(8, os.cpu_count() or 1)
+    SCAN_EXECUTOR = "thread"  # "thread" or "process"
+    WORLD_INDEX_FILENAME = ".mc_swissknife_index.jsonl"
+    ITEM_INDEX_FILENAME = ".mc_swissknife_items.jsonl"
+    DATAPACK_MANIFEST_FILENAME = ".mc_swissknife_datapacks.json"
+    
+    # Number of parsed player files kept in memory
+    NBT_CACHE_SIZE = 8
+    
+    # Players per page in the multiplayer player picker
+    PLAYER_PAGE_SIZE = 50
+    
+    # How datapack files are installed into worlds: "auto" (reflink, else
+    # copy), "reflink", "hardlink" or "copy". Hardlinked files are shared
+    # with datapacks/: editing one in place in a world edits them all
+    DATAPACK_INSTALL_MODE = "auto"
+    # Install .zip datapacks extracted into a folder instead of as the zip
+    DATAPACK_ZIP_EXTRACT = False
+    
+    # Backups of edited save files
+    BACKUP_STORE_PATH = os.path.expanduser("~/.mc_swissknife/backups")
+    BACKUP_KEEP_REVISIONS = 20
+    BACKUP_MAX_AGE_DAYS = 30
+    
     # UI Settings
     SIDEBAR_WIDTH = 250
+    UI_JOB_WORKERS = 1  # background threads for world I/O (1 keeps edits in order)
+    UI_POLL_MS = 50  # how often finished jobs are delivered to the UI
     
     # Fonts
     FONT_HEADING = ('Arial', 10, 'bold')
@@ -34,6 +61,7 @@ class Config:
     TAB_INVENTORY = " Inventory "
     TAB_ATTRIBUTES = " Attributes "
     TAB_DATAPACKS = " Datapacks "
+    TAB_SEARCH = " Search "
     
     # Datapack symbols
     SYMBOL_CHECKED = "☑"
@@ -0,0 +1,307 @@
+"""
+Datapack Catalogue - The datapacks available for installing
+
+Every folder or .zip under the datapacks directory that holds a
+pack.mcmeta is a datapack. For each one the catalogue records its name,
+description, supported pack format range, file count and a content hash.
+
+Reading pack.mcmeta and hashing every file is only done when a pack
+changed: the results are kept in a JSON manifest inside the datapacks
+directory (Config.DATAPACK_MANIFEST_FILENAME), keyed by the size and mtime
+of every file of the pack (or the zip's mtime and size). In memory, the
+catalogue is only looked at again when the datapacks directory itself
+changes (a pack added or removed) or when refresh() is called, which
+stats every pack's files again.
+
+The content hash only depends on the files' relative paths and bytes, so
+a folder, the same files in a zip, and an installed copy hash the same.
+
+Usage
+
+catalogue = DatapackCatalogue("./datapacks")
+for pack in catalogue.packs():
+    print(pack["path"], pack["label"], pack["files"], pack["hash"][:12])
+"""
+import os
+import json
+import hashlib
+import logging
+import threading
+import zipfile
+
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+# Labels shown instead of the pack name
+LABELS = {
+    "mc_buildings": "Buildings",
+}
+
+# Files are hashed (and zip entries extracted) this many bytes at a time
+HASH_CHUNK = 1024 * 1024
+
+
+def _description_text(description):
+    """pack.mcmeta descriptions may be text components; keep the text"""
+    if isinstance(description, str):
+        return description
+    if isinstance(description, list):
+        return "".join(_description_text(part) for part in description)
+    if isinstance(description, dict):
+        return _description_text(description.get("text", "")) + _description_text(description.get("extra", []))
+    return ""
+
+
+def _format_value(value):
+    """88 -> "88", [88, 0] -> "88.0" """
+    if isinstance(value, list):
+        return ".".join(str(part) for part in value)
+    return str(value)
+
+
+def format_range(pack_meta):
+    """
+    Supported pack format range of a pack.mcmeta "pack" object
+
+    Returns:
+        list: [min, max] as strings, or None if the pack declares none
+    """
+    if "min_format" in pack_meta or "max_format" in pack_meta:
+        low = pack_meta.get("min_format", pack_meta.get("max_format"))
+        high = pack_meta.get("max_format", low)
+        return [_format_value(low), _format_value(high)]
+
+    supported = pack_meta.get("supported_formats")
+    if isinstance(supported, int):
+        return [str(supported), str(supported)]
+    if isinstance(supported, list) and len(supported) == 2:
+        return [str(supported[0]), str(supported[1])]
+    if isinstance(supported, dict):
+        return [str(supported.get("min_inclusive")), str(supported.get("max_inclusive"))]
+
+    if "pack_format" in pack_meta:
+        return [str(pack_meta["pack_format"])] * 2
+    return None
+
+
+def combine_hashes(file_digests):
+    """
+    Content hash of a pack from {relative path: sha256 digest of the file}
+
+    Files are taken in path order; each contributes its path and the
+    digest of its bytes.
+    """
+    digest = hashlib.sha256()
+    for relative in sorted(file_digests):
+        digest.update(relative.encode("utf-8") + b"\0" + file_digests[relative])
+    return digest.hexdigest()
+
+
+def _hash_entries(entries):
+    """Content hash and count of (relative path, file object opener) pairs"""
+    file_digests = {}
+    for relative, opener in entries:
+        file_digest = hashlib.sha256()
+        with opener() as f:
+            while True:
+                chunk = f.read(HASH_CHUNK)
+                if not chunk:
+                    break
+                file_digest.update(chunk)
+        file_digests[relative] = file_digest.digest()
+    return combine_hashes(file_digests), len(file_digests)
+
+
+def folder_content_hash(root):
+    """
+    Content hash and file count of a datapack folder
+
+    Returns:
+        tuple: (hex digest, number of files)
+    """
+    entries = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            relative = os.path.relpath(path, root).replace(os.sep, "/")
+            entries.append((relative, lambda path=path: open(path, "rb")))
+    return _hash_entries(entries)
+
+
+def zip_content_hash(zip_file):
+    """
+    Content hash and file count of an open zipfile.ZipFile, read without
+    extracting it (equal to folder_content_hash() of its extracted files)
+
+    Returns:
+        tuple: (hex digest, number of files)
+    """
+    entries = [
+        (info.filename, lambda info=info: zip_file.open(info))
+        for info in zip_file.infolist()
+        if not info.is_dir()
+    ]
+    return _hash_entries(entries)
+
+
+def folder_stamp(root):
+    """
+    Digest of the (relative path, size, mtime) of every file of a pack:
+    changes whenever a file is added, removed, replaced or written in
+    place, at the cost of a stat per file
+
+    Returns:
+        str: hex digest
+    """
+    digest = hashlib.sha256()
+    entries = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            st = os.stat(path)
+            relative = os.path.relpath(path, root).replace(os.sep, "/")
+            entries.append((relative, st.st_size, st.st_mtime_ns))
+    for relative, size, mtime_ns in sorted(entries):
+        digest.update(f"{relative}\0{size}\0{mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class DatapackCatalogue:
+    """Datapacks found in a datapacks directory, with a cached manifest"""
+
+    VERSION = 1
+
+    def __init__(self, base_path):
+        self.base_path = base_path
+        self.manifest_path = os.path.join(base_path, Config.DATAPACK_MANIFEST_FILENAME)
+        self._packs = None  # [pack dict], sorted by path
+        self._base_mtime = None
+        self._lock = threading.Lock()
+
+    def packs(self):
+        """
+        Every datapack of the directory
+
+        Returns:
+            list of dicts {"path", "label", "kind" ("folder" or "zip"),
+            "description", "formats", "files", "hash"}, sorted by path
+        """
+        with self._lock:
+            try:
+                base_mtime = os.stat(self.base_path).st_mtime_ns
+            except OSError:
+                return []
+            if self._packs is None or base_mtime != self._base_mtime:
+                self._scan()
+                # Taken again: writing the manifest changes the directory
+                self._base_mtime = os.stat(self.base_path).st_mtime_ns
+            return self._packs
+
+    def refresh(self):
+        """Look for changed packs again, e.g. after editing a pack's files:
+        the next packs() re-stats every file and re-hashes changed packs"""
+        with self._lock:
+            self._packs = None
+
+    def get(self, key):
+        """
+        A pack by index in packs() or by path (folder or zip name)
+
+        Raises:
+            KeyError: If there is no such pack
+        """
+        packs = self.packs()
+        if isinstance(key, int):
+            if 0 <= key < len(packs):
+                return packs[key]
+        else:
+            for pack in packs:
+                if pack["path"] == key:
+                    return pack
+        raise KeyError(f"Unknown datapack '{key}'. Available: {', '.join(p['path'] for p in packs)}")
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != self.VERSION:
+            return {}
+        return manifest.get("packs", {})
+
+    def _save_manifest(self, packs):
+        tmp_path = self.manifest_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "packs": packs}, f, indent=1)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            # The manifest is only a cache, the catalogue works without it
+            logger.warning("Could not write datapack manifest: %s", e)
+
+    def _scan(self):
+        """List the packs, re-reading only those whose stamp changed"""
+        manifest = self._load_manifest()
+        packs = {}
+
+        with os.scandir(self.base_path) as entries:
+            candidates = sorted(
+                (entry.name, entry.path, "zip" if entry.is_file() else "folder")
+                for entry in entries
+                if not entry.name.startswith(".")
+                and (entry.is_dir() or entry.name.lower().endswith(".zip"))
+            )
+
+        for name, path, kind in candidates:
+            try:
+                if kind == "folder":
+                    if not os.path.isfile(os.path.join(path, "pack.mcmeta")):
+                        continue
+                    stamp = folder_stamp(path)
+                else:
+                    st = os.stat(path)
+                    stamp = [st.st_mtime_ns, st.st_size]
+
+                pack = manifest.get(name)
+                if pack is None or pack.get("stamp") != stamp or pack.get("kind") != kind:
+                    pack = self._read_pack(name, path, kind)
+                    pack["stamp"] = stamp
+                    logger.debug("Read datapack %s (%d files)", name, pack["files"])
+            except (OSError, ValueError, zipfile.BadZipFile) as e:
+                logger.warning("Skipping datapack %s: %s", name, e)
+                continue
+            stem = name[:-4] if kind == "zip" else name
+            pack["label"] = LABELS.get(stem, stem)
+            packs[name] = pack
+
+        if packs != manifest:
+            self._save_manifest(packs)
+
+        self._packs = [packs[name] for name in sorted(packs)]
+
+    @staticmethod
+    def _read_pack(name, path, kind):
+        """Read pack.mcmeta and hash the files of one pack"""
+        if kind == "folder":
+            with open(os.path.join(path, "pack.mcmeta"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            content_hash, files = folder_content_hash(path)
+        else:
+            with zipfile.ZipFile(path) as zip_file:
+                try:
+                    meta = json.loads(zip_file.read("pack.mcmeta").decode("utf-8"))
+                except KeyError:
+                    raise ValueError("no pack.mcmeta at the root of the zip") from None
+                content_hash, files = zip_content_hash(zip_file)
+
+        pack_meta = meta.get("pack", {})
+        return {
+            "path": name,
+            "kind": kind,
+            "description": _description_text(pack_meta.get("description", "")),
+            "formats": format_range(pack_meta),
+            "files": files,
+            "hash": content_hash,
+        }
@@ -0,0 +1,261 @@
+"""
+Item Search - Find which worlds and players hold an item
+
+Keeps an inverted index {item id: [(player file, where, slot, count)]} of
+every player's inventory and ender chest across all worlds of a saves
+directory. It answers questions like "who has a netherite_sword" or "who
+holds more than 100 diamonds" without opening any world.
+
+The per-file data is persisted as JSON lines in the saves directory
+(Config.ITEM_INDEX_FILENAME), keyed by each player file's mtime and size.
+update() only re-reads the files that changed, in parallel, using
+NBTStream (no nbtlib tree is built).
+
+Usage
+
+index = ItemSearchIndex("~/.minecraft/saves")
+index.update()
+for hit in index.search("diamond", min_count=100):
+    print(hit["world"], hit["player"], hit["total"])
+"""
+import os
+import json
+import time
+import logging
+
+from config.settings import Config
+from core.player_files import world_player_files
+from core.mc_containers import read_container_items
+from utils.NBTStream import NBTStream
+
+logger = logging.getLogger(__name__)
+
+# Where inventories live in a player file and in a level.dat Player compound
+_INVENTORY_PATHS = {
+    "inventory": ("Inventory", "Data.Player.Inventory"),
+    "ender_chest": ("EnderItems", "Data.Player.EnderItems"),
+}
+
+
+def _normalise(item_id):
+    """'minecraft:Diamond' -> 'diamond' (the id shape of read_player_inventory)"""
+    return item_id.strip().lower().split(":")[-1]
+
+
+def read_file_items(filepath):
+    """
+    Read the inventory and ender chest of one player file
+
+    Returns:
+        list of [where, slot, item id, count]
+    """
+    paths = [path for pair in _INVENTORY_PATHS.values() for path in pair]
+    values = NBTStream(filepath).fetch(paths)
+
+    items = []
+    for where, pair in _INVENTORY_PATHS.items():
+        for path in pair:
+            if path in values:
+                for slot, item in sorted(read_container_items(values[path]).items()):
+                    items.append([where, slot, item["id"], item["count"]])
+    return items
+
+
+def _index_worker(job):
+    """
+    Read one player file for the index.
+    Module-level so it can be shipped to a process pool; never raises.
+    """
+    world, filepath, stamp = job
+    record = {
+        "version": ItemSearchIndex.VERSION,
+        "path": filepath,
+        "world": world,
+        "mtime_ns": stamp[0],
+        "size": stamp[1],
+        "items": [],
+    }
+    try:
+        record["items"] = read_file_items(filepath)
+    except Exception as e:
+        record["error"] = str(e)
+    return record
+
+
+class ItemSearchIndex:
+    """Inverted item index over every player file of a saves directory"""
+
+    VERSION = 1
+
+    def __init__(self, saves_path):
+        self.saves_path = os.path.expanduser(saves_path)
+        self.index_path = os.path.join(self.saves_path, Config.ITEM_INDEX_FILENAME)
+        self.records = {}  # {player file path: record dict}
+        self.postings = {}  # {item id: [(path, where, slot, count)]}
+        self._dirty = False
+        self._load()
+        self._build_postings()
+
+    def _load(self):
+        """Read the index file, ignoring missing files and broken lines"""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get("version") == self.VERSION and "path" in record:
+                        self.records[record["path"]] = record
+        except OSError:
+            pass
+
+    def _build_postings(self):
+        postings = {}
+        for path, record in self.records.items():
+            for where, slot, item_id, count in record["items"]:
+                postings.setdefault(item_id, []).append((path, where, slot, count))
+        self.postings = postings
+
+    def _player_files(self):
+        """[(world name, player file path)] of every world, without parsing"""
+        files = []
+        try:
+            with os.scandir(self.saves_path) as entries:
+                worlds = sorted(entry.path for entry in entries if entry.is_dir())
+        except OSError:
+            return files
+        for world_path in worlds:
+            if not os.path.isfile(os.path.join(world_path, "level.dat")):
+                continue
+            world = os.path.basename(world_path)
+            files.extend((world, filepath) for filepath in world_player_files(world_path))
+        return files
+
+    def update(self, workers=None):
+        """
+        Bring the index up to date: re-read new and changed player files,
+        forget deleted ones, and save the index if anything changed.
+
+        Args:
+            workers: Number of processes (default: one per CPU core)
+
+        Returns:
+            dict: {"files", "updated", "removed", "seconds"}
+        """
+        start = time.perf_counter()
+        pending = []
+        seen = set()
+
+        for world, filepath in self._player_files():
+            try:
+                st = os.stat(filepath)
+            except OSError:
+                continue
+            seen.add(filepath)
+            record = self.records.get(filepath)
+            if (record and record["world"] == world
+                    and record["mtime_ns"] == st.st_mtime_ns and record["size"] == st.st_size):
+                continue
+            pending.append((world, filepath, (st.st_mtime_ns, st.st_size)))
+
+        removed = [path for path in self.records if path not in seen]
+        for path in removed:
+            del self.records[path]
+
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(pending) <= 1:
+            results = [_index_worker(job) for job in pending]
+        else:
+            # Imported here: the process pool module is slow to import
+            from concurrent.futures import ProcessPoolExecutor
+
+            chunksize = max(1, len(pending) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_index_worker, pending, chunksize=chunksize))
+
+        for record in results:
+            if "error" in record:
+                logger.warning("Could not index %s: %s", record["path"], record["error"])
+            self.records[record["path"]] = record
+
+        if pending or removed:
+            self._dirty = True
+            self._build_postings()
+            self.save()
+
+        return {
+            "files": len(seen),
+            "updated": len(pending),
+            "removed": len(removed),
+            "seconds": time.perf_counter() - start,
+        }
+
+    def save(self):
+        """Write the index back to disk; the file is replaced atomically"""
+        if not self._dirty:
+            return
+
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for record in self.records.values():
+                    f.write(json.dumps(record) + "\n")
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+        except OSError as e:
+            # The index is only a cache, never fail a search because of it
+            logger.warning("Could not write item index: %s", e)
+
+    def item_ids(self, query):
+        """
+        Item ids matching a query: the exact id if it is indexed,
+        otherwise every id containing the query ("sword" -> all swords)
+        """
+        query = _normalise(query)
+        if query in self.postings:
+            return [query]
+        return sorted(item_id for item_id in self.postings if query in item_id)
+
+    def search(self, query, min_count=0):
+        """
+        Find the player files holding an item
+
+        Args:
+            query: Item id, with or without "minecraft:", or part of one
+            min_count: Only return players holding at least this many
+                       (summed over all their slots)
+
+        Returns:
+            list of dicts {"item", "world", "player", "path", "total", "slots"}
+            with slots as [(where, slot, count)], largest totals first
+        """
+        hits = []
+        for item_id in self.item_ids(query):
+            by_file = {}
+            for path, where, slot, count in self.postings[item_id]:
+                by_file.setdefault(path, []).append((where, slot, count))
+
+            for path, slots in by_file.items():
+                total = sum(count for _, _, count in slots)
+                if total < min_count:
+                    continue
+                hits.append({
+                    "item": item_id,
+                    "world": self.records[path]["world"],
+                    "player": self._player_label(path),
+                    "path": path,
+                    "total": total,
+                    "slots": slots,
+                })
+
+        hits.sort(key=lambda hit: (-hit["total"], hit["world"], hit["player"], hit["item"]))
+        return hits
+
+    @staticmethod
+    def _player_label(path):
+        """Player uuid from <uuid>.dat, or 'singleplayer' for level.dat"""
+        name = os.path.basename(path)
+        if name == "level.dat":
+            return "singleplayer"
+        return os.path.splitext(name)[0]
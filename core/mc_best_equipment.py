@@ -10,8 +10,10 @@ Usage:
 
 import sys
 import shutil
+import logging
 from pathlib import Path
 from utils.NBTFile import NBTFile
+from utils.log import setup_logging
 try:
     import nbtlib
     from nbtlib.tag import Compound, List, String, Byte, Short, Int
@@ -19,6 +21,8 @@ except ImportError:
     print("Error: nbtlib is required. Install it with: pip install nbtlib")
     sys.exit(1)
 
+logger = logging.getLogger(__name__)
+
 
 def create_golden_helmet():
     """Golden helmet with all protective enchantments"""
@@ -183,7 +187,7 @@ def create_simple_item(item_id, count):
 def setup_best_equipment(player_data):
     """Setup armor slots and hotbar with best equipment"""
     
-    print("\n=== Setting up equipment ===")
+    logger.debug("=== Setting up equipment ===")
     
     # Ensure Inventory exists as proper List[Compound]
     if 'Inventory' not in player_data:
@@ -192,10 +196,11 @@ def setup_best_equipment(player_data):
     # Convert to list if needed
     inventory_list = list(player_data['Inventory'])
     
-    # Remove existing hotbar and armor items
+    # Remove existing hotbar and armor items (armor is written to slots
+    # 9-12 below, older files may still have it in 100-103)
     inventory_list = [item for item in inventory_list if 
                      int(item.get('Slot', Byte(0))) not in 
-                     list(range(9)) + [100, 101, 102, 103]]
+                     list(range(13)) + [100, 101, 102, 103]]
     
     # Hotbar setup (slots 0-8)
     hotbar_items = [
@@ -210,11 +215,11 @@ def setup_best_equipment(player_data):
         (8, create_simple_item('minecraft:torch', 64), "Torches x64"),
     ]
     
-    print("\n📦 Hotbar:")
+    logger.debug("📦 Hotbar:")
     for slot, item, description in hotbar_items:
         item['Slot'] = Byte(slot)
         inventory_list.append(item)
-        print(f"  Slot {slot}: {description}")
+        logger.debug("  Slot %s: %s", slot, description)
     
     # Armor setup (slots 100-103)
     armor_items = [
@@ -224,16 +229,16 @@ def setup_best_equipment(player_data):
         (12, create_golden_helmet(), "Golden Helmet (Protection IV, Respiration III, Aqua Affinity)"),
     ]
     
-    print("\n🛡️  Armor:")
+    logger.debug("🛡️  Armor:")
     for slot, item, description in armor_items:
         item['Slot'] = Byte(slot)
         inventory_list.append(item)
-        print(f"  Slot {slot}:   {description}")
+        logger.debug("  Slot %s:   %s", slot, description)
     
     # Replace inventory with new list
     player_data['Inventory'] = List[Compound](inventory_list)
     
-    print("\n✓ Equipment setup complete!")
+    logger.debug("✓ Equipment setup complete!")
     return len(hotbar_items) + len(armor_items)
 
 
@@ -241,15 +246,20 @@ def process_file(filepath):
     filepath = Path(filepath)
     nbt = NBTFile(filepath)
     player_data = nbt.openfile()
+    inventory_before = player_data.get('Inventory')
     modified_count = setup_best_equipment(player_data)
+    
+    # setup_best_equipment builds a new list, compare it with the old one
+    if inventory_before is not None and player_data['Inventory'] == inventory_before:
+        modified_count = 0
         
     # Save modified NBT
     if modified_count > 0:
-        print(f"\nSaving changes to {filepath}...")
-        nbt.savefile(player_data)
-        print(f"✓ Successfully modified {modified_count} slot(s)")
+        logger.info("Saving changes to %s...", filepath)
+        nbt.savefile(player_data, changed={'Inventory'})
+        logger.info("✓ Successfully modified %d slot(s)", modified_count)
     else:
-        print("\n✓ No changes needed - all slots already at max stack size")
+        logger.info("✓ No changes needed - equipment already in place")
     
     return True
 
@@ -262,6 +272,7 @@ def main():
         print("  python best_equipment.py playerdata/abc-123.dat       # multiplayer")
         sys.exit(1)
     
+    setup_logging(verbose=True)
     filepath = sys.argv[1]
     success = process_file(filepath)
     
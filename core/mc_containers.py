@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+mc_containers.py – List the contents of chests, barrels, shulker boxes,
+hoppers and every other block with an inventory stored in a world's
+region files.
+
+Items use the same shape as read_player_inventory():
+    {slot: {"id": "diamond", "count": 64}}
+
+Region files are memory mapped and read one chunk at a time, and only the
+block entities of each chunk are decoded, so worlds of any size can be
+audited with little memory.
+
+Usage:
+    python mc_containers.py world/                          # overworld
+    python mc_containers.py world/ --dimension nether
+    python mc_containers.py world/region/r.0.0.mca --item diamond
+"""
+
+import os
+import sys
+import logging
+import argparse
+from utils.RegionFile import RegionFile, region_files
+from utils.log import setup_logging, add_logging_arguments
+
+logger = logging.getLogger(__name__)
+
+# Region directory of each dimension, relative to the world folder
+DIMENSIONS = {
+    "overworld": "region",
+    "nether": os.path.join("DIM-1", "region"),
+    "end": os.path.join("DIM1", "region"),
+}
+
+# Where chunks keep their block entities: 1.18+ and older chunk formats
+BLOCK_ENTITY_PATHS = ["block_entities", "Level.TileEntities"]
+
+
+def read_container_items(items):
+    """
+    Turn a block entity's Items list (plain values from NBTStream) into
+    {slot: {"id": ..., "count": ...}}
+    """
+    items_by_slot = {}
+    for item in items:
+        try:
+            slot = int(item['Slot'])
+            # 'Count' before 1.20.5, 'count' after
+            count = int(item.get('count', item.get('Count', 1)))
+            item_id = str(item['id']).split(':')[-1]
+            items_by_slot[slot] = {"id": item_id, "count": count}
+        except (KeyError, TypeError, ValueError):
+            continue
+    return items_by_slot
+
+
+def region_containers(region_path):
+    """
+    Yield every block entity with an inventory in one region file
+
+    Yields:
+        dict: {"id", "x", "y", "z", "items"}; items as read_container_items()
+    """
+    with RegionFile(region_path) as region:
+        for chunk_x, chunk_z in region.chunks():
+            try:
+                values = region.fetch(chunk_x, chunk_z, BLOCK_ENTITY_PATHS)
+            except Exception as e:
+                logger.warning("Skipping chunk (%d, %d) of %s: %s", chunk_x, chunk_z, region_path, e)
+                continue
+
+            for path in BLOCK_ENTITY_PATHS:
+                for block_entity in values.get(path) or []:
+                    items = block_entity.get('Items')
+                    if not isinstance(items, list):
+                        continue
+                    yield {
+                        "id": str(block_entity.get('id', '?')).split(':')[-1],
+                        "x": block_entity.get('x'),
+                        "y": block_entity.get('y'),
+                        "z": block_entity.get('z'),
+                        "items": read_container_items(items),
+                    }
+
+
+def world_containers(path, dimension="overworld"):
+    """
+    Yield the containers of a world dimension, a region directory or a
+    single region file, one region file at a time
+    """
+    if os.path.isfile(path):
+        files = [path]
+    elif os.path.isfile(os.path.join(path, "level.dat")):
+        files = region_files(os.path.join(path, DIMENSIONS[dimension]))
+    else:
+        files = region_files(path)
+
+    for region_path in files:
+        logger.debug("Reading %s", region_path)
+        yield from region_containers(region_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("path", help="World folder, region folder or .mca file")
+    parser.add_argument("--dimension", choices=sorted(DIMENSIONS), default="overworld")
+    parser.add_argument("--item", help="Only show containers holding this item id")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    setup_logging(verbose=args.verbose, quiet=args.quiet)
+
+    item_filter = args.item.split(':')[-1] if args.item else None
+    found = 0
+    for container in world_containers(args.path, args.dimension):
+        items = container["items"]
+        if item_filter and not any(item["id"] == item_filter for item in items.values()):
+            continue
+        found += 1
+        print(f"\n{container['id']} at {container['x']} {container['y']} {container['z']}")
+        for slot, item in sorted(items.items()):
+            print(f"  [Slot {slot:03d}]: {item['count']:02d}x {item['id']}")
+
+    print(f"\n{found} container(s)")
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,323 @@
 #!/usr/bin/env python3
 
 import os
+import json
+import uuid
+import errno
+import hashlib
 import shutil
+import filecmp
+import logging
+import zipfile
+
+from config.settings import Config
+from core.datapack_catalogue import (
+    DatapackCatalogue, HASH_CHUNK, combine_hashes, folder_content_hash, zip_content_hash,
+    folder_stamp, format_range,
+)
+
+logger = logging.getLogger(__name__)
 
 # Where your datapacks are stored on disk
 DATAPACKS_BASE_PATH = "./datapacks"
 
-DATAPACKS = [
-    {
-        "path": "mc_buildings",
-        "label": "Buildings"
-    }
-]
+# Every folder or .zip datapack found there (labels: see datapack_catalogue.LABELS)
+CATALOGUE = DatapackCatalogue(DATAPACKS_BASE_PATH)
+
+# Linux ioctl cloning a whole file (btrfs, XFS, ...): the clone shares the
+# source's blocks until one of them is written, like a copy that costs nothing
+FICLONE = 0x40049409
+
+# Ways to place a file, best first, for each install mode. Hardlinks are
+# only used when asked for: a world's file edited in place by an editor
+# would change the catalogue's file and every other world's with it
+INSTALL_METHODS = {
+    "auto": ("reflink", "copy"),
+    "reflink": ("reflink", "copy"),
+    "hardlink": ("hardlink", "copy"),
+    "copy": ("copy",),
+}
+
+# (method, source device, destination device) the filesystems refused
+# once; the method is not tried again between them
+_unsupported = set()
+
+# Errors meaning a method cannot work between two filesystems, as opposed
+# to a problem with one file
+UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL}
+
+
+def _reflink(src: str, dst: str):
+    """Clone src to dst; raises OSError where cloning is not supported"""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.EOPNOTSUPP, "reflink is not supported on this platform") from None
+
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    except OSError:
+        if os.path.exists(dst):
+            os.remove(dst)
+        raise
+    shutil.copystat(src, dst)
+
+
+def _place_file(src: str, dst: str, mode: str) -> str:
+    """
+    Put a file at dst with the same content as src, replacing dst
+    atomically if it exists. A file that is already there is never written
+    into: it may be a hardlink to the catalogue copy.
+
+    Returns the method used: "reflink", "hardlink" or "copy"
+    """
+    # Unique, so a temp file left behind by a crash is never in the way
+    tmp = f"{dst}.{uuid.uuid4().hex[:8]}.mc-tmp"
+    devices = (os.stat(src).st_dev, os.stat(os.path.dirname(dst)).st_dev)
+
+    for method in INSTALL_METHODS[mode]:
+        if (method, *devices) in _unsupported:
+            continue
+        try:
+            if method == "reflink":
+                _reflink(src, tmp)
+            elif method == "hardlink":
+                os.link(src, tmp)
+            else:
+                shutil.copy2(src, tmp)
+        except OSError as e:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            if method == "copy":
+                raise
+            logger.debug("Cannot %s %s: %s", method, src, e)
+            if e.errno in UNSUPPORTED_ERRNOS:
+                _unsupported.add((method, *devices))
+            continue
+        os.replace(tmp, dst)
+        return method
+
+
+def _same_file(src: str, dst: str) -> bool:
+    """
+    True if dst holds what src holds. Size and mtime decide first; the
+    content is only compared when the size is equal but the mtime is not.
+    """
+    try:
+        st_src = os.stat(src)
+        st_dst = os.stat(dst)
+    except OSError:
+        return False
+    if (st_src.st_dev, st_src.st_ino) == (st_dst.st_dev, st_dst.st_ino):
+        return True  # hardlinked
+    if st_src.st_size != st_dst.st_size:
+        return False
+    if st_src.st_mtime_ns == st_dst.st_mtime_ns:
+        return True
+    return filecmp.cmp(src, dst, shallow=False)
+
+
+def _install_names(pack: dict):
+    """
+    Names a pack can have in a world's datapacks folder: a zip pack is
+    either the zip itself (Minecraft loads zips) or a folder extracted from it
+    """
+    if pack["kind"] == "zip":
+        return (pack["path"], pack["path"][:-4])
+    return (pack["path"],)
+
+
+def _installed_path(world_path: str, pack: dict):
+    """Where pack is installed in the world, None if it is not"""
+    for name in _install_names(pack):
+        path = os.path.join(MC_DATAPACKS._world_datapacks_dir(world_path), name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _zip_members(zip_file):
+    """Files of a zip, refusing paths that would land outside the target folder"""
+    for info in zip_file.infolist():
+        if info.is_dir():
+            continue
+        name = info.filename
+        parts = name.split("/")
+        if name.startswith("/") or "\\" in name or ".." in parts or ":" in parts[0]:
+            raise ValueError(f"Unsafe path in zip: {name}")
+        yield info
+
+
+def _extract_zip(src: str, dst: str, expected_hash: str) -> int:
+    """
+    Stream the files of a zip into the new folder dst, HASH_CHUNK bytes at
+    a time, hashing them on the way: memory use does not depend on the
+    pack size and nothing is extracted to a temp folder first.
+
+    Raises ValueError (and removes dst) if the content hash is not
+    expected_hash. Returns the number of files.
+    """
+    file_digests = {}
+    try:
+        with zipfile.ZipFile(src) as zip_file:
+            for info in _zip_members(zip_file):
+                path = os.path.join(dst, *info.filename.split("/"))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                digest = hashlib.sha256()
+                with zip_file.open(info) as fsrc, open(path, "wb") as fdst:
+                    while True:
+                        chunk = fsrc.read(HASH_CHUNK)
+                        if not chunk:
+                            break
+                        digest.update(chunk)
+                        fdst.write(chunk)
+                file_digests[info.filename] = digest.digest()
+        os.makedirs(dst, exist_ok=True)
+
+        if combine_hashes(file_digests) != expected_hash:
+            raise ValueError(f"{src} does not match the catalogue, rescan the datapacks")
+    except Exception:
+        # Never leave half a datapack behind
+        shutil.rmtree(dst, ignore_errors=True)
+        raise
+    return len(file_digests)
+
+
+def _verify_source_zip(src: str, pack: dict):
+    """Check a zip against the catalogue (read once per process and stamp)"""
+    if _installed_hash(src, pack, None) != pack["hash"]:
+        raise ValueError(f"{src} does not match the catalogue, rescan the datapacks")
+
+
+def _relative_files(root: str):
+    """{relative path: absolute path} of every file below root"""
+    files = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            files[os.path.relpath(path, root)] = path
+    return files
+
+
+# States of a datapack in a world, as reported by fleetStatus()
+STATE_MISSING = "missing"  # not installed
+STATE_INSTALLED = "installed"  # installed, content not checked
+STATE_OK = "ok"  # same content as the catalogue
+STATE_OUTDATED = "outdated"  # pack.mcmeta declares other pack formats
+STATE_DRIFT = "drift"  # same pack formats but other content
+
+# {(installed path, stamp): content hash} of installed copies already
+# hashed by this process
+_installed_hashes = {}
+
+
+def _file_ids(root: str):
+    """{relative path: (device, inode)} of every file below root"""
+    ids = {}
+    for relative, path in _relative_files(root).items():
+        st = os.stat(path)
+        ids[relative] = (st.st_dev, st.st_ino)
+    return ids
+
+
+def _installed_hash(path: str, pack: dict, source_ids) -> str:
+    """
+    Content hash of an installed copy of pack (comparable to pack["hash"])
+
+    A folder whose files are all hardlinks to the catalogue's files is
+    known to match without reading it. Other copies are hashed once per
+    process and stamp (the size and mtime of every file, or of the zip).
+    """
+    is_zip = not os.path.isdir(path)  # zip packs may be installed extracted
+    if is_zip:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+    else:
+        stamp = folder_stamp(path)  # per-file stats: sees in-place edits
+
+    key = (path, stamp)
+    content_hash = _installed_hashes.get(key)
+    if content_hash is None:
+        if is_zip:
+            with zipfile.ZipFile(path) as zip_file:
+                content_hash = zip_content_hash(zip_file)[0]
+        elif source_ids is not None and _file_ids(path) == source_ids:
+            content_hash = pack["hash"]
+        else:
+            content_hash = folder_content_hash(path)[0]
+        _installed_hashes[key] = content_hash
+    return content_hash
+
+
+def _installed_formats(path: str):
+    """Pack format range declared by an installed copy (None if unreadable)"""
+    try:
+        if not os.path.isdir(path):
+            with zipfile.ZipFile(path) as zip_file:
+                meta = json.loads(zip_file.read("pack.mcmeta").decode("utf-8"))
+        else:
+            with open(os.path.join(path, "pack.mcmeta"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+    return format_range(meta.get("pack", {}))
+
+
+def _world_status(world_path: str, packs, verify: bool, source_ids):
+    """
+    One row of the fleet status: a single scandir of the world's
+    datapacks folder, then a content check of each installed pack
+
+    Returns a dict {"world", "cells": {pack path: state}, "others": [names
+    of datapacks not in the catalogue]} with "error" if the folder could not
+    be read
+    """
+    row = {"world": world_path, "cells": {}, "others": []}
+    try:
+        with os.scandir(MC_DATAPACKS._world_datapacks_dir(world_path)) as entries:
+            installed = {entry.name: entry.path for entry in entries if not entry.name.startswith(".")}
+    except FileNotFoundError:
+        installed = {}
+    except OSError as e:
+        row["error"] = str(e)
+        installed = {}
+
+    for pack in packs:
+        names = _install_names(pack)
+        path = next((installed[name] for name in names if name in installed), None)
+        if path is None:
+            state = STATE_MISSING
+        elif not verify:
+            state = STATE_INSTALLED
+        else:
+            try:
+                if _installed_hash(path, pack, source_ids.get(pack["path"])) == pack["hash"]:
+                    state = STATE_OK
+                elif _installed_formats(path) != pack["formats"]:
+                    state = STATE_OUTDATED
+                else:
+                    state = STATE_DRIFT
+            except (OSError, zipfile.BadZipFile) as e:
+                logger.warning("Cannot check %s: %s", path, e)
+                state = STATE_DRIFT
+        row["cells"][pack["path"]] = state
+
+    names = {name for pack in packs for name in _install_names(pack)}
+    row["others"] = sorted(name for name in installed if name not in names)
+    return row
+
 
 class MC_DATAPACKS:
 
     @staticmethod
     def getAll():
-        return DATAPACKS
+        return CATALOGUE.packs()
+
+    @staticmethod
+    def refresh():
+        """Re-read the datapacks whose files changed since they were catalogued"""
+        CATALOGUE.refresh()
 
     @staticmethod
     def _world_datapacks_dir(world_path: str) -> str:
@@ -28,25 +328,79 @@ class MC_DATAPACKS:
         """
         Returns a list with datapack status (installed: True/False)
         """
-        world_dp = MC_DATAPACKS._world_datapacks_dir(world_path)
         status = []
 
-        for dp in DATAPACKS:
-            dp_path = os.path.join(world_dp, dp["path"])
+        for dp in CATALOGUE.packs():
             status.append({
                 "label": dp["label"],
                 "path": dp["path"],
-                "installed": os.path.isdir(dp_path)
+                "description": dp["description"],
+                "formats": dp["formats"],
+                "files": dp["files"],
+                "installed": _installed_path(world_path, dp) is not None
             })
 
         return status
 
     @staticmethod
-    def add(world_path: str, index: int):
+    def fleetStatus(world_paths, verify: bool = True, workers: int = None):
+        """
+        Which datapacks are installed in which worlds, for many worlds at once
+
+        Each world's datapacks folder is listed once, worlds in parallel.
+        With verify=True every installed pack is also compared with the
+        catalogue (STATE_OK, STATE_OUTDATED or STATE_DRIFT); otherwise
+        installed packs are STATE_INSTALLED.
+
+        Returns a dict {"packs": catalogue packs, "rows": [row per world]}
+        with rows as {"world", "cells": {pack path: state}, "others": [...]}
+        in the order of world_paths
+        """
+        packs = CATALOGUE.packs()
+
+        # Catalogue files' inodes, to recognise hardlinked installs
+        source_ids = {}
+        if verify:
+            for pack in packs:
+                if pack["kind"] == "folder":
+                    source_ids[pack["path"]] = _file_ids(os.path.join(DATAPACKS_BASE_PATH, pack["path"]))
+
+        world_paths = list(world_paths)
+        workers = workers or Config.SCAN_WORKERS
+        if workers <= 1 or len(world_paths) <= 1:
+            rows = [_world_status(path, packs, verify, source_ids) for path in world_paths]
+        else:
+            # Imported here: only the fleet report needs a pool
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                rows = list(pool.map(
+                    lambda path: _world_status(path, packs, verify, source_ids),
+                    world_paths
+                ))
+
+        return {"packs": packs, "rows": rows}
+
+    @staticmethod
+    def add(world_path: str, index, mode: str = None, extract: bool = None):
         """
-        Copy datapack into the world
+        Install datapack into the world
+
+        Files are reflinked from DATAPACKS_BASE_PATH when the filesystem
+        allows it, and copied otherwise; mode="hardlink" links them instead
+        (see INSTALL_METHODS; mode defaults to Config.DATAPACK_INSTALL_MODE).
+
+        A zip pack is checked against the catalogue's content hash and
+        placed as is, or with extract=True (default:
+        Config.DATAPACK_ZIP_EXTRACT) streamed into a folder.
+
+        index is the position in getAll() or the datapack's name.
+        Returns a dict {method: number of files} telling how they were placed
         """
-        dp = DATAPACKS[index]
+        dp = CATALOGUE.get(index)
+        mode = mode or Config.DATAPACK_INSTALL_MODE
+        if dp["kind"] == "zip":
+            return MC_DATAPACKS._add_zip(world_path, dp, mode, extract)
 
         src = os.path.join(DATAPACKS_BASE_PATH, dp["path"])
         dst = os.path.join(
@@ -60,20 +414,149 @@ class MC_DATAPACKS:
         if os.path.exists(dst):
             raise FileExistsError(f"Datapack already installed: {dst}")
 
-        shutil.copytree(src, dst)
+        methods = {}
+        try:
+            for relative, src_file in _relative_files(src).items():
+                dst_file = os.path.join(dst, relative)
+                os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+                method = _place_file(src_file, dst_file, mode)
+                methods[method] = methods.get(method, 0) + 1
+            os.makedirs(dst, exist_ok=True)
+        except Exception:
+            # Never leave half a datapack behind
+            shutil.rmtree(dst, ignore_errors=True)
+            raise
+
+        logger.debug("Installed %s in %s: %s", dp["path"], world_path, methods)
+        return methods
+
+    @staticmethod
+    def _add_zip(world_path: str, dp: dict, mode: str, extract: bool):
+        if extract is None:
+            extract = Config.DATAPACK_ZIP_EXTRACT
+
+        src = os.path.join(DATAPACKS_BASE_PATH, dp["path"])
+        world_dp = MC_DATAPACKS._world_datapacks_dir(world_path)
+
+        if not os.path.isfile(src):
+            raise FileNotFoundError(f"Source datapack not found: {src}")
+
+        installed = _installed_path(world_path, dp)
+        if installed:
+            raise FileExistsError(f"Datapack already installed: {installed}")
+
+        if extract:
+            files = _extract_zip(src, os.path.join(world_dp, _install_names(dp)[1]), dp["hash"])
+            methods = {"extract": files}
+        else:
+            _verify_source_zip(src, dp)
+            os.makedirs(world_dp, exist_ok=True)
+            methods = {_place_file(src, os.path.join(world_dp, dp["path"]), mode): 1}
+
+        logger.debug("Installed %s in %s: %s", dp["path"], world_path, methods)
+        return methods
+
+    @staticmethod
+    def _sync_zip(world_path: str, dp: dict, mode: str):
+        src = os.path.join(DATAPACKS_BASE_PATH, dp["path"])
+        dst = _installed_path(world_path, dp)
+        result = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        if dst is None:
+            MC_DATAPACKS._add_zip(world_path, dp, mode, None)
+            result["added"] = 1
+        elif os.path.isdir(dst):
+            # Extracted: re-extracted next to it and swapped when it differs
+            if _installed_hash(dst, dp, None) == dp["hash"]:
+                result["unchanged"] = dp["files"]
+            else:
+                staging = f"{dst}.mc-tmp"
+                shutil.rmtree(staging, ignore_errors=True)
+                _extract_zip(src, staging, dp["hash"])
+                shutil.rmtree(dst)
+                os.rename(staging, dst)
+                result["updated"] = dp["files"]
+        elif _same_file(src, dst):
+            result["unchanged"] = 1
+        else:
+            _verify_source_zip(src, dp)
+            _place_file(src, dst, mode)
+            result["updated"] = 1
+        return result
 
     @staticmethod
-    def delete(world_path: str, index: int):
+    def sync(world_path: str, index, mode: str = None):
         """
-        Remove datapack from the world
+        Bring an installed datapack up to date with DATAPACKS_BASE_PATH
+
+        Only files whose size, mtime or content differ are placed again;
+        files that are no longer in the source are deleted. A datapack that
+        is not installed yet is installed.
+
+        Returns a dict {"added", "updated", "removed", "unchanged"} of file counts
+        (a zip placed as is counts as one file)
         """
-        dp = DATAPACKS[index]
+        dp = CATALOGUE.get(index)
+        mode = mode or Config.DATAPACK_INSTALL_MODE
+        if dp["kind"] == "zip":
+            return MC_DATAPACKS._sync_zip(world_path, dp, mode)
+
+        src = os.path.join(DATAPACKS_BASE_PATH, dp["path"])
         dst = os.path.join(
             MC_DATAPACKS._world_datapacks_dir(world_path),
             dp["path"]
         )
 
+        if not os.path.isdir(src):
+            raise FileNotFoundError(f"Source datapack not found: {src}")
+
         if not os.path.isdir(dst):
-            raise FileNotFoundError(f"Datapack not installed: {dst}")
+            methods = MC_DATAPACKS.add(world_path, index, mode)
+            return {"added": sum(methods.values()), "updated": 0, "removed": 0, "unchanged": 0}
+
+        result = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        src_files = _relative_files(src)
+        dst_files = _relative_files(dst)
+
+        for relative, src_file in src_files.items():
+            dst_file = os.path.join(dst, relative)
+            if relative in dst_files:
+                if _same_file(src_file, dst_file):
+                    result["unchanged"] += 1
+                    continue
+                result["updated"] += 1
+            else:
+                os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+                result["added"] += 1
+            _place_file(src_file, dst_file, mode)
+
+        for relative, dst_file in dst_files.items():
+            if relative not in src_files:
+                os.remove(dst_file)
+                result["removed"] += 1
+
+        # Drop directories left empty by removed files
+        for dirpath, _, _ in sorted(os.walk(dst), reverse=True):
+            if dirpath != dst and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+        logger.debug("Synced %s in %s: %s", dp["path"], world_path, result)
+        return result
+
+    @staticmethod
+    def delete(world_path: str, index):
+        """
+        Remove datapack from the world
+        """
+        dp = CATALOGUE.get(index)
+        dst = _installed_path(world_path, dp)
+
+        if dst is None:
+            raise FileNotFoundError(
+                f"Datapack not installed: {os.path.join(MC_DATAPACKS._world_datapacks_dir(world_path), dp['path'])}"
+            )
 
-        shutil.rmtree(dst)
+        if os.path.isdir(dst):
+            shutil.rmtree(dst)
+        else:
+            os.remove(dst)
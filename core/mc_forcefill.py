@@ -6,83 +6,51 @@ Works with both level.dat (singleplayer) and player.dat (multiplayer).
 Usage:
     python mc_forcefill.py level.dat                  # singleplayer
     python mc_forcefill.py playerdata/<uuid>.dat      # multiplayer
+
+Batch mode (any number of files, worlds, saves folders or glob patterns,
+processed in parallel on all CPU cores):
+    python mc_forcefill.py ~/.minecraft/saves/
+    python mc_forcefill.py --workers 4 "server/*/playerdata/*.dat" world2/
 """
 
+import os
 import sys
+import time
+import logging
 import shutil
+import argparse
 from pathlib import Path
 from utils.NBTFile import NBTFile
-try:
-    import nbtlib
-except ImportError:
-    print("Error: nbtlib is required. Install it with: pip install nbtlib")
-    sys.exit(1)
-
-
-# Items that stack to 16 instead of 64
-STACK_16_ITEMS = {
-    'minecraft:snowball',
-    'minecraft:egg',
-    'minecraft:ender_pearl',
-    'minecraft:sign',
-    'minecraft:oak_sign',
-    'minecraft:spruce_sign',
-    'minecraft:birch_sign',
-    'minecraft:jungle_sign',
-    'minecraft:acacia_sign',
-    'minecraft:dark_oak_sign',
-    'minecraft:crimson_sign',
-    'minecraft:warped_sign',
-    'minecraft:mangrove_sign',
-    'minecraft:bamboo_sign',
-    'minecraft:cherry_sign',
-    'minecraft:bucket',
-    'minecraft:water_bucket',
-    'minecraft:lava_bucket',
-    'minecraft:milk_bucket',
-    'minecraft:powder_snow_bucket',
-    'minecraft:axolotl_bucket',
-    'minecraft:tadpole_bucket',
-    'minecraft:cod_bucket',
-    'minecraft:salmon_bucket',
-    'minecraft:pufferfish_bucket',
-    'minecraft:tropical_fish_bucket',
-}
-
-# Item categories that stack to 1 (tools, armor, etc.)
-NON_STACKABLE_KEYWORDS = [
-    'sword', 'pickaxe', 'axe', 'shovel', 'hoe',
-    'helmet', 'chestplate', 'leggings', 'boots',
-    'bow', 'crossbow', 'trident', 'shield',
-    'shears', 'flint_and_steel', 'fishing_rod',
-    'carrot_on_a_stick', 'warped_fungus_on_a_stick',
-    'elytra', 'saddle', 'horse_armor',
-    'music_disc', 'potion', 'splash_potion',
-    'lingering_potion', 'enchanted_book',
-    'writable_book', 'written_book',
-    'suspicious_stew', 'totem_of_undying', 'spyglass',
-    'water_bucket', 'lava_bucket'
-]
+from core.player_files import expand_targets
+from core.mc_items import max_stack_size
+from utils.log import setup_logging, add_logging_arguments
+
+logger = logging.getLogger(__name__)
+
+# The player compound keys process_player_data() may modify
+FILLED_KEYS = frozenset({'Inventory', 'EnderItems'})
 
 
 def is_non_stackable(item_id):
     """Check if an item is non-stackable (tools, armor, etc.)"""
-    item_lower = item_id.lower()
-    return any(keyword in item_lower for keyword in NON_STACKABLE_KEYWORDS)
+    return max_stack_size(item_id) == 1
 
 
 def get_max_stack_size(item_id):
-    """Determine the maximum stack size for an item"""
-    if is_non_stackable(item_id):
-        return 1
-    elif item_id in STACK_16_ITEMS:
-        return 16
-    else:
-        return 64
+    """Determine the maximum stack size for an item (registry lookup)"""
+    return max_stack_size(item_id)
 
 
 def process_inventory_slot(slot):
-    """Process a single inventory slot and set count to max stack size"""
+    """
+    Process a single inventory slot and raise its count to the max stack size
+
+    A count already above the listed maximum is left alone: the item list
+    is kept by hand, and a wrong entry must not delete items.
+    """
+    # nbtlib is already loaded here: slot comes from an opened NBTFile
+    from nbtlib import Byte
+
     if 'id' in slot:
         item_id = str(slot['id'])
         max_stack = get_max_stack_size(item_id)
@@ -90,33 +58,41 @@ def process_inventory_slot(slot):
         # Get current count
         current_count = int(slot.get('count', 1))
         
-        # Set to max stack size
-        slot['count'] = nbtlib.Byte(max_stack)
+        # Raise to max stack size, never lower
+        new_count = max(current_count, max_stack)
+        if new_count != current_count:
+            slot['count'] = Byte(new_count)
         
-        return item_id, current_count, max_stack
+        return item_id, current_count, new_count
     return None, None, None
 
 
 def process_player_data(player_data):
     """Process player inventory data (works for both level.dat Player and playerdata/*.dat)"""
     modified_count = 0
+    # Checked once: per-slot messages are the hot path on bulk runs
+    debug = logger.isEnabledFor(logging.DEBUG)
     
     # Process Inventory
     if 'Inventory' in player_data:
-        print("\nProcessing Inventory:")
+        if debug:
+            logger.debug("Processing Inventory:")
         for slot in player_data['Inventory']:
             item_id, old_count, new_count = process_inventory_slot(slot)
             if item_id and old_count != new_count:
-                print(f"  {item_id}: {old_count} → {new_count}")
+                if debug:
+                    logger.debug("  %s: %s → %s", item_id, old_count, new_count)
                 modified_count += 1
     
     # Process Ender Chest
     if 'EnderItems' in player_data:
-        print("\nProcessing Ender Chest:")
+        if debug:
+            logger.debug("Processing Ender Chest:")
         for slot in player_data['EnderItems']:
             item_id, old_count, new_count = process_inventory_slot(slot)
             if item_id and old_count != new_count:
-                print(f"  {item_id}: {old_count} → {new_count}")
+                if debug:
+                    logger.debug("  %s: %s → %s", item_id, old_count, new_count)
                 modified_count += 1
     
     return modified_count
@@ -130,28 +106,112 @@ def forcefill_file(filepath):
         
     # Save modified NBT
     if modified_count > 0:
-        print(f"\nSaving changes to {filepath}...")
-        nbt.savefile(player_data)
-        print(f"✓ Successfully modified {modified_count} slot(s)")
+        logger.info("Saving changes to %s...", filepath)
+        nbt.savefile(player_data, changed=FILLED_KEYS)
+        logger.info("✓ Successfully modified %d slot(s)", modified_count)
     else:
-        print("\n✓ No changes needed - all slots already at max stack size")
+        logger.info("✓ No changes needed - all slots already at max stack size")
     
     return True
 
 
+def _forcefill_worker(filepath):
+    """
+    Force fill one file inside a batch.
+    Never raises, so one broken file does not stop the batch.
+    """
+    start = time.perf_counter()
+    result = {"path": str(filepath), "modified": 0, "error": None}
+    try:
+        nbt = NBTFile(filepath)
+        player_data = nbt.openfile()
+        result["modified"] = process_player_data(player_data)
+        if result["modified"] > 0:
+            nbt.savefile(player_data, changed=FILLED_KEYS)
+    except Exception as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def forcefill_batch(targets, workers=None):
+    """
+    Force fill every player file found in targets using a process pool
+    
+    Args:
+        targets: Files, world directories, saves directories or glob patterns
+        workers: Number of processes (default: one per CPU core)
+        
+    Returns:
+        tuple: (list of per-file result dicts, summary dict)
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    files = expand_targets(targets)
+    workers = workers or os.cpu_count() or 1
+    
+    start = time.perf_counter()
+    if workers <= 1 or len(files) <= 1:
+        results = [_forcefill_worker(f) for f in files]
+    else:
+        chunksize = max(1, len(files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_forcefill_worker, files, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+    
+    summary = {
+        "files": len(results),
+        "changed_files": sum(1 for r in results if r["modified"] > 0),
+        "modified_slots": sum(r["modified"] for r in results),
+        "errors": sum(1 for r in results if r["error"]),
+        "seconds": elapsed,
+        "files_per_second": len(results) / elapsed if elapsed > 0 else 0.0,
+    }
+    return results, summary
+
 
 def main():
-    if len(sys.argv) != 2:
-        print(__doc__)
-        print("\nExamples:")
-        print("  python forcefill.py level.dat                    # singleplayer")
-        print("  python forcefill.py playerdata/abc-123.dat       # multiplayer")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "targets",
+        nargs="+",
+        help="Player .dat files, worlds, saves folders or glob patterns"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes in batch mode (default: CPU count)"
+    )
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    setup_logging(verbose=args.verbose, quiet=args.quiet)
+    
+    # Single file: show the slot by slot details (logged at DEBUG) unless -q
+    if len(args.targets) == 1 and os.path.isfile(args.targets[0]):
+        if not args.quiet:
+            logger.setLevel(logging.DEBUG)
+        success = forcefill_file(args.targets[0])
+        sys.exit(0 if success else 1)
+    
+    results, summary = forcefill_batch(args.targets, args.workers)
+    
+    for result in results:
+        if result["error"]:
+            logger.error("✗ %s: %s", result['path'], result['error'])
+        else:
+            logger.info("✓ %s: %d slot(s) in %.1f ms", result['path'], result['modified'], result['seconds'] * 1000)
     
-    filepath = sys.argv[1]
-    success = forcefill_file(filepath)
+    print(
+        f"\n{summary['files']} file(s), {summary['changed_files']} changed, "
+        f"{summary['modified_slots']} slot(s) modified, {summary['errors']} error(s) "
+        f"in {summary['seconds']:.2f}s ({summary['files_per_second']:.1f} files/s)"
+    )
     
-    sys.exit(0 if success else 1)
+    sys.exit(1 if summary["errors"] else 0)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+mc_functions.py – Make datapack functions (.mcfunction) shorter without
+changing what they build.
+
+Every command of a function costs server time when it runs. Building
+functions are mostly setblock and fill commands with relative (~)
+coordinates; this tool simulates those block writes and:
+
+- drops setblock/fill commands whose blocks are all overwritten later
+- merges setblocks of the same block into as few fill boxes as possible
+
+Any other command (say, item, summon, execute, ...) and any block command
+it does not understand (absolute or ^ coordinates, fill modes, setblock
+keep/destroy) is a barrier: nothing is moved or merged across it, so
+commands that depend on blocks placed before them still see them.
+Comments and blank lines are kept.
+
+Each optimized function is checked by simulating the original and the
+new commands; if the blocks they leave differ, the file is left unchanged.
+
+Usage:
+    python mc_functions.py datapacks/mc_buildings            # report only
+    python mc_functions.py datapacks/mc_buildings --write    # rewrite files
+    python mc_functions.py home.mcfunction -v                # show the result
+"""
+
+import os
+import sys
+import logging
+import argparse
+from utils.log import setup_logging, add_logging_arguments
+
+logger = logging.getLogger(__name__)
+
+# Largest number of blocks a single fill command may change
+FILL_LIMIT = 32768
+
+# Words that may follow the block of a plain fill / setblock
+_FILL_MODES = ("replace",)
+_SETBLOCK_MODES = ("replace",)
+
+
+def _relative(token):
+    """'~' -> 0, '~-3' -> -3; None for absolute, ^ or fractional coordinates"""
+    if not token.startswith("~"):
+        return None
+    offset = token[1:]
+    if not offset:
+        return 0
+    try:
+        return int(offset)
+    except ValueError:
+        return None
+
+
+def _split_block(text):
+    """
+    Split "<block> <rest>" where the block may hold [states] and {nbt}
+    with spaces inside
+
+    Returns:
+        tuple: (block, list of the remaining words)
+    """
+    depth = 0
+    quote = None
+    for i, char in enumerate(text):
+        if quote:
+            if char == quote and text[i - 1] != "\\":
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+        elif char == " " and depth == 0:
+            return text[:i], text[i + 1:].split()
+    return text, []
+
+
+def parse_line(line):
+    """
+    Parse one line of a function
+
+    Returns:
+        dict: {"kind": "blank" | "comment" | "command" | "setblock" | "fill",
+               "line": the original line} plus, for block commands,
+               "box": ((x1, y1, z1), (x2, y2, z2)) with x1 <= x2 ... and "block"
+    """
+    text = line.strip()
+    if not text:
+        return {"kind": "blank", "line": line}
+    if text.startswith("#"):
+        return {"kind": "comment", "line": line}
+
+    op = {"kind": "command", "line": line}
+    words = text.split(" ", 1)
+    if words[0] not in ("setblock", "fill") or len(words) < 2:
+        return op
+
+    coords_count = 3 if words[0] == "setblock" else 6
+    parts = words[1].split(" ", coords_count)
+    if len(parts) <= coords_count:
+        return op
+    coords = [_relative(token) for token in parts[:coords_count]]
+    if None in coords:
+        return op
+
+    block, rest = _split_block(parts[coords_count].strip())
+    modes = _SETBLOCK_MODES if words[0] == "setblock" else _FILL_MODES
+    if rest and (len(rest) > 1 or rest[0] not in modes):
+        return op  # keep / destroy / hollow / outline / replace <filter>
+
+    if words[0] == "setblock":
+        corner = tuple(coords)
+        box = (corner, corner)
+    else:
+        a, b = coords[:3], coords[3:]
+        box = (
+            tuple(min(a[i], b[i]) for i in range(3)),
+            tuple(max(a[i], b[i]) for i in range(3)),
+        )
+    if _volume(box) > FILL_LIMIT:
+        return op
+
+    op.update(kind=words[0], box=box, block=block)
+    return op
+
+
+def _volume(box):
+    (x1, y1, z1), (x2, y2, z2) = box
+    return (x2 - x1 + 1) * (y2 - y1 + 1) * (z2 - z1 + 1)
+
+
+def _cells(box):
+    (x1, y1, z1), (x2, y2, z2) = box
+    return [
+        (x, y, z)
+        for x in range(x1, x2 + 1)
+        for y in range(y1, y2 + 1)
+        for z in range(z1, z2 + 1)
+    ]
+
+
+def _is_block_op(op):
+    return op["kind"] in ("setblock", "fill")
+
+
+def _format_offset(offset):
+    return f"~{offset}" if offset else "~"
+
+
+def _fill_line(box, block):
+    coords = [*box[0], *box[1]]
+    return "fill " + " ".join(_format_offset(c) for c in coords) + f" {block}"
+
+
+def merge_boxes(cells):
+    """
+    Cover a set of cells with few boxes, greedily: grow a box from the
+    lowest cell along x, then z, then y, as long as every cell of the new
+    row or layer is still uncovered
+
+    Returns:
+        list of ((x1, y1, z1), (x2, y2, z2))
+    """
+    remaining = set(cells)
+    boxes = []
+    for start in sorted(cells, key=lambda c: (c[1], c[2], c[0])):
+        if start not in remaining:
+            continue
+        x0, y0, z0 = start
+        x1, y1, z1 = x0, y0, z0
+
+        while (x1 + 1, y0, z0) in remaining and _volume(((x0, y0, z0), (x1 + 1, y1, z1))) <= FILL_LIMIT:
+            x1 += 1
+        while (all((x, y0, z1 + 1) in remaining for x in range(x0, x1 + 1))
+               and _volume(((x0, y0, z0), (x1, y1, z1 + 1))) <= FILL_LIMIT):
+            z1 += 1
+        while (all((x, y1 + 1, z) in remaining for x in range(x0, x1 + 1) for z in range(z0, z1 + 1))
+               and _volume(((x0, y0, z0), (x1, y1 + 1, z1))) <= FILL_LIMIT):
+            y1 += 1
+
+        box = ((x0, y0, z0), (x1, y1, z1))
+        remaining.difference_update(_cells(box))
+        boxes.append(box)
+    return boxes
+
+
+def _optimize_segment(ops):
+    """
+    Optimize a run of block commands with no barrier in between
+
+    Args:
+        ops: Parsed setblock/fill ops, in order
+
+    Returns:
+        list: {position in ops: [lines to emit there]}; ops missing from
+              the dict are dropped
+    """
+    # 1. Drop commands whose every block is written again later
+    covered = set()
+    kept = []
+    for index in range(len(ops) - 1, -1, -1):
+        cells = _cells(ops[index]["box"])
+        if covered.issuperset(cells):
+            continue
+        covered.update(cells)
+        kept.append(index)
+    kept.reverse()
+
+    # 2. Merge the remaining setblocks by block. Their cells are not
+    # written by any later command (step 1), so each group can be placed
+    # where its last setblock was.
+    groups = {}
+    for index in kept:
+        if ops[index]["kind"] == "setblock":
+            groups.setdefault(ops[index]["block"], []).append(index)
+
+    emit = {}
+    for index in kept:
+        if ops[index]["kind"] == "fill":
+            emit[index] = [ops[index]["line"]]
+    for block, members in groups.items():
+        by_cell = {ops[index]["box"][0]: index for index in members}
+        lines = []
+        for box in merge_boxes(by_cell):
+            if box[0] == box[1]:
+                lines.append(ops[by_cell[box[0]]]["line"])  # keep as written
+            else:
+                lines.append(_fill_line(box, block))
+        emit[members[-1]] = lines
+    return emit
+
+
+def simulate(ops):
+    """
+    Blocks written by a function, between barriers
+
+    Returns:
+        list: One {cell: block} dict per run of block commands
+    """
+    states = [{}]
+    for op in ops:
+        if op["kind"] == "command":
+            states.append({})
+        elif _is_block_op(op):
+            block = op["block"]
+            state = states[-1]
+            for cell in _cells(op["box"]):
+                state[cell] = block
+    return states
+
+
+def count_commands(ops):
+    return sum(1 for op in ops if op["kind"] not in ("blank", "comment"))
+
+
+def optimize_lines(lines):
+    """
+    Optimize the lines of a function
+
+    Args:
+        lines: Lines of the .mcfunction file, without line endings
+
+    Returns:
+        tuple: (new lines, commands before, commands after)
+    """
+    ops = [parse_line(line) for line in lines]
+
+    # Positions of the block commands of each run between barriers
+    segments = [[]]
+    for position, op in enumerate(ops):
+        if op["kind"] == "command":
+            segments.append([])
+        elif _is_block_op(op):
+            segments[-1].append(position)
+
+    replaced = {}
+    for positions in segments:
+        emit = _optimize_segment([ops[p] for p in positions])
+        for i, position in enumerate(positions):
+            replaced[position] = emit.get(i, [])
+
+    new_lines = []
+    for position, op in enumerate(ops):
+        new_lines.extend(replaced.get(position, [op["line"]]))
+
+    new_ops = [parse_line(line) for line in new_lines]
+    if simulate(new_ops) != simulate(ops):
+        # Never hand out a function that builds something else
+        logger.warning("Optimization changed the result, keeping the original")
+        return list(lines), count_commands(ops), count_commands(ops)
+
+    return new_lines, count_commands(ops), count_commands(new_ops)
+
+
+def optimize_file(filepath, write=False):
+    """
+    Optimize one .mcfunction file
+
+    Args:
+        filepath: Function file
+        write: Replace the file with the optimized function
+
+    Returns:
+        dict: {"path", "before", "after", "lines"} (command counts and the
+              optimized lines)
+    """
+    with open(filepath, "r", encoding="utf-8") as f:
+        text = f.read()
+    lines = text.splitlines()
+
+    new_lines, before, after = optimize_lines(lines)
+
+    if write and after < before:
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(new_lines) + ("\n" if text.endswith("\n") else ""))
+        os.replace(tmp_path, filepath)
+        logger.debug("Rewrote %s", filepath)
+
+    return {"path": filepath, "before": before, "after": after, "lines": new_lines}
+
+
+def function_files(paths):
+    """Every .mcfunction file given or found below the given folders"""
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in sorted(os.walk(path)):
+                for filename in sorted(filenames):
+                    if filename.endswith(".mcfunction"):
+                        yield os.path.join(dirpath, filename)
+        else:
+            yield path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("paths", nargs="+", help=".mcfunction files or folders holding them")
+    parser.add_argument("--write", action="store_true", help="Rewrite the files (default: only report)")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    setup_logging(verbose=args.verbose, quiet=args.quiet)
+
+    total_before = total_after = 0
+    for filepath in function_files(args.paths):
+        result = optimize_file(filepath, write=args.write)
+        total_before += result["before"]
+        total_after += result["after"]
+        saved = result["before"] - result["after"]
+        print(f"{filepath}: {result['before']} -> {result['after']} commands (-{saved})")
+        logger.debug("\n".join(result["lines"]))
+
+    print(f"\nTotal: {total_before} -> {total_after} commands")
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
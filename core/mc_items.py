@@ -0,0 +1,119 @@
+"""
+mc_items.py – Bundled list of Minecraft items that do not stack to 64.
+
+MAX_STACK_SIZES maps every item id that stacks to 1 or 16 to its maximum
+stack size. It is built once at import time from the lists below; any item
+missing from it stacks to 64.
+
+Usage:
+    from core.mc_items import max_stack_size
+    max_stack_size("minecraft:diamond_pickaxe")   # 1
+    max_stack_size("ender_pearl")                 # 16
+    max_stack_size("minecraft:bowl")              # 64
+"""
+
+DEFAULT_STACK_SIZE = 64
+
+COLORS = [
+    'white', 'orange', 'magenta', 'light_blue', 'yellow', 'lime', 'pink',
+    'gray', 'light_gray', 'cyan', 'purple', 'blue', 'brown', 'green',
+    'red', 'black',
+]
+
+WOOD_TYPES = [
+    'oak', 'spruce', 'birch', 'jungle', 'acacia', 'dark_oak', 'mangrove',
+    'cherry', 'pale_oak', 'bamboo', 'crimson', 'warped',
+]
+
+# Wood types that have boats (bamboo has rafts, nether woods have none)
+BOAT_WOOD_TYPES = [
+    'oak', 'spruce', 'birch', 'jungle', 'acacia', 'dark_oak', 'mangrove',
+    'cherry', 'pale_oak',
+]
+
+TOOL_MATERIALS = ['wooden', 'stone', 'iron', 'golden', 'diamond', 'netherite']
+TOOLS = ['sword', 'pickaxe', 'axe', 'shovel', 'hoe']
+
+ARMOR_MATERIALS = ['leather', 'chainmail', 'iron', 'golden', 'diamond', 'netherite']
+ARMOR_PIECES = ['helmet', 'chestplate', 'leggings', 'boots']
+
+MUSIC_DISCS = [
+    '13', 'cat', 'blocks', 'chirp', 'far', 'mall', 'mellohi', 'stal',
+    'strad', 'ward', '11', 'wait', 'otherside', '5', 'pigstep', 'relic',
+    'creator', 'creator_music_box', 'precipice', 'tears', 'lava_chicken',
+]
+
+FISH_BUCKETS = [
+    'cod_bucket', 'salmon_bucket', 'pufferfish_bucket',
+    'tropical_fish_bucket', 'axolotl_bucket', 'tadpole_bucket',
+]
+
+# Items that stack to 1 and are not generated from the lists above
+SINGLE_ITEMS = [
+    'bow', 'crossbow', 'trident', 'shield', 'mace', 'shears',
+    'flint_and_steel', 'fishing_rod', 'carrot_on_a_stick',
+    'warped_fungus_on_a_stick', 'brush', 'spyglass', 'goat_horn',
+    'elytra', 'turtle_helmet', 'saddle', 'totem_of_undying',
+    'leather_horse_armor', 'iron_horse_armor', 'golden_horse_armor',
+    'diamond_horse_armor', 'wolf_armor',
+    'water_bucket', 'lava_bucket', 'milk_bucket', 'powder_snow_bucket',
+    'potion', 'splash_potion', 'lingering_potion',
+    'enchanted_book', 'writable_book', 'knowledge_book',
+    'mushroom_stew', 'rabbit_stew', 'beetroot_soup', 'suspicious_stew',
+    'cake', 'bundle', 'debug_stick',
+    'minecart', 'chest_minecart', 'furnace_minecart', 'tnt_minecart',
+    'hopper_minecart', 'command_block_minecart',
+    'bamboo_raft', 'bamboo_chest_raft',
+    'shulker_box',
+]
+
+# Items that stack to 16 and are not generated from the lists above
+STACK_16_ITEMS = [
+    'snowball', 'egg', 'blue_egg', 'brown_egg', 'ender_pearl', 'bucket',
+    'honey_bottle', 'armor_stand', 'written_book',
+]
+
+
+def _build_registry():
+    """Expand the lists above into {item_id: max_stack_size}"""
+    single = set(SINGLE_ITEMS)
+    single.update(f'{m}_{t}' for m in TOOL_MATERIALS for t in TOOLS)
+    single.update(f'{m}_{p}' for m in ARMOR_MATERIALS for p in ARMOR_PIECES)
+    single.update(f'music_disc_{d}' for d in MUSIC_DISCS)
+    single.update(FISH_BUCKETS)
+    single.update(f'{c}_bed' for c in COLORS)
+    single.update(f'{c}_shulker_box' for c in COLORS)
+    single.update(f'{c}_bundle' for c in COLORS)
+    single.update(f'{w}_boat' for w in BOAT_WOOD_TYPES)
+    single.update(f'{w}_chest_boat' for w in BOAT_WOOD_TYPES)
+
+    stack_16 = set(STACK_16_ITEMS)
+    stack_16.update(f'{w}_sign' for w in WOOD_TYPES)
+    stack_16.update(f'{w}_hanging_sign' for w in WOOD_TYPES)
+    stack_16.update(f'{c}_banner' for c in COLORS)
+
+    registry = {}
+    for item in stack_16:
+        registry[f'minecraft:{item}'] = 16
+    for item in single:
+        registry[f'minecraft:{item}'] = 1
+    return registry
+
+
+MAX_STACK_SIZES = _build_registry()
+
+# Lookups of ids not written as "minecraft:<lowercase id>" are remembered,
+# so every distinct spelling is normalised only once
+_lookup_cache = dict(MAX_STACK_SIZES)
+
+
+def max_stack_size(item_id):
+    """Maximum stack size of an item id, O(1) per call"""
+    size = _lookup_cache.get(item_id)
+    if size is None:
+        normalised = item_id.lower()
+        if ':' not in normalised:
+            normalised = f'minecraft:{normalised}'
+        size = MAX_STACK_SIZES.get(normalised, DEFAULT_STACK_SIZE)
+        _lookup_cache[item_id] = size
+    return size
@@ -1,11 +1,15 @@
-import nbtlib
+import logging
 import argparse
 from pathlib import Path
 from utils.NBTFile import NBTFile
-from nbtlib.tag import Compound, List, String, Int, Double, Float
+from utils.log import setup_logging
+
+logger = logging.getLogger(__name__)
 
 def read_player_inventory(player_data):
     """Opens the NBT file and returns a dictionary of inventory items."""
+    from nbtlib.tag import List
+
     try:
         inventory = player_data.get('Inventory')
         if not inventory or not isinstance(inventory, List):
@@ -23,7 +27,7 @@ def read_player_inventory(player_data):
         return items_by_slot
             
     except Exception as e:
-        print(f"❌ Error reading inventory: {e}")
+        logger.error("❌ Error reading inventory: %s", e)
         return {}
 
 def read_player_attributes(player_data):
@@ -44,13 +48,15 @@ def read_player_attributes(player_data):
         return attr_dict
 
     except Exception as e:
-        print(f"❌ Error reading attributes: {e}")
+        logger.error("❌ Error reading attributes: %s", e)
         return {}
 
 def write_player_attributes(player_data, field_name, val_array):
     """
     Writes attributes to player_data NBT structure using nbtlib types.
     """
+    from nbtlib.tag import Compound, List, String, Int, Double, Float
+
     try:
         # Case 1: Plain scalar field (e.g., 'XpLevel', 'Health')
         if field_name.lower() not in ('attributes'):
@@ -85,13 +91,62 @@ def write_player_attributes(player_data, field_name, val_array):
 
         # In nbtlib, we must wrap the list in a List tag specifying the type
         player_data[field_name] = List[Compound](attr_list)
-        print(f"✓ Successfully wrote {len(attr_list)} attributes to {field_name}")
+        logger.debug("✓ Successfully wrote %d attributes to %s", len(attr_list), field_name)
         return True
 
     except Exception as e:
-        print(f"❌ Error writing attributes: {e}")
+        logger.error("❌ Error writing attributes: %s", e)
+        return False
+
+
+def _same_value(current, new):
+    """
+    True if an edited attribute value equals the loaded one. Values typed
+    in the UI arrive as strings, so both sides are compared as numbers.
+    """
+    if current is None:
+        return False
+    try:
+        return float(current) == float(new)
+    except (TypeError, ValueError):
         return False
 
+
+def apply_player_attributes(player_data, attributes_data):
+    """
+    Write the attributes whose value differs from the one in player_data.
+
+    Args:
+        player_data: Player compound
+        attributes_data: {name: value} as read_player_attributes() returns
+                         it (values may be strings typed by the user)
+
+    Returns:
+        tuple: (names of the attributes that changed,
+                set of player_data keys that were rewritten)
+    """
+    current = read_player_attributes(player_data)
+    changed_fields = [
+        name for name, value in attributes_data.items()
+        if not _same_value(current.get(name), value)
+    ]
+    changed_keys = set()
+
+    if "XpLevel" in changed_fields:
+        write_player_attributes(player_data, "XpLevel", int(attributes_data["XpLevel"]))
+        changed_keys.add("XpLevel")
+
+    # The attributes list is written as a whole when any of them changed
+    minecraft_attributes = {
+        k: v for k, v in attributes_data.items()
+        if k.startswith("minecraft:")
+    }
+    if any(name in minecraft_attributes for name in changed_fields):
+        write_player_attributes(player_data, "attributes", minecraft_attributes)
+        changed_keys.add("attributes")
+
+    return changed_fields, changed_keys
+
     
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -110,6 +165,7 @@ if __name__ == "__main__":
     )
     
     args = parser.parse_args()
+    setup_logging()
     filepath = Path(args.file_path)
 
     if not filepath.exists():
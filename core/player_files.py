@@ -0,0 +1,106 @@
+"""
+Player Files - Find every player data file under a path
+
+Accepts single .dat files, world directories, whole saves directories and
+glob patterns, and expands them into the player data files they contain:
+- level.dat, when it embeds the player (old single-player format)
+- players/data/<uuid>.dat (new single-player format)
+- playerdata/<uuid>.dat (multiplayer / LAN)
+"""
+import os
+import glob
+
+from utils.NBTStream import NBTStream
+
+
+PLAYER_DIRS = ("playerdata", os.path.join("players", "data"))
+
+
+def _scan_dat_files(directory):
+    """Sorted .dat files directly inside directory (no parsing)"""
+    try:
+        with os.scandir(directory) as entries:
+            files = [
+                entry.path for entry in entries
+                if entry.name.endswith(".dat") and entry.is_file()
+            ]
+    except OSError:
+        return []
+    return sorted(files)
+
+
+def _level_dat_has_player(level_dat_path):
+    try:
+        found = NBTStream(level_dat_path).fetch([], probe=["Data.Player"])
+    except Exception:
+        return False
+    return "Data.Player" in found
+
+
+def world_player_files(world_path):
+    """List the player data files of one world directory"""
+    files = []
+
+    level_dat_path = os.path.join(world_path, "level.dat")
+    if os.path.isfile(level_dat_path) and _level_dat_has_player(level_dat_path):
+        files.append(level_dat_path)
+
+    for player_dir in PLAYER_DIRS:
+        files.extend(_scan_dat_files(os.path.join(world_path, player_dir)))
+
+    return files
+
+
+def find_player_files(path):
+    """
+    Expand a file, world directory or saves directory into player files
+
+    Args:
+        path: A .dat file, a world (has level.dat) or a saves directory
+
+    Returns:
+        list of player data file paths
+    """
+    path = os.path.expanduser(path)
+
+    if os.path.isfile(path):
+        return [path]
+
+    if not os.path.isdir(path):
+        return []
+
+    if os.path.isfile(os.path.join(path, "level.dat")):
+        return world_player_files(path)
+
+    # A saves directory: every sub directory is a world
+    files = []
+    with os.scandir(path) as entries:
+        worlds = sorted(entry.path for entry in entries if entry.is_dir())
+    for world_path in worlds:
+        files.extend(world_player_files(world_path))
+    return files
+
+
+def expand_targets(targets):
+    """
+    Expand paths and glob patterns into a de-duplicated list of player files,
+    keeping the order in which they were given.
+    """
+    files = []
+    seen = set()
+
+    for target in targets:
+        target = os.path.expanduser(target)
+        if glob.has_magic(target):
+            matches = sorted(glob.glob(target, recursive=True))
+        else:
+            matches = [target]
+
+        for match in matches:
+            for filepath in find_player_files(match):
+                key = os.path.abspath(filepath)
+                if key not in seen:
+                    seen.add(key)
+                    files.append(filepath)
+
+    return files
@@ -0,0 +1,131 @@
+"""
+Player Index - Players of a multiplayer world, listed without parsing
+
+A server world keeps one <uuid>.dat per player (thousands on a busy
+server). The index lists them with os.scandir and only keeps what the
+directory entry already knows: uuid, path, mtime and size. A player's NBT
+is parsed only when that player is opened.
+
+Usage
+
+index = PlayerIndex(world_path)
+index.refresh()
+players = index.page(0, Config.PLAYER_PAGE_SIZE)   # most recently played first
+entry = index.get(players[0]["uuid"])
+"""
+import os
+import json
+import logging
+import threading
+
+from core.player_files import PLAYER_DIRS
+
+logger = logging.getLogger(__name__)
+
+
+class PlayerIndex:
+    def __init__(self, world_path):
+        """
+        Args:
+            world_path: World directory with playerdata/ or players/data/
+        """
+        self.world_path = world_path
+        self.players = []  # entry dicts, most recently played first
+        self._by_uuid = {}
+        self._stamp = None  # mtimes of the player directories at last scan
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.players)
+
+    def _player_dirs(self):
+        return [os.path.join(self.world_path, d) for d in PLAYER_DIRS]
+
+    def _dir_stamp(self):
+        """mtime_ns of every player directory (None when missing)"""
+        stamp = []
+        for directory in self._player_dirs():
+            try:
+                stamp.append(os.stat(directory).st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _load_names(self):
+        """
+        uuid -> player name from the server's usercache.json, which lives
+        next to the world folder. Empty when there is none.
+        """
+        usercache = os.path.join(os.path.dirname(self.world_path), "usercache.json")
+        try:
+            with open(usercache, "r", encoding="utf-8") as f:
+                return {entry["uuid"]: entry["name"] for entry in json.load(f)}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def refresh(self):
+        """
+        Re-list the player files if a player directory changed.
+        Adding or removing a file changes its directory's mtime, so an
+        unchanged world costs one stat per directory.
+
+        Returns:
+            bool: True if the list was rebuilt
+        """
+        with self._lock:
+            stamp = self._dir_stamp()
+            if stamp == self._stamp:
+                return False
+
+            names = self._load_names()
+            by_uuid = {}
+            for directory in self._player_dirs():
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if not entry.name.endswith(".dat") or not entry.is_file():
+                                continue
+                            uuid = entry.name[:-len(".dat")]
+                            stat = entry.stat()
+                            # With both layouts present, the newer file wins
+                            known = by_uuid.get(uuid)
+                            if known and known["mtime_ns"] >= stat.st_mtime_ns:
+                                continue
+                            by_uuid[uuid] = {
+                                "uuid": uuid,
+                                "name": names.get(uuid),
+                                "path": entry.path,
+                                "mtime_ns": stat.st_mtime_ns,
+                                "size": stat.st_size,
+                            }
+                except OSError:
+                    continue
+
+            self._by_uuid = by_uuid
+            self.players = sorted(
+                by_uuid.values(),
+                key=lambda p: (-p["mtime_ns"], p["uuid"])
+            )
+            self._stamp = stamp
+            logger.debug("Indexed %d player(s) in %s", len(self.players), self.world_path)
+            return True
+
+    def page_count(self, page_size):
+        """Number of pages (at least 1, so an empty world shows page 1/1)"""
+        return max(1, -(-len(self.players) // page_size))
+
+    def page(self, page, page_size):
+        """
+        Args:
+            page: Zero based page number
+            page_size: Players per page
+
+        Returns:
+            list of player entry dicts
+        """
+        start = page * page_size
+        return self.players[start:start + page_size]
+
+    def get(self, uuid):
+        """Player entry for a uuid, or None"""
+        return self._by_uuid.get(uuid)
@@ -0,0 +1,225 @@
+"""
+Player Session - Several edits to one player, saved with a single write
+
+Every WorldManager operation (save attributes, force fill, ...) loads,
+backs up and writes the player file on its own. A PlayerSession loads the
+player data once, applies any number of edits to it in memory and then
+either commits them with one backup and one write, or rolls them back.
+
+Usage
+
+with world_manager.session(world_path) as session:
+    session.set_attributes({"XpLevel": 30})
+    session.fill()
+    session.equip()
+    session.set_slot(20, "minecraft:diamond", 64)
+# committed here; an exception inside the block rolls everything back
+
+session.changes   # ["XpLevel", "fill: 12 slot(s)", "equip", "slot 20"]
+"""
+import logging
+
+from utils import profiler
+
+from core.mc_player import read_player_attributes, apply_player_attributes
+from core.mc_forcefill import process_player_data, FILLED_KEYS
+from core.mc_items import max_stack_size
+
+logger = logging.getLogger(__name__)
+
+# Slot numbers of a player's Inventory list: hotbar and main inventory,
+# armor (feet to head) and offhand
+INVENTORY_SLOTS = frozenset(list(range(36)) + [100, 101, 102, 103, -106])
+
+
+class PlayerSession:
+    def __init__(self, world_info, cache):
+        """
+        Args:
+            world_info: WorldInfo whose player_data_path is the file to edit
+            cache: NBTFileCache the player file is loaded through. Edits are
+                   made on the cached tree; a rollback drops it from the cache.
+        """
+        if not world_info.player_data_path:
+            raise Exception("Cannot find player data file")
+
+        self.world_info = world_info
+        self.cache = cache
+        self.player_data = world_info.get_player_data(cache)
+
+        if not self.player_data:
+            raise Exception("Failed to load player data")
+
+        self.changed_keys = set()  # player compound keys to re-encode
+        self.changes = []  # what was edited, for the user
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.closed:
+            return
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def _check_open(self):
+        if self.closed:
+            raise RuntimeError("Session already committed or rolled back")
+
+    @staticmethod
+    def _check_slot(slot):
+        if slot not in INVENTORY_SLOTS:
+            raise ValueError(f"Invalid inventory slot {slot} (0-35, 100-103 or -106)")
+
+    def set_attributes(self, attributes_data):
+        """
+        Set XpLevel and minecraft:* attributes; unchanged values are ignored
+
+        Args:
+            attributes_data: {name: value}; attributes not listed keep
+                             their current value
+
+        Returns:
+            list: Names of the attributes that changed
+        """
+        self._check_open()
+        # The attributes list is rewritten as a whole, so start from the
+        # current values
+        values = read_player_attributes(self.player_data)
+        values.update(attributes_data)
+        changed_fields, changed_keys = apply_player_attributes(self.player_data, values)
+        self.changed_keys |= changed_keys
+        self.changes.extend(changed_fields)
+        return changed_fields
+
+    def fill(self):
+        """
+        Fill every inventory and ender chest stack to its maximum size
+
+        Returns:
+            int: Number of slots changed
+        """
+        self._check_open()
+        modified_count = process_player_data(self.player_data)
+        if modified_count:
+            self.changed_keys |= FILLED_KEYS
+            self.changes.append(f"fill: {modified_count} slot(s)")
+        return modified_count
+
+    def equip(self):
+        """
+        Put the best equipment in the hotbar and armor slots
+
+        Returns:
+            bool: True if the inventory changed
+        """
+        self._check_open()
+        # Imported here: the equipment module imports nbtlib eagerly
+        from core.mc_best_equipment import setup_best_equipment
+
+        inventory_before = self.player_data.get('Inventory')
+        setup_best_equipment(self.player_data)
+        if inventory_before is not None and self.player_data['Inventory'] == inventory_before:
+            return False
+
+        self.changed_keys.add('Inventory')
+        self.changes.append("equip")
+        return True
+
+    def set_slot(self, slot, item_id, count=1):
+        """
+        Put an item stack in an inventory slot, replacing what was there
+
+        Args:
+            slot: Inventory slot number
+            item_id: Item id, with or without "minecraft:"
+            count: Stack size, from 1 to the item's maximum stack size
+
+        Returns:
+            bool: False if the slot already held exactly this stack
+
+        Raises:
+            ValueError: If the slot or the count is not valid for the item
+        """
+        self._check_open()
+        from nbtlib.tag import Compound, List, String, Byte
+
+        if ':' not in item_id:
+            item_id = f"minecraft:{item_id}"
+        self._check_slot(slot)
+        max_count = max_stack_size(item_id)
+        if not 1 <= count <= max_count:
+            raise ValueError(f"Cannot put {count} x {item_id} in a slot (1 to {max_count})")
+        item = Compound({
+            'id': String(item_id),
+            'count': Byte(count),
+            'Slot': Byte(slot),
+        })
+
+        inventory = self.player_data.get('Inventory', [])
+        if any(i == item for i in inventory):
+            return False
+
+        inventory = [i for i in inventory if int(i.get('Slot', -1)) != slot]
+        inventory.append(item)
+        self.player_data['Inventory'] = List[Compound](inventory)
+        self.changed_keys.add('Inventory')
+        self.changes.append(f"slot {slot}")
+        return True
+
+    def clear_slot(self, slot):
+        """
+        Empty an inventory slot
+
+        Returns:
+            bool: True if the slot held an item
+
+        Raises:
+            ValueError: If the slot is not an inventory slot
+        """
+        self._check_open()
+        self._check_slot(slot)
+        from nbtlib.tag import Compound, List
+
+        inventory = self.player_data.get('Inventory', [])
+        kept = [i for i in inventory if int(i.get('Slot', -1)) != slot]
+        if len(kept) == len(inventory):
+            return False
+
+        self.player_data['Inventory'] = List[Compound](kept)
+        self.changed_keys.add('Inventory')
+        self.changes.append(f"slot {slot} cleared")
+        return True
+
+    @profiler.profiled("session.commit")
+    def commit(self):
+        """
+        Write every edit with one backup and one write (nothing is written
+        when no edit changed anything)
+
+        Returns:
+            list: The changes that were saved
+        """
+        self._check_open()
+        self.closed = True
+
+        if not self.changed_keys:
+            logger.info("No changes, %s not written", self.world_info.player_data_path)
+            return []
+
+        if not self.world_info.save_player_data(self.player_data, self.cache, self.changed_keys):
+            raise Exception("Failed to save player data")
+
+        logger.debug("Saved %s: %s", self.world_info.player_data_path, ", ".join(self.changes))
+        return self.changes
+
+    def rollback(self):
+        """Forget every edit; the player file is read again on next use"""
+        if self.closed:
+            return
+        self.closed = True
+        self.cache.invalidate(self.world_info.player_data_path)
+        logger.info("Rolled back %d change(s) to %s", len(self.changes), self.world_info.player_data_path)
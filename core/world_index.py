@@ -0,0 +1,127 @@
+"""
+World Index - Persistent cache of world scan results
+
+Stores the outcome of WorldInfo.detect_player_data_location() for every
+world in a saves directory, keyed by the world path plus the mtime and size
+of its level.dat. A rescan only needs to re-parse worlds whose level.dat
+actually changed.
+
+The index is a JSON-lines file (one world per line) stored next to the
+worlds, inside the saves directory.
+"""
+import os
+import json
+import logging
+
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+
+class WorldIndex:
+    """JSON-lines cache of detected player data locations"""
+
+    VERSION = 2
+
+    def __init__(self, saves_path):
+        self.index_path = os.path.join(saves_path, Config.WORLD_INDEX_FILENAME)
+        self.entries = {}  # {world_path: entry dict}
+        self._seen = set()
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """Read the index file, ignoring missing files and broken lines"""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get("version") == self.VERSION and "path" in entry:
+                        self.entries[entry["path"]] = entry
+        except OSError:
+            pass
+
+    @staticmethod
+    def stat_level_dat(world_path):
+        """
+        Return the (mtime_ns, size) key of a world's level.dat
+
+        Returns:
+            tuple or None if level.dat does not exist
+        """
+        try:
+            st = os.stat(os.path.join(world_path, "level.dat"))
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def lookup(self, world_info, stamp):
+        """
+        Fill world_info from the index if its level.dat is unchanged
+
+        Args:
+            world_info: WorldInfo to populate
+            stamp: (mtime_ns, size) of the world's level.dat
+
+        Returns:
+            bool: True if the cached entry was used
+        """
+        self._seen.add(world_info.path)
+        entry = self.entries.get(world_info.path)
+        if stamp is None or entry is None:
+            return False
+        if (entry["mtime_ns"], entry["size"]) != stamp:
+            return False
+
+        world_info.is_singleplayer = entry["is_singleplayer"]
+        world_info.player_data_path = entry["player_data_path"]
+        world_info._player_uuid = entry["player_uuid"]
+        return True
+
+    def store(self, world_info, stamp):
+        """Record a freshly detected world"""
+        self._seen.add(world_info.path)
+        if stamp is None:
+            return
+
+        player_uuid = world_info._player_uuid
+        if player_uuid is not None:
+            player_uuid = [int(i) for i in player_uuid]
+
+        self.entries[world_info.path] = {
+            "version": self.VERSION,
+            "path": world_info.path,
+            "mtime_ns": stamp[0],
+            "size": stamp[1],
+            "is_singleplayer": world_info.is_singleplayer,
+            "player_data_path": world_info.player_data_path,
+            "player_uuid": player_uuid,
+        }
+        self._dirty = True
+
+    def save(self):
+        """
+        Write the index back to disk, dropping worlds that were not seen
+        during this scan. The file is replaced atomically.
+        """
+        for path in list(self.entries):
+            if path not in self._seen:
+                del self.entries[path]
+                self._dirty = True
+
+        if not self._dirty:
+            return
+
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in self.entries.values():
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+        except OSError as e:
+            # The index is only a cache, never fail a scan because of it
+            logger.warning("Could not write world index: %s", e)
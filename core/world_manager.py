@@ -3,11 +3,23 @@ World Manager - Business logic for managing Minecraft worlds
 Handles both legacy (pre-breaking change) and new player data formats
 """
 import os
+import logging
 from pathlib import Path
+from config.settings import Config
+from utils import profiler
 from utils.NBTFile import NBTFile
-from core.mc_player import read_player_inventory, read_player_attributes, write_player_attributes
-from core.mc_forcefill import forcefill_file
+from utils.NBTStream import NBTStream
+from utils.NBTFileCache import NBTFileCache
+from utils.BackupStore import BackupStore
+from core.mc_player import read_player_inventory, read_player_attributes
+from core.mc_forcefill import forcefill_batch
+from core.player_session import PlayerSession
 from core.mc_datapacks import MC_DATAPACKS
+from core.world_index import WorldIndex
+from core.player_index import PlayerIndex
+from core.item_search import ItemSearchIndex
+
+logger = logging.getLogger(__name__)
 
 
 class WorldInfo:
@@ -18,13 +30,16 @@ class WorldInfo:
         name: World directory name
         path: Full path to the world directory
         is_singleplayer: True if single-player, False if multiplayer
-        player_data_path: Path to the player's .dat file
+        player_data_path: Path to the player's .dat file (for multiplayer,
+                          the selected player's file)
+        player_index: PlayerIndex of a multiplayer world, built on first use
     """
     def __init__(self, name, path):
         self.name = name
         self.path = path
         self.is_singleplayer = None
         self.player_data_path = None
+        self.player_index = None
         self._player_uuid = None
     
     def detect_player_data_location(self):
@@ -41,12 +56,14 @@ class WorldInfo:
             return False
         
         try:
-            nbt = NBTFile(level_dat_path)
-            level_data = nbt.openfile()
-            data = level_data.get("Data", {})
-            print(data)
+            # Only the two fields below are needed: stream them instead of
+            # materialising the whole level.dat (and its Player compound)
+            level_data = NBTStream(level_dat_path).fetch(
+                ["Data.singleplayer_uuid"],
+                probe=["Data.Player"]
+            )
             # Check for new format: singleplayer_uuid field
-            player_uuid = data.get("singleplayer_uuid")
+            player_uuid = level_data.get("Data.singleplayer_uuid")
             
             if player_uuid is not None:
                 # New format: player data in separate file
@@ -60,22 +77,31 @@ class WorldInfo:
                 )
             else:
                 # Check if Player data exists in level.dat (old format)
-                if "Player" in data:
+                if "Data.Player" in level_data:
                     self.is_singleplayer = True
                     self.player_data_path = level_dat_path
                 else:
-                    # Multiplayer world or no player data
+                    # Multiplayer world or no player data: players are
+                    # listed by get_player_index() and picked one at a time
                     self.is_singleplayer = False
-                    # For multiplayer, we'd need to know which player to load
-                    # This would require additional UI for player selection
                     self.player_data_path = None
 
             return True
             
         except Exception as e:
-            print(f"Error detecting player data location: {e}")
+            logger.warning("Error detecting player data location for %s: %s", self.path, e)
             return False
     
+    def get_player_index(self):
+        """
+        PlayerIndex of this world's player files, refreshed if a player
+        directory changed since the last call
+        """
+        if self.player_index is None:
+            self.player_index = PlayerIndex(self.path)
+        self.player_index.refresh()
+        return self.player_index
+    
     @staticmethod
     def _format_uuid(uuid_ints):
         """
@@ -98,10 +124,13 @@ class WorldInfo:
         
         return uuid_str
     
-    def get_player_data(self):
+    def get_player_data(self, cache=None):
         """
         Load and return the player data NBT
         
+        Args:
+            cache: Optional NBTFileCache to reuse an already parsed file
+        
         Returns:
             dict: Player data from NBT file, or None if unavailable
         """
@@ -109,27 +138,29 @@ class WorldInfo:
             return None
         
         try:
-            nbt = NBTFile(self.player_data_path)
-            player_data = nbt.openfile()
-            
-            # If player data is in level.dat, extract the Player section
-            if self.player_data_path.endswith("level.dat"):
-                data = player_data.get("Data", {})
-                return data.get("Player", {})
+            if cache is not None:
+                nbt = cache.get(self.player_data_path)
             else:
-                # Player data is in its own file
-                return player_data
+                nbt = NBTFile(self.player_data_path)
+                nbt.openfile()
+            
+            # NBTFile already points player_data at the Player section
+            # when the player lives inside level.dat
+            return nbt.player_data
                 
         except Exception as e:
-            print(f"Error loading player data: {e}")
+            logger.error("Error loading player data: %s", e)
             return None
     
-    def save_player_data(self, player_data):
+    def save_player_data(self, player_data, cache=None, changed=None):
         """
         Save player data back to the appropriate file
         
         Args:
             player_data: Player data dictionary to save
+            cache: Optional NBTFileCache holding the parsed file
+            changed: Keys of player_data that were modified; the rest of
+                     the file is copied as loaded (None rewrites everything)
             
         Returns:
             bool: True if save successful, False otherwise
@@ -138,57 +169,129 @@ class WorldInfo:
             return False
         
         try:
-            nbt = NBTFile(self.player_data_path)
-            
-            # If player data is in level.dat, we need to update the Player section
-            if self.player_data_path.endswith("level.dat"):
-                full_data = nbt.openfile()
-                if "Data" not in full_data:
-                    full_data["Data"] = {}
-                full_data["Data"]["Player"] = player_data
-                nbt.savefile(full_data)
+            if cache is not None:
+                nbt = cache.get(self.player_data_path)
             else:
-                # Player data is in its own file, save directly
+                nbt = NBTFile(self.player_data_path)
                 nbt.openfile()
-                nbt.savefile(player_data)
             
+            # NBTFile puts the data back into Data.Player for level.dat
+            nbt.savefile(player_data, changed=changed)
+            
+            if cache is not None:
+                cache.refresh(self.player_data_path)
             return True
             
         except Exception as e:
-            print(f"Error saving player data: {e}")
+            logger.error("Error saving player data: %s", e)
+            if cache is not None:
+                # The cached tree may hold edits that never reached disk
+                cache.invalidate(self.player_data_path)
             return False
 
 
+def _detect_world(name, path):
+    """
+    Build a WorldInfo and detect its player data location.
+    Module-level so it can be shipped to a process pool.
+    """
+    world_info = WorldInfo(name, path)
+    world_info.detect_player_data_location()
+    return world_info
+
+
 class WorldManager:
     """Manages Minecraft world data and operations"""
     
     def __init__(self):
         self.worlds = {}  # {world_name: WorldInfo}
         self.current_world_name = None
+        # Parsed player files shared by load/save/fill
+        self.nbt_cache = NBTFileCache(Config.NBT_CACHE_SIZE)
+        # Item search index of the last searched saves directory
+        self.item_index = None
     
-    def scan_worlds(self, minecraft_path):
+    @profiler.profiled("world.scan_worlds")
+    def scan_worlds(self, minecraft_path, workers=None, executor=None, use_index=True):
         """
         Scan for Minecraft worlds in the given path
         
         Args:
             minecraft_path: Path to Minecraft saves directory
+            workers: Number of parallel workers (default: Config.SCAN_WORKERS).
+                     Use 1 to scan sequentially.
+            executor: "thread" or "process" (default: Config.SCAN_EXECUTOR)
+            use_index: Reuse results from the on-disk world index for worlds
+                       whose level.dat did not change
             
         Returns:
             Dictionary of world names to paths (for backward compatibility)
         """
+        if workers is None:
+            workers = Config.SCAN_WORKERS
+        if executor is None:
+            executor = Config.SCAN_EXECUTOR
+        # Checked up front: a sequential scan never looks at it
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown scan executor: {executor}")
+        
         path = os.path.expanduser(minecraft_path)
         
         if not os.path.exists(path):
             return {}
         
         self.worlds.clear()
+        # A rescan is also when edited datapacks get catalogued again
+        MC_DATAPACKS.refresh()
+        
+        index = WorldIndex(path) if use_index else None
+        scanned = {}  # {world_name: WorldInfo}
+        stamps = {}  # {world_name: level.dat (mtime_ns, size)}
+        pending = []  # [(world_name, world_path)] that must be parsed
         
         for directory in sorted(os.listdir(path)):
             full_path = os.path.join(path, directory)
-            if os.path.isdir(full_path):
+            if not os.path.isdir(full_path):
+                continue
+            
+            if index is not None:
                 world_info = WorldInfo(directory, full_path)
-                world_info.detect_player_data_location()
-                self.worlds[directory] = world_info
+                stamps[directory] = WorldIndex.stat_level_dat(full_path)
+                if index.lookup(world_info, stamps[directory]):
+                    scanned[directory] = world_info
+                    continue
+            
+            scanned[directory] = None
+            pending.append((directory, full_path))
+        
+        names = [name for name, _ in pending]
+        paths = [full_path for _, full_path in pending]
+        
+        if workers <= 1 or len(pending) <= 1:
+            results = list(map(_detect_world, names, paths))
+        else:
+            # Imported here: the process pool module is slow to import
+            # and only the scan needs it
+            if executor == "process":
+                from concurrent.futures import ProcessPoolExecutor as pool_class
+            else:
+                from concurrent.futures import ThreadPoolExecutor as pool_class
+            
+            # Executor.map yields results in submission order, so the
+            # world map keeps the same sorted order as a sequential scan
+            with pool_class(max_workers=workers) as pool:
+                results = list(pool.map(_detect_world, names, paths))
+        
+        for world_info in results:
+            scanned[world_info.name] = world_info
+            # Only cache worlds whose detection succeeded
+            if index is not None and world_info.is_singleplayer is not None:
+                index.store(world_info, stamps[world_info.name])
+        
+        if index is not None:
+            index.save()
+        
+        self.worlds.update(scanned)
         
         # Return simple dict for backward compatibility
         world = {name: info.path for name, info in self.worlds.items()}
@@ -222,6 +325,7 @@ class WorldManager:
         world_info = self.get_current_world_info()
         return world_info.path if world_info else None
     
+    @profiler.profiled("world.load_world_data")
     def load_world_data(self, world_path):
         """
         Load all data for a world
@@ -247,29 +351,31 @@ class WorldManager:
             raise Exception(f"World not found: {world_path}")
         
         # Ensure player data location is detected
-        if world_info.player_data_path is None:
+        if world_info.player_data_path is None and world_info.is_singleplayer is not False:
             world_info.detect_player_data_location()
         
         if world_info.player_data_path is None:
+            if world_info.is_singleplayer is False:
+                raise Exception("This is a multiplayer world. Please select a player first.")
             raise Exception("Could not find player data for this world")
         
-        if not world_info.is_singleplayer:
-            raise Exception("Multiplayer worlds are not yet supported. Please select a single-player world.")
-        
         # Load player data
-        player_data = world_info.get_player_data()
+        player_data = world_info.get_player_data(self.nbt_cache)
         
         if not player_data:
             raise Exception("Failed to load player data")
         
         # Load inventory
-        inventory = read_player_inventory(player_data)
+        with profiler.span("player.read_inventory"):
+            inventory = read_player_inventory(player_data)
         
         # Load attributes
-        attributes = read_player_attributes(player_data)
+        with profiler.span("player.read_attributes"):
+            attributes = read_player_attributes(player_data)
         
         # Load datapacks status
-        datapacks = MC_DATAPACKS.checkStatus(world_path)
+        with profiler.span("datapacks.check_status"):
+            datapacks = MC_DATAPACKS.checkStatus(world_path)
         
         return {
             'inventory': inventory,
@@ -277,83 +383,256 @@ class WorldManager:
             'datapacks': datapacks
         }
     
-    def force_fill_inventory(self, world_path):
+    @profiler.profiled("world.list_players")
+    def list_players(self, world_path, page=0, page_size=None):
         """
-        Force fill the player's inventory
+        List one page of the players of a multiplayer world.
+        Only the directory is read; no player file is parsed.
+        
+        Args:
+            world_path: Path to the world directory
+            page: Zero based page number (clamped to the last page)
+            page_size: Players per page (default: Config.PLAYER_PAGE_SIZE)
+            
+        Returns:
+            dict with 'players' (entry dicts), 'page', 'pages' and 'total'
+        """
+        world_info = self._get_world_info_by_path(world_path)
+        
+        if not world_info:
+            raise Exception(f"World not found: {world_path}")
+        
+        page_size = page_size or Config.PLAYER_PAGE_SIZE
+        index = world_info.get_player_index()
+        pages = index.page_count(page_size)
+        page = min(max(0, page), pages - 1)
+        
+        return {
+            'players': index.page(page, page_size),
+            'page': page,
+            'pages': pages,
+            'total': len(index)
+        }
+    
+    def select_player(self, world_path, uuid):
+        """
+        Pick the player of a multiplayer world that load, save and fill
+        operate on
+        
+        Args:
+            world_path: Path to the world directory
+            uuid: Player uuid from list_players()
+        """
+        world_info = self._get_world_info_by_path(world_path)
+        
+        if not world_info:
+            raise Exception(f"World not found: {world_path}")
+        
+        entry = world_info.get_player_index().get(uuid)
+        
+        if entry is None:
+            raise Exception(f"Player not found: {uuid}")
+        
+        world_info.player_data_path = entry['path']
+    
+    @profiler.profiled("world.load_player_data")
+    def load_player_data(self, world_path, uuid):
+        """
+        Select a player of a multiplayer world and load its data
+        
+        Returns:
+            Same dictionary as load_world_data()
+        """
+        self.select_player(world_path, uuid)
+        return self.load_world_data(world_path)
+    
+    def session(self, world_path):
+        """
+        Open the player file of a world for several edits at once
         
         Args:
             world_path: Path to the world directory
+            
+        Returns:
+            PlayerSession: Commits with one backup and one write when used
+                           as a context manager (rolls back on error)
         """
         world_info = self._get_world_info_by_path(world_path)
         
         if not world_info or not world_info.player_data_path:
             raise Exception("Cannot find player data file")
         
-        # Force fill uses the player data file directly
-        forcefill_file(world_info.player_data_path)
+        return PlayerSession(world_info, self.nbt_cache)
+    
+    @profiler.profiled("world.force_fill_inventory")
+    def force_fill_inventory(self, world_path):
+        """
+        Force fill the player's inventory
+        
+        Args:
+            world_path: Path to the world directory
+            
+        Returns:
+            int: Number of slots changed (0 means nothing was written)
+        """
+        with self.session(world_path) as session:
+            return session.fill()
     
+    @profiler.profiled("world.force_fill_batch")
+    def force_fill_batch(self, targets, workers=None):
+        """
+        Force fill every player file found in many worlds at once
+        
+        Args:
+            targets: Player files, world directories, saves directories
+                     or glob patterns
+            workers: Number of processes (default: one per CPU core)
+            
+        Returns:
+            tuple: (list of per-file result dicts, summary dict)
+        """
+        # Cached player files are re-parsed on next use because their
+        # mtime changes
+        return forcefill_batch(targets, workers)
+    
+    @profiler.profiled("world.save_attributes")
     def save_attributes(self, world_path, attributes_data):
         """
         Save player attributes to the world
         
+        Values are compared with the ones currently in the player data;
+        when none differ nothing is written (no backup, no disk I/O).
+        
         Args:
             world_path: Path to the world directory
             attributes_data: Dictionary of attribute names to values
+            
+        Returns:
+            list: Names of the attributes that changed (empty if the
+                  save was skipped)
+        """
+        # The player data is normally still cached from load_world_data
+        with self.session(world_path) as session:
+            return session.set_attributes(attributes_data)
+    
+    @profiler.profiled("world.search_items")
+    def search_items(self, minecraft_path, query, min_count=0, workers=None):
+        """
+        Find which worlds and players hold an item
+        
+        The item index is brought up to date first: only player files
+        changed since the last search are read again.
+        
+        Args:
+            minecraft_path: Path to Minecraft saves directory
+            query: Item id (with or without "minecraft:") or part of one
+            min_count: Only players holding at least this many in total
+            workers: Number of processes used to index changed files
+            
+        Returns:
+            list of hit dicts, see ItemSearchIndex.search()
+        """
+        path = os.path.expanduser(minecraft_path)
+        if self.item_index is None or self.item_index.saves_path != path:
+            self.item_index = ItemSearchIndex(path)
+        
+        self.item_index.update(workers)
+        return self.item_index.search(query, min_count)
+    
+    def list_backups(self, world_path):
+        """
+        List the stored backup revisions of the world's player data file
+        
+        Args:
+            world_path: Path to the world directory
+            
+        Returns:
+            list of revision dicts, newest first
         """
         world_info = self._get_world_info_by_path(world_path)
         
         if not world_info or not world_info.player_data_path:
             raise Exception("Cannot find player data file")
         
-        # Load current player data
-        player_data = world_info.get_player_data()
+        return BackupStore.default().revisions(world_info.player_data_path)
+    
+    @profiler.profiled("world.restore_backup")
+    def restore_backup(self, world_path, revision):
+        """
+        Restore a backup revision of the world's player data file
         
-        if not player_data:
-            raise Exception("Failed to load player data")
+        Args:
+            world_path: Path to the world directory
+            revision: Revision number from list_backups()
+        """
+        world_info = self._get_world_info_by_path(world_path)
         
-        # Separate minecraft attributes from other attributes
-        minecraft_attributes = {
-            k: v for k, v in attributes_data.items()
-            if k.startswith("minecraft:")
-        }
+        if not world_info or not world_info.player_data_path:
+            raise Exception("Cannot find player data file")
         
-        # Write XpLevel if present
-        if "XpLevel" in attributes_data:
-            write_player_attributes(
-                player_data,
-                "XpLevel",
-                int(attributes_data["XpLevel"])
-            )
+        BackupStore.default().restore(world_info.player_data_path, revision)
+        self.nbt_cache.invalidate(world_info.player_data_path)
+    
+    @profiler.profiled("world.get_datapacks_status")
+    def get_datapacks_status(self, world_path):
+        """
+        Get the install status of every datapack for the world
         
-        # Write minecraft attributes
-        if minecraft_attributes:
-            write_player_attributes(
-                player_data,
-                "attributes",
-                minecraft_attributes
-            )
+        Args:
+            world_path: Path to the world directory
+        """
+        return MC_DATAPACKS.checkStatus(world_path)
+    
+    @profiler.profiled("world.datapack_fleet_status")
+    def datapack_fleet_status(self, world_paths=None, verify=True):
+        """
+        Datapack status of many worlds at once (world x datapack matrix)
         
-        # Save the modified player data
-        if not world_info.save_player_data(player_data):
-            raise Exception("Failed to save player data")
+        Args:
+            world_paths: Worlds to check (default: every scanned world)
+            verify: Also compare installed packs with the catalogue
+            
+        Returns:
+            dict: See MC_DATAPACKS.fleetStatus
+        """
+        if world_paths is None:
+            world_paths = [info.path for info in self.worlds.values()]
+        return MC_DATAPACKS.fleetStatus(world_paths, verify)
     
+    @profiler.profiled("world.add_datapack")
     def add_datapack(self, world_path, datapack_index):
         """
         Add a datapack to the world
         
         Args:
             world_path: Path to the world directory
-            datapack_index: Index of the datapack to add
+            datapack_index: Index or name of the datapack to add
         """
         MC_DATAPACKS.add(world_path, datapack_index)
     
+    @profiler.profiled("world.sync_datapack")
+    def sync_datapack(self, world_path, datapack_index):
+        """
+        Update an installed datapack from the datapacks folder, placing
+        only the files that changed
+        
+        Args:
+            world_path: Path to the world directory
+            datapack_index: Index or name of the datapack to sync
+            
+        Returns:
+            dict: {"added", "updated", "removed", "unchanged"} file counts
+        """
+        return MC_DATAPACKS.sync(world_path, datapack_index)
+    
+    @profiler.profiled("world.remove_datapack")
     def remove_datapack(self, world_path, datapack_index):
         """
         Remove a datapack from the world
         
         Args:
             world_path: Path to the world directory
-            datapack_index: Index of the datapack to remove
+            datapack_index: Index or name of the datapack to remove
         """
         MC_DATAPACKS.delete(world_path, datapack_index)
     
@@ -1,16 +1,30 @@
 """
 Minecraft Swiss Knife - Main Entry Point
+
+Usage:
+    python main.py
+    python main.py --profile --trace trace.json   # timings in the status bar
 """
+import argparse
 import tkinter as tk
 from ui.main_window import MainWindow
+from utils.log import setup_logging
+from utils import profiler
 
 
 def main():
     """Initialize and run the application"""
+    parser = argparse.ArgumentParser(description="Minecraft Swiss Knife")
+    profiler.add_profile_arguments(parser)
+    args = parser.parse_args()
+    
+    setup_logging()
+    profiler.setup_profiling(args)
     root = tk.Tk()
     app = MainWindow(root)
     root.mainloop()
+    profiler.finish_profiling(args)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,52 +1,108 @@
 """
 Content Area Component - Main tabbed interface
 """
+import importlib
 import tkinter as tk
 from tkinter import ttk
 from config.settings import Config
-from ui.tabs.inventory_tab import InventoryTab
-from ui.tabs.attributes_tab import AttributesTab
-from ui.tabs.datapacks_tab import DatapacksTab
 
 
 class ContentArea:
-    """Main content area with tabbed interface"""
-    
-    def __init__(self, parent, on_fill, on_save_attributes, on_datapack_toggle):
+    """
+    Main content area with tabbed interface
+
+    Tabs are built the first time they are shown, so the window paints
+    with empty pages. Data sent to a tab that is not built yet is kept and
+    handed over when it is.
+    """
+
+    # (name, module, class, title) in notebook order
+    TABS = [
+        ("inventory", "ui.tabs.inventory_tab", "InventoryTab", Config.TAB_INVENTORY),
+        ("attributes", "ui.tabs.attributes_tab", "AttributesTab", Config.TAB_ATTRIBUTES),
+        ("datapacks", "ui.tabs.datapacks_tab", "DatapacksTab", Config.TAB_DATAPACKS),
+        ("search", "ui.tabs.search_tab", "SearchTab", Config.TAB_SEARCH),
+    ]
+
+    def __init__(self, parent, on_fill, on_save_attributes, on_datapack_toggle, on_search,
+                 on_datapack_matrix=None):
+        # Arguments of each tab's constructor after its page
+        self.callbacks = {
+            "inventory": (on_fill,),
+            "attributes": (on_save_attributes,),
+            "datapacks": (on_datapack_toggle, on_datapack_matrix),
+            "search": (on_search,),
+        }
+        self.tabs = {}
+        self.pending_data = {}
+
         # Create content frame
         self.frame = tk.Frame(parent)
         self.frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
-        
+
         # Setup styles
         self._setup_styles()
-        
+
         # Create notebook (tabbed interface)
         self.notebook = ttk.Notebook(self.frame)
         self.notebook.pack(fill=tk.BOTH, expand=True)
-        
-        # Create tabs
-        self.inventory_tab = InventoryTab(self.notebook, on_fill)
-        self.attributes_tab = AttributesTab(self.notebook, on_save_attributes)
-        self.datapacks_tab = DatapacksTab(self.notebook, on_datapack_toggle)
-        
-        # Add tabs to notebook
-        self.notebook.add(self.inventory_tab.frame, text=Config.TAB_INVENTORY)
-        self.notebook.add(self.attributes_tab.frame, text=Config.TAB_ATTRIBUTES)
-        self.notebook.add(self.datapacks_tab.frame, text=Config.TAB_DATAPACKS)
-    
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+        # Add an empty page per tab; the tab itself is built on first view
+        self.pages = {}
+        for name, _, _, title in self.TABS:
+            page = tk.Frame(self.notebook, bg=Config.COLOR_BG_WHITE)
+            self.notebook.add(page, text=title)
+            self.pages[name] = page
+
     def _setup_styles(self):
         """Configure notebook styles"""
         style = ttk.Style()
         style.configure("TNotebook", padding=2)
-    
+
+    def _on_tab_changed(self, event):
+        """Build the selected tab if this is its first view"""
+        index = self.notebook.index(self.notebook.select())
+        self._get_tab(self.TABS[index][0])
+
+    def _get_tab(self, name):
+        """Return a tab, importing and building it on first use"""
+        tab = self.tabs.get(name)
+        if tab is None:
+            _, module_name, class_name, _ = next(t for t in self.TABS if t[0] == name)
+            tab_class = getattr(importlib.import_module(module_name), class_name)
+
+            tab = tab_class(self.pages[name], *self.callbacks[name])
+            tab.frame.pack(fill=tk.BOTH, expand=True)
+            self.tabs[name] = tab
+
+            if name in self.pending_data:
+                tab.update_data(*self.pending_data.pop(name))
+        return tab
+
+    def _update_tab(self, name, *data):
+        """Send data to a built tab, or keep it until the tab is built"""
+        if name in self.tabs:
+            self.tabs[name].update_data(*data)
+        else:
+            self.pending_data[name] = data
+
     def update_inventory(self, inventory_data):
         """Update inventory tab with new data"""
-        self.inventory_tab.update_data(inventory_data)
-    
+        self._update_tab("inventory", inventory_data)
+
     def update_attributes(self, attributes_data):
         """Update attributes tab with new data"""
-        self.attributes_tab.update_data(attributes_data)
-    
+        self._update_tab("attributes", attributes_data)
+
     def update_datapacks(self, world_path, datapacks_status):
         """Update datapacks tab with new data"""
-        self.datapacks_tab.update_data(world_path, datapacks_status)
+        self._update_tab("datapacks", world_path, datapacks_status)
+    
+    def update_datapack_matrix(self, fleet_status):
+        """Show the datapack status of every world in the datapacks tab"""
+        self._get_tab("datapacks").update_matrix(fleet_status)
+    
+    def update_search(self, results):
+        """Update search tab with new results"""
+        self._update_tab("search", results)
@@ -6,10 +6,15 @@ from config.settings import Config
 
 
 class Sidebar:
-    """Sidebar with list of available Minecraft worlds"""
+    """
+    Sidebar with list of available Minecraft worlds, and a paged player
+    picker shown for multiplayer worlds
+    """
     
-    def __init__(self, parent, on_select_callback):
+    def __init__(self, parent, on_select_callback, on_player_select=None, on_player_page=None):
         self.on_select = on_select_callback
+        self.on_player_select = on_player_select
+        self.on_player_page = on_player_page
         
         # Create sidebar frame
         self.frame = tk.Frame(
@@ -43,6 +48,45 @@ class Sidebar:
         
         # Store world data
         self.worlds = {}
+        
+        # Player picker (packed by show_players)
+        self.player_uuids = []
+        self.player_page = 0
+        self._create_player_picker()
+    
+    def _create_player_picker(self):
+        """Create the paged player list used by multiplayer worlds"""
+        self.player_frame = tk.Frame(self.frame)
+        
+        self.player_title = tk.Label(
+            self.player_frame,
+            text="Players",
+            font=Config.FONT_HEADING
+        )
+        self.player_title.pack(pady=5)
+        
+        self.player_listbox = tk.Listbox(
+            self.player_frame,
+            font=Config.FONT_SMALL,
+            borderwidth=0,
+            height=12,
+            exportselection=False
+        )
+        self.player_listbox.pack(fill=tk.X, padx=2)
+        self.player_listbox.bind('<<ListboxSelect>>', self._on_player_change)
+        
+        # Page navigation
+        nav_frame = tk.Frame(self.player_frame)
+        nav_frame.pack(fill=tk.X, pady=2)
+        
+        self.prev_btn = tk.Button(nav_frame, text="◀", width=3, command=self._on_prev_page)
+        self.prev_btn.pack(side=tk.LEFT, padx=2)
+        
+        self.next_btn = tk.Button(nav_frame, text="▶", width=3, command=self._on_next_page)
+        self.next_btn.pack(side=tk.RIGHT, padx=2)
+        
+        self.page_label = tk.Label(nav_frame, font=Config.FONT_SMALL)
+        self.page_label.pack(expand=True)
     
     def update_world_list(self, worlds_dict):
         """Update the list of worlds"""
@@ -65,3 +109,47 @@ class Sidebar:
         if selection:
             return self.world_listbox.get(selection[0])
         return None
+    
+    def show_players(self, listing):
+        """
+        Show one page of players
+        
+        Args:
+            listing: dict from WorldManager.list_players()
+        """
+        self.player_page = listing['page']
+        self.player_uuids = [player['uuid'] for player in listing['players']]
+        
+        self.player_listbox.delete(0, tk.END)
+        for player in listing['players']:
+            self.player_listbox.insert(tk.END, player['name'] or player['uuid'])
+        
+        self.player_title.config(text=f"Players ({listing['total']})")
+        self.page_label.config(text=f"Page {listing['page'] + 1}/{listing['pages']}")
+        self.prev_btn.config(state=tk.NORMAL if listing['page'] > 0 else tk.DISABLED)
+        self.next_btn.config(
+            state=tk.NORMAL if listing['page'] < listing['pages'] - 1 else tk.DISABLED
+        )
+        
+        if not self.player_frame.winfo_manager():
+            self.player_frame.pack(side=tk.BOTTOM, fill=tk.X, before=self.world_listbox)
+    
+    def hide_players(self):
+        """Hide the player picker (single-player world selected)"""
+        self.player_frame.pack_forget()
+        self.player_listbox.delete(0, tk.END)
+        self.player_uuids = []
+    
+    def _on_player_change(self, event):
+        """Handle player selection"""
+        selection = self.player_listbox.curselection()
+        if selection and self.on_player_select:
+            self.on_player_select(self.player_uuids[selection[0]])
+    
+    def _on_prev_page(self):
+        if self.on_player_page:
+            self.on_player_page(self.player_page - 1)
+    
+    def _on_next_page(self):
+        if self.on_player_page:
+            self.on_player_page(self.player_page + 1)
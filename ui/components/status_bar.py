@@ -0,0 +1,52 @@
+"""
+Status Bar Component - Busy indicator and last message
+"""
+import tkinter as tk
+from config.settings import Config
+
+
+class StatusBar:
+    """Bottom status bar showing what the application is doing"""
+    
+    def __init__(self, parent):
+        # Create frame
+        self.frame = tk.Frame(parent, relief=tk.SUNKEN, borderwidth=1)
+        self.frame.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Status text; message is shown again when no job is running
+        self.message = "Ready"
+        self.status_var = tk.StringVar(value=self.message)
+        tk.Label(
+            self.frame,
+            textvariable=self.status_var,
+            font=Config.FONT_SMALL,
+            anchor="w"
+        ).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        
+        # Timing of the last operation, only shown when profiling
+        self.profile_var = tk.StringVar()
+        self.profile_label = None
+    
+    def set_status(self, text):
+        """Show a message in the status bar; it stays after jobs finish"""
+        self.message = text
+        self.status_var.set(text)
+    
+    def set_profile(self, text):
+        """Show the profiler readout at the right of the status bar"""
+        if self.profile_label is None:
+            self.profile_label = tk.Label(
+                self.frame,
+                textvariable=self.profile_var,
+                font=Config.FONT_SMALL,
+                anchor="e"
+            )
+            self.profile_label.pack(side=tk.RIGHT, padx=5)
+        self.profile_var.set(text)
+    
+    def set_busy(self, busy, description=""):
+        """Show the busy state of background jobs"""
+        if busy:
+            self.status_var.set(f"⏳ {description}..." if description else "⏳ Working...")
+        else:
+            self.status_var.set(self.message)
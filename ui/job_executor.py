@@ -0,0 +1,121 @@
+"""
+Job Executor - Run blocking work off the Tk main thread
+
+Jobs run on a small thread pool. Their results are handed back to the Tk
+thread by a `root.after` pump, so success/error callbacks can touch widgets
+safely.
+
+Jobs submitted on the same channel supersede each other: when a newer job
+is submitted, an older one is cancelled if it has not started yet, and its
+result is discarded if it has.
+"""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from config.settings import Config
+
+
+class JobExecutor:
+    """Thread pool plus a root.after result pump"""
+
+    def __init__(self, root, on_busy_change=None, max_workers=None):
+        """
+        Args:
+            root: Tk root, used to schedule the result pump
+            on_busy_change: Called on the Tk thread as (busy, description)
+                            whenever the busy state or description changes
+            max_workers: Worker threads (default: Config.UI_JOB_WORKERS)
+        """
+        self.root = root
+        self.on_busy_change = on_busy_change
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or Config.UI_JOB_WORKERS,
+            thread_name_prefix="mc-job"
+        )
+        self._results = queue.Queue()
+        self._generations = {}  # {channel: latest generation number}
+        self._futures = {}  # {channel: latest future}
+        self._running = []  # descriptions of unfinished jobs
+        self._pumping = False
+
+    def submit(self, fn, *args, on_success=None, on_error=None,
+               channel=None, description=""):
+        """
+        Run fn(*args) on a worker thread.
+
+        Args:
+            fn: Blocking callable to run
+            on_success: Called on the Tk thread with fn's return value
+            on_error: Called on the Tk thread with the raised exception
+            channel: Optional name; a newer job on the same channel makes
+                     this one stale
+            description: Text shown while the job is running
+        """
+        generation = None
+        if channel is not None:
+            generation = self._generations.get(channel, 0) + 1
+            self._generations[channel] = generation
+            previous = self._futures.get(channel)
+            if previous is not None:
+                previous.cancel()
+
+        future = self._pool.submit(fn, *args)
+        if channel is not None:
+            self._futures[channel] = future
+
+        self._running.append(description)
+        self._notify_busy()
+
+        job = (channel, generation, description, on_success, on_error)
+        future.add_done_callback(lambda f: self._results.put((job, f)))
+
+        if not self._pumping:
+            self._pumping = True
+            self.root.after(Config.UI_POLL_MS, self._pump)
+
+        return future
+
+    def is_busy(self):
+        return bool(self._running)
+
+    def _notify_busy(self):
+        if self.on_busy_change:
+            # Jobs run in submission order, the oldest one is the active one
+            description = self._running[0] if self._running else ""
+            self.on_busy_change(bool(self._running), description)
+
+    def _pump(self):
+        """Deliver finished jobs to their callbacks on the Tk thread"""
+        while True:
+            try:
+                job, future = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            channel, generation, description, on_success, on_error = job
+            self._running.remove(description)
+            self._notify_busy()
+
+            if future.cancelled():
+                continue
+            if channel is not None and generation != self._generations.get(channel):
+                # A newer job on this channel was submitted meanwhile
+                continue
+
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+            elif on_success:
+                on_success(future.result())
+
+        if self._running:
+            self.root.after(Config.UI_POLL_MS, self._pump)
+        else:
+            self._pumping = False
+
+    def shutdown(self):
+        """Cancel queued jobs and stop accepting new ones"""
+        for future in self._futures.values():
+            future.cancel()
+        self._pool.shutdown(wait=False)
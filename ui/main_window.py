@@ -10,7 +10,10 @@ from config.settings import Config
 from ui.components.top_panel import TopPanel
 from ui.components.sidebar import Sidebar
 from ui.components.content_area import ContentArea
+from ui.components.status_bar import StatusBar
+from ui.job_executor import JobExecutor
 from core.world_manager import WorldManager
+from utils import profiler
 
 
 class MainWindow:
@@ -24,37 +27,74 @@ class MainWindow:
         # Initialize world manager
         self.world_manager = WorldManager()
         
+        # World whose data is currently shown in the tabs
+        self.displayed_world_path = None
+        # Multiplayer world whose players are listed in the sidebar
+        self.players_world_path = None
+        
         # Create UI components
         self._create_ui()
         
-        # Initial world scan
-        self.refresh_worlds()
+        # Background jobs for all world I/O
+        self.jobs = JobExecutor(self.root, on_busy_change=self._on_busy_change)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Initial world scan, once the window has painted
+        self.root.after_idle(self.refresh_worlds)
     
     def _create_ui(self):
         """Create all UI components"""
         # Top configuration panel
         self.top_panel = TopPanel(self.root, self.on_refresh_worlds)
         
+        # Status bar (packed before the main container so it stays visible)
+        self.status_bar = StatusBar(self.root)
+        
         # Main container
         main_container = tk.Frame(self.root)
         main_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         # Sidebar with world list
-        self.sidebar = Sidebar(main_container, self.on_world_select)
+        self.sidebar = Sidebar(
+            main_container,
+            self.on_world_select,
+            on_player_select=self.on_player_select,
+            on_player_page=self.on_player_page
+        )
         
         # Content area with tabs
         self.content_area = ContentArea(
             main_container,
             on_fill=self.on_fill,
             on_save_attributes=self.on_save_attributes,
-            on_datapack_toggle=self.on_datapack_toggle
+            on_datapack_toggle=self.on_datapack_toggle,
+            on_search=self.on_search,
+            on_datapack_matrix=self.on_datapack_matrix
         )
     
+    def _on_busy_change(self, busy, description):
+        """Reflect background job state in the status bar and cursor"""
+        self.status_bar.set_busy(busy, description)
+        self.root.config(cursor="watch" if busy else "")
+        if not busy and profiler.is_enabled():
+            # After idle: the job's result callbacks (tab updates) run first
+            self.root.after_idle(self._show_profile)
+    
+    def _show_profile(self):
+        """Show how long the last operation took in the status bar"""
+        self.status_bar.set_profile(profiler.last_readout())
+    
     def refresh_worlds(self):
         """Scan for Minecraft worlds"""
         path = self.top_panel.get_path()
-        worlds = self.world_manager.scan_worlds(path)
-        self.sidebar.update_world_list(worlds)
+        self.jobs.submit(
+            self.world_manager.scan_worlds,
+            path,
+            on_success=self.sidebar.update_world_list,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to scan worlds: {e}"),
+            channel="scan",
+            description="Scanning worlds"
+        )
     
     def on_refresh_worlds(self):
         """Handler for refresh button"""
@@ -62,53 +102,178 @@ class MainWindow:
     
     def on_world_select(self, world_name):
         """Handler for world selection"""
-        world_path = self.world_manager.get_world_path(world_name)
+        world_info = self.world_manager.get_world_info(world_name)
+        if not world_info:
+            return
+        
+        if world_info.is_singleplayer is False:
+            # Multiplayer: list the players, one is loaded once picked
+            self.players_world_path = world_info.path
+            self.on_player_page(0)
+            return
+        
+        self.players_world_path = None
+        self.sidebar.hide_players()
+        self._load_world(world_info.path, f"Loading {world_name}")
+    
+    def _load_world(self, world_path, description):
+        """Load a world's data in the background and show it"""
+        # Selecting another world while this one loads makes this
+        # result stale, the executor then drops it
+        self.jobs.submit(
+            self.world_manager.load_world_data,
+            world_path,
+            on_success=lambda data: self._show_world_data(world_path, data),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to load world data: {e}"),
+            channel="world",
+            description=description
+        )
+    
+    def on_player_page(self, page):
+        """Handler for the player picker's page buttons"""
+        world_path = self.players_world_path
+        if world_path:
+            self.jobs.submit(
+                self.world_manager.list_players,
+                world_path,
+                page,
+                on_success=self.sidebar.show_players,
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to list players: {e}"),
+                channel="players",
+                description="Listing players"
+            )
+    
+    def on_player_select(self, uuid):
+        """Handler for player selection in a multiplayer world"""
+        world_path = self.players_world_path
         if world_path:
-            try:
-                # Load world data
-                world_data = self.world_manager.load_world_data(world_path)
-                # Update all tabs
-                self.content_area.update_inventory(world_data['inventory'])
-                self.content_area.update_attributes(world_data['attributes'])
-                self.content_area.update_datapacks(
-                    world_path,
-                    world_data['datapacks']
-                )
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to load world data: {e}")
+            self.jobs.submit(
+                self.world_manager.load_player_data,
+                world_path,
+                uuid,
+                on_success=lambda data: self._show_world_data(world_path, data),
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to load player data: {e}"),
+                channel="world",
+                description="Loading player"
+            )
+    
+    def _show_world_data(self, world_path, world_data):
+        """Update all tabs with freshly loaded world data"""
+        self.displayed_world_path = world_path
+        self.content_area.update_inventory(world_data['inventory'])
+        self.content_area.update_attributes(world_data['attributes'])
+        self.content_area.update_datapacks(
+            world_path,
+            world_data['datapacks']
+        )
+    
+    def _reload_displayed_world(self):
+        """Reload the world (or player) currently shown in the tabs"""
+        if self.displayed_world_path:
+            self._load_world(self.displayed_world_path, "Reloading")
     
     def on_fill(self):
         """Handler for force fill inventory"""
-        world_path = self.world_manager.get_current_world_path()
+        world_path = self.displayed_world_path
         if world_path:
-            try:
-                self.world_manager.force_fill_inventory(world_path)
-                # Refresh the current world view
-                world_name = self.world_manager.current_world_name
-                if world_name:
-                    self.on_world_select(world_name)
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to fill inventory: {e}")
+            self.jobs.submit(
+                self.world_manager.force_fill_inventory,
+                world_path,
+                on_success=self._on_filled,
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to fill inventory: {e}"),
+                description="Filling inventory"
+            )
+    
+    def _on_filled(self, modified_count):
+        """Report the fill and refresh the current world view"""
+        if modified_count:
+            self.status_bar.set_status(f"Filled {modified_count} slot(s)")
+            self._reload_displayed_world()
+        else:
+            self.status_bar.set_status("Inventory already full, nothing saved")
     
     def on_save_attributes(self, attributes_data):
         """Handler for saving player attributes"""
-        world_path = self.world_manager.get_current_world_path()
+        world_path = self.displayed_world_path
         if world_path:
-            try:
-                self.world_manager.save_attributes(world_path, attributes_data)
-                messagebox.showinfo("Success", "Attributes saved successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save attributes: {e}")
+            self.jobs.submit(
+                self.world_manager.save_attributes,
+                world_path,
+                attributes_data,
+                on_success=self._on_attributes_saved,
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to save attributes: {e}"),
+                description="Saving attributes"
+            )
+    
+    def _on_attributes_saved(self, changed_fields):
+        """Tell the user which attributes were actually written"""
+        if changed_fields:
+            messagebox.showinfo(
+                "Success",
+                "Attributes saved:\n" + "\n".join(changed_fields)
+            )
+        else:
+            messagebox.showinfo("Nothing to save", "No attribute was changed.")
     
     def on_datapack_toggle(self, datapack_index, is_installed):
         """Handler for datapack toggle"""
-        world_path = self.world_manager.get_current_world_path()
+        world_path = self.displayed_world_path
         if world_path:
-            try:
-                if is_installed:
-                    self.world_manager.remove_datapack(world_path, datapack_index)
-                else:
-                    self.world_manager.add_datapack(world_path, datapack_index)
-            except Exception as e:
-                messagebox.showerror("Datapack error", str(e))
+            if is_installed:
+                action = self.world_manager.remove_datapack
+                description = "Removing datapack"
+            else:
+                action = self.world_manager.add_datapack
+                description = "Installing datapack"
+            
+            self.jobs.submit(
+                action,
+                world_path,
+                datapack_index,
+                on_error=lambda e: self._on_datapack_error(world_path, e),
+                description=description
+            )
+    
+    def _on_datapack_error(self, world_path, error):
+        """Show the error and put the datapack checkboxes back in sync"""
+        messagebox.showerror("Datapack error", str(error))
+        self.jobs.submit(
+            self.world_manager.get_datapacks_status,
+            world_path,
+            on_success=lambda status: self._show_datapacks_status(world_path, status),
+            description="Checking datapacks"
+        )
+    
+    def _show_datapacks_status(self, world_path, status):
+        """Repaint the datapack checkboxes, unless another world is shown by now"""
+        if world_path == self.displayed_world_path:
+            self.content_area.update_datapacks(world_path, status)
+    
+    def on_datapack_matrix(self):
+        """Handler for the datapacks tab's "All worlds" view"""
+        self.jobs.submit(
+            self.world_manager.datapack_fleet_status,
+            on_success=self.content_area.update_datapack_matrix,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to check datapacks: {e}"),
+            channel="datapack_matrix",
+            description="Checking datapacks of all worlds"
+        )
+    
+    def on_search(self, query, min_count):
+        """Handler for item search"""
+        path = self.top_panel.get_path()
+        self.jobs.submit(
+            self.world_manager.search_items,
+            path,
+            query,
+            min_count,
+            on_success=self.content_area.update_search,
+            on_error=lambda e: messagebox.showerror("Error", f"Search failed: {e}"),
+            channel="search",
+            description=f"Searching {query}"
+        )
+    
+    def on_close(self):
+        """Stop background jobs and close the window"""
+        self.jobs.shutdown()
+        self.root.destroy()
@@ -4,6 +4,7 @@ Attributes Tab - Display and edit player attributes
 import tkinter as tk
 from tkinter import ttk
 from config.settings import Config
+from utils import profiler
 
 
 class AttributesTab:
@@ -73,6 +74,7 @@ class AttributesTab:
             command=self._on_save_clicked
         ).pack(pady=10, padx=10, side=tk.RIGHT)
     
+    @profiler.profiled("ui.attributes.update_data")
     def update_data(self, attributes_data):
         """Update the attributes display with new data"""
         # Clear existing entries
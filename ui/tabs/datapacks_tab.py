@@ -1,29 +1,64 @@
 """
 Datapacks Tab - Manage Minecraft datapacks
 """
+import os
 import tkinter as tk
 from tkinter import ttk
 from config.settings import Config
+from utils import profiler
+
+# How each fleet state is shown in the matrix
+MATRIX_SYMBOLS = {
+    "missing": "",
+    "installed": Config.SYMBOL_CHECKED,
+    "ok": Config.SYMBOL_CHECKED,
+    "outdated": "old format",
+    "drift": "modified",
+}
 
 
 class DatapacksTab:
     """Tab for managing Minecraft datapacks"""
     
-    def __init__(self, parent, on_toggle_callback):
+    def __init__(self, parent, on_toggle_callback, on_matrix_callback=None):
         self.on_toggle = on_toggle_callback
+        self.on_matrix = on_matrix_callback
         self.current_world_path = None
+        self.matrix_shown = False
         
         # Create main frame
         self.frame = tk.Frame(parent, bg=Config.COLOR_BG_WHITE)
         
+        # Buttons at the bottom (packed first so they stay visible)
+        if self.on_matrix:
+            self._create_buttons()
+        
         # Create treeview for datapacks
         self._create_treeview()
+        
+        # World x datapack matrix, built when first shown
+        self.matrix_tree = None
+    
+    def _create_buttons(self):
+        """Create the button switching between this world and all worlds"""
+        btn_frame = tk.Frame(self.frame, bg=Config.COLOR_BG_WHITE)
+        btn_frame.pack(fill=tk.X, side=tk.BOTTOM, pady=5)
+        
+        self.matrix_button = tk.Button(
+            btn_frame,
+            text="All worlds",
+            command=self._on_matrix_clicked
+        )
+        self.matrix_button.pack(side=tk.LEFT, padx=10)
+        
+        self.matrix_summary = tk.Label(btn_frame, bg=Config.COLOR_BG_WHITE, font=Config.FONT_SMALL)
+        self.matrix_summary.pack(side=tk.LEFT)
     
     def _create_treeview(self):
         """Create the treeview widget for datapacks"""
         self.tree = ttk.Treeview(
             self.frame,
-            columns=("installed",),
+            columns=("installed", "format", "files", "description"),
             show="tree headings",
             selectmode="none",
             height=8
@@ -32,15 +67,22 @@ class DatapacksTab:
         # Configure columns
         self.tree.heading("#0", text="Datapack")
         self.tree.heading("installed", text="Installed")
+        self.tree.heading("format", text="Format")
+        self.tree.heading("files", text="Files")
+        self.tree.heading("description", text="Description")
         
         self.tree.column("#0", width=200, anchor="w")
         self.tree.column("installed", width=80, anchor="center")
+        self.tree.column("format", width=80, anchor="center")
+        self.tree.column("files", width=60, anchor="e")
+        self.tree.column("description", width=300, anchor="w")
         
         self.tree.pack(fill="both", expand=True)
         
         # Bind click event
         self.tree.bind("<Button-1>", self._on_tree_click)
     
+    @profiler.profiled("ui.datapacks.update_data")
     def update_data(self, world_path, datapacks_status):
         """Update the datapacks display"""
         self.current_world_path = world_path
@@ -49,18 +91,75 @@ class DatapacksTab:
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        # Add datapacks
-        for idx, datapack in enumerate(datapacks_status):
+        # Add datapacks; rows are keyed by datapack name, so a toggle still
+        # targets the right pack if the catalogue changed meanwhile
+        for datapack in datapacks_status:
             checkbox = Config.SYMBOL_CHECKED if datapack["installed"] else Config.SYMBOL_UNCHECKED
+            formats = datapack.get("formats") or ["", ""]
+            pack_format = formats[0] if formats[0] == formats[1] else f"{formats[0]}-{formats[1]}"
             
             self.tree.insert(
                 "",
                 "end",
-                iid=str(idx),
+                iid=datapack["path"],
                 text=datapack["label"],
-                values=(checkbox,)
+                values=(checkbox, pack_format, datapack.get("files", ""), datapack.get("description", ""))
             )
     
+    def _on_matrix_clicked(self):
+        """Switch between the selected world and the all worlds matrix"""
+        if self.matrix_shown:
+            self.matrix_tree.pack_forget()
+            self.tree.pack(fill="both", expand=True)
+            self.matrix_button.config(text="All worlds")
+            self.matrix_summary.config(text="")
+            self.matrix_shown = False
+        else:
+            self.matrix_summary.config(text="Checking every world...")
+            self.on_matrix()
+    
+    @profiler.profiled("ui.datapacks.update_matrix")
+    def update_matrix(self, fleet_status):
+        """Show a world x datapack matrix (MC_DATAPACKS.fleetStatus result)"""
+        packs = fleet_status["packs"]
+        columns = [pack["path"] for pack in packs] + ["others"]
+        
+        if self.matrix_tree is not None:
+            self.matrix_tree.destroy()
+        self.matrix_tree = ttk.Treeview(
+            self.frame,
+            columns=columns,
+            show="tree headings",
+            selectmode="browse"
+        )
+        self.matrix_tree.heading("#0", text="World")
+        self.matrix_tree.column("#0", width=180, anchor="w")
+        for pack in packs:
+            self.matrix_tree.heading(pack["path"], text=pack["label"])
+            self.matrix_tree.column(pack["path"], width=100, anchor="center")
+        self.matrix_tree.heading("others", text="Not in catalogue")
+        self.matrix_tree.column("others", width=200, anchor="w")
+        
+        differs = 0
+        for row in fleet_status["rows"]:
+            states = [row["cells"][pack["path"]] for pack in packs]
+            differs += sum(state in ("outdated", "drift") for state in states)
+            self.matrix_tree.insert(
+                "",
+                "end",
+                text=os.path.basename(row["world"]),
+                values=[MATRIX_SYMBOLS.get(state, state) for state in states]
+                       + [row.get("error") or ", ".join(row["others"])]
+            )
+        
+        self.tree.pack_forget()
+        self.matrix_tree.pack(fill="both", expand=True)
+        self.matrix_button.config(text="This world")
+        self.matrix_summary.config(
+            text=f"{len(fleet_status['rows'])} world(s), {differs} copy(ies) differ from the catalogue"
+        )
+        self.matrix_shown = True
+    
     def _on_tree_click(self, event):
         """Handle click on treeview"""
         # Check if click is in a cell
@@ -79,12 +178,11 @@ class DatapacksTab:
             return
         
         # Get current state
-        index = int(item)
         current_state = self.tree.set(item, "installed")
         is_installed = (current_state == Config.SYMBOL_CHECKED)
         
         # Call toggle callback
-        self.on_toggle(index, is_installed)
+        self.on_toggle(item, is_installed)
         
         # Update display
         new_symbol = Config.SYMBOL_UNCHECKED if is_installed else Config.SYMBOL_CHECKED
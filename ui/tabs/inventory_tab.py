@@ -3,6 +3,7 @@ Inventory Tab - Display and manage player inventory
 """
 import tkinter as tk
 from config.settings import Config
+from utils import profiler
 
 
 class InventoryTab:
@@ -32,6 +33,7 @@ class InventoryTab:
             command=self.on_fill
         ).pack(side=tk.LEFT, padx=10)
     
+    @profiler.profiled("ui.inventory.update_data")
     def update_data(self, inventory_data):
         """Update the inventory display"""
         self.inv_listbox.delete(0, tk.END)
@@ -0,0 +1,110 @@
+"""
+Search Tab - Find which worlds and players hold an item
+"""
+import tkinter as tk
+from tkinter import ttk
+from config.settings import Config
+from utils import profiler
+
+
+class SearchTab:
+    """Tab for searching an item across every world"""
+
+    def __init__(self, parent, on_search_callback):
+        self.on_search = on_search_callback
+
+        # Create main frame
+        self.frame = tk.Frame(parent, bg=Config.COLOR_BG_WHITE)
+
+        # Search box at the top
+        self._create_search_box()
+
+        # Results table
+        self._create_treeview()
+
+    def _create_search_box(self):
+        """Create the item / minimum count inputs and the search button"""
+        box = tk.Frame(self.frame, bg=Config.COLOR_BG_WHITE)
+        box.pack(fill=tk.X, padx=10, pady=10)
+
+        tk.Label(box, text="Item:", bg=Config.COLOR_BG_WHITE).pack(side=tk.LEFT)
+        self.query_var = tk.StringVar()
+        query_entry = tk.Entry(box, textvariable=self.query_var, width=30)
+        query_entry.pack(side=tk.LEFT, padx=5)
+        query_entry.bind("<Return>", lambda event: self._on_search_clicked())
+
+        tk.Label(box, text="At least:", bg=Config.COLOR_BG_WHITE).pack(side=tk.LEFT, padx=(10, 0))
+        self.min_count_var = tk.StringVar(value="1")
+        tk.Spinbox(
+            box,
+            from_=1,
+            to=100000,
+            textvariable=self.min_count_var,
+            width=7
+        ).pack(side=tk.LEFT, padx=5)
+
+        tk.Button(
+            box,
+            text="Search",
+            command=self._on_search_clicked
+        ).pack(side=tk.LEFT, padx=10)
+
+        self.summary_label = tk.Label(box, bg=Config.COLOR_BG_WHITE, font=Config.FONT_SMALL)
+        self.summary_label.pack(side=tk.RIGHT)
+
+    def _create_treeview(self):
+        """Create the treeview widget for search results"""
+        self.tree = ttk.Treeview(
+            self.frame,
+            columns=("item", "player", "total", "slots"),
+            show="tree headings",
+            selectmode="browse"
+        )
+
+        # Configure columns
+        self.tree.heading("#0", text="World")
+        self.tree.heading("item", text="Item")
+        self.tree.heading("player", text="Player")
+        self.tree.heading("total", text="Total")
+        self.tree.heading("slots", text="Slots")
+
+        self.tree.column("#0", width=150, anchor="w")
+        self.tree.column("item", width=150, anchor="w")
+        self.tree.column("player", width=180, anchor="w")
+        self.tree.column("total", width=60, anchor="e")
+        self.tree.column("slots", width=200, anchor="w")
+
+        self.tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+    def _on_search_clicked(self):
+        """Validate the inputs and start the search"""
+        query = self.query_var.get().strip()
+        if not query:
+            return
+        try:
+            min_count = max(0, int(self.min_count_var.get()))
+        except ValueError:
+            min_count = 0
+        self.summary_label.config(text="Searching...")
+        self.on_search(query, min_count)
+
+    @profiler.profiled("ui.search.update_data")
+    def update_data(self, results):
+        """Show search results (hit dicts from WorldManager.search_items)"""
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+
+        for hit in results:
+            slots = ", ".join(
+                f"{'E' if where == 'ender_chest' else ''}{slot}:{count}"
+                for where, slot, count in hit["slots"]
+            )
+            self.tree.insert(
+                "",
+                "end",
+                text=hit["world"],
+                values=(hit["item"], hit["player"], hit["total"], slots)
+            )
+
+        players = len({hit["path"] for hit in results})
+        self.summary_label.config(text=f"{players} player(s) found")
@@ -0,0 +1,394 @@
+"""
+Docstring for utils.BackupStore
+
+Content-addressed backup store for edited save files.
+
+Every backup is stored once as a blob named after the SHA-256 of its
+content, so saving the same content twice never writes it twice. Each
+source file has its own revision log, trimmed to a configurable number of
+revisions and maximum age.
+
+Which source files refer to a blob is kept next to it as one empty marker
+file per source under refs/. When retention drops a source's last revision
+of a blob, its marker is removed, and the blob is deleted once no marker is
+left: a save never has to read the other sources' logs. collect_garbage()
+rebuilds the markers from the logs and deletes any blob no revision refers
+to (e.g. left by a crash); it is a maintenance call, saves do not need it.
+
+Several processes may use the same store (e.g. a batch fill). Adding a
+backup holds a shared lock on <root>/lock from marking the blob until the
+revision is logged; deleting blobs holds it alone, so a blob is never
+deleted while a revision referring to it is being added.
+
+Layout
+
+<root>/blobs/<2 hex>/<sha256>      file content as is (already gzipped NBT)
+<root>/blobs/<2 hex>/<sha256>.gz   gzip-compressed content of plain files
+<root>/revisions/<key>.jsonl       one line per revision of a source file
+<root>/refs/<2 hex>/<blob>/<key>   marker: source <key> has a revision of <blob>
+<root>/lock                        store-wide lock file
+
+Usage
+
+store = BackupStore("~/.mc_swissknife/backups")
+store.add("level.dat")                 # before overwriting level.dat
+for rev in store.revisions("level.dat"):
+    print(rev["revision"], rev["time"], rev["hash"])
+store.restore("level.dat", 3)
+"""
+import os
+import gzip
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from config.settings import Config
+
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_READ_SIZE = 1024 * 1024
+
+
+class BackupStore:
+    def __init__(self, root, keep_revisions=None, max_age_days=None):
+        """
+        Args:
+            root: Directory holding blobs and revision logs
+            keep_revisions: Revisions kept per file
+                            (default: Config.BACKUP_KEEP_REVISIONS)
+            max_age_days: Revisions older than this are dropped, the newest
+                          one is always kept (default: Config.BACKUP_MAX_AGE_DAYS)
+        """
+        self.root = Path(os.path.expanduser(root))
+        self.keep_revisions = keep_revisions or Config.BACKUP_KEEP_REVISIONS
+        self.max_age_days = max_age_days or Config.BACKUP_MAX_AGE_DAYS
+
+    @classmethod
+    def default(cls):
+        """Store at Config.BACKUP_STORE_PATH"""
+        return cls(Config.BACKUP_STORE_PATH)
+
+    # --- Paths -------------------------------------------------------------
+
+    @staticmethod
+    def _source_key(filepath):
+        source = os.path.abspath(filepath)
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    def _log_path(self, filepath):
+        return self.root / "revisions" / f"{self._source_key(filepath)}.jsonl"
+
+    def _blob_path(self, content_hash, compressed):
+        name = content_hash + (".gz" if compressed else "")
+        return self.root / "blobs" / content_hash[:2] / name
+
+    def _refs_path(self, blob_name):
+        return self.root / "refs" / blob_name[:2] / blob_name
+
+    # --- Locking -----------------------------------------------------------
+
+    @contextmanager
+    def _locked(self, exclusive):
+        """
+        Hold the store-wide lock: shared while adding, exclusive while
+        collecting garbage (Windows has no shared locks, both are exclusive)
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / "lock", "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                yield  # released when the file is closed
+                return
+
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    # --- Revision log ------------------------------------------------------
+
+    def revisions(self, filepath):
+        """
+        List the stored revisions of a file, newest first
+
+        Returns:
+            list of dicts with revision, hash, time, size and compressed
+        """
+        entries = []
+        try:
+            with open(self._log_path(filepath), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            return []
+        entries.sort(key=lambda e: e["revision"], reverse=True)
+        return entries
+
+    def _write_log(self, filepath, entries):
+        log_path = self._log_path(filepath)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = log_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in sorted(entries, key=lambda e: e["revision"]):
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, log_path)
+
+    # --- Backup ------------------------------------------------------------
+
+    @staticmethod
+    def _hash_file(filepath):
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            first = f.read(_READ_SIZE)
+            compressed = first[:2] != _GZIP_MAGIC
+            chunk = first
+            while chunk:
+                digest.update(chunk)
+                chunk = f.read(_READ_SIZE)
+        return digest.hexdigest(), compressed
+
+    def add(self, filepath, link=False):
+        """
+        Back up the current content of filepath.
+
+        Args:
+            filepath: File about to be overwritten
+            link: Store the blob as a hardlink to filepath instead of a
+                  copy. Only safe when filepath is replaced by rename
+                  afterwards (as NBTFile's atomic save does), never when
+                  it is rewritten in place.
+
+        Returns:
+            dict: The new (or unchanged latest) revision entry
+        """
+        filepath = Path(filepath)
+        content_hash, compressed = self._hash_file(filepath)
+        key = self._source_key(filepath)
+        self._ensure_refs()
+
+        # Shared lock: blobs are not deleted between marking the blob as
+        # used by this source and logging the revision that refers to it
+        with self._locked(exclusive=False):
+            entries = self.revisions(filepath)
+
+            if entries and entries[0]["hash"] == content_hash:
+                # Nothing changed since the last backup
+                return entries[0]
+
+            blob_path = self._blob_path(content_hash, compressed)
+            self._add_ref(blob_path.name, key)
+            if not blob_path.exists():
+                self._write_blob(filepath, blob_path, compressed, link)
+
+            entry = {
+                "revision": entries[0]["revision"] + 1 if entries else 1,
+                "hash": content_hash,
+                "time": time.time(),
+                "size": filepath.stat().st_size,
+                "compressed": compressed,
+                "source": str(filepath.resolve()),
+            }
+            entries.insert(0, entry)
+
+            kept, dropped = self._apply_retention(entries)
+            self._write_log(filepath, kept)
+
+            # Blobs this source no longer refers to
+            kept_blobs = {self._blob_path(e["hash"], e["compressed"]).name for e in kept}
+            released = {self._blob_path(e["hash"], e["compressed"]).name for e in dropped} - kept_blobs
+            for blob_name in released:
+                self._remove_ref(blob_name, key)
+
+        if released:
+            self._delete_released(released)
+
+        return entry
+
+    def _write_blob(self, filepath, blob_path, compressed, link):
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if link and not compressed:
+            try:
+                os.link(filepath, blob_path)
+                return
+            except FileExistsError:
+                return
+            except OSError:
+                pass  # No hardlinks here, copy instead
+
+        fd, tmp_path = tempfile.mkstemp(dir=blob_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out, open(filepath, "rb") as src:
+                if compressed:
+                    with gzip.GzipFile(filename="", mode="wb", fileobj=out, mtime=0) as gz:
+                        shutil.copyfileobj(src, gz, _READ_SIZE)
+                else:
+                    shutil.copyfileobj(src, out, _READ_SIZE)
+            os.replace(tmp_path, blob_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _apply_retention(self, entries):
+        """Split newest-first entries into (kept, dropped)"""
+        cutoff = time.time() - self.max_age_days * 86400
+        kept = []
+        dropped = []
+        for position, entry in enumerate(entries):
+            if position == 0 or (position < self.keep_revisions and entry["time"] >= cutoff):
+                kept.append(entry)
+            else:
+                dropped.append(entry)
+        return kept, dropped
+
+    # --- References and garbage collection -------------------------------
+
+    def _add_ref(self, blob_name, key):
+        refs_path = self._refs_path(blob_name)
+        refs_path.mkdir(parents=True, exist_ok=True)
+        (refs_path / key).touch()
+
+    def _remove_ref(self, blob_name, key):
+        try:
+            (self._refs_path(blob_name) / key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _delete_released(self, blob_names):
+        """Delete the blobs among blob_names that no source refers to anymore"""
+        with self._locked(exclusive=True):
+            for blob_name in blob_names:
+                try:
+                    self._refs_path(blob_name).rmdir()
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    continue  # Another source still has a revision of it
+                blob_path = self._blob_path(blob_name.split(".")[0], blob_name.endswith(".gz"))
+                try:
+                    blob_path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def _ensure_refs(self):
+        """Stores written before refs/ existed get their markers once"""
+        if not (self.root / "refs").exists():
+            self.collect_garbage()
+
+    def _read_references(self):
+        """{blob name: set of source keys} from every revision log"""
+        references = {}
+        for log_path in (self.root / "revisions").glob("*.jsonl"):
+            with open(log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    blob_name = self._blob_path(entry["hash"], entry["compressed"]).name
+                    references.setdefault(blob_name, set()).add(log_path.stem)
+        return references
+
+    def collect_garbage(self):
+        """
+        Rebuild the reference markers from the revision logs and delete
+        every blob no revision refers to. Reads the whole store: meant for
+        maintenance, saves delete the blobs they release on their own.
+        """
+        with self._locked(exclusive=True):
+            references = self._read_references()
+
+            refs_root = self.root / "refs"
+            new_refs = Path(tempfile.mkdtemp(prefix="refs.", dir=self.root))
+            for blob_name, keys in references.items():
+                refs_path = new_refs / blob_name[:2] / blob_name
+                refs_path.mkdir(parents=True, exist_ok=True)
+                for key in keys:
+                    (refs_path / key).touch()
+            if refs_root.exists():
+                old_refs = refs_root.with_name(new_refs.name + ".old")
+                os.replace(refs_root, old_refs)
+                os.replace(new_refs, refs_root)
+                shutil.rmtree(old_refs, ignore_errors=True)
+            else:
+                os.replace(new_refs, refs_root)
+
+            for blob_path in (self.root / "blobs").glob("*/*"):
+                if blob_path.name not in references and not blob_path.name.endswith(".tmp"):
+                    blob_path.unlink()
+
+    # --- Restore -----------------------------------------------------------
+
+    def restore(self, filepath, revision, backup_current=True):
+        """
+        Put a stored revision back in place of filepath.
+
+        Args:
+            filepath: File to restore
+            revision: Revision number, as listed by revisions()
+            backup_current: Back up the current content first, so the
+                            restore can be undone. Turn off when the current
+                            content is known to be broken (a failed save).
+
+        Raises:
+            KeyError: If the revision does not exist
+            ValueError: If the stored blob does not match its hash
+        """
+        filepath = Path(filepath)
+        entry = next((e for e in self.revisions(filepath) if e["revision"] == revision), None)
+        if entry is None:
+            raise KeyError(f"No revision {revision} for {filepath}")
+
+        blob_path = self._blob_path(entry["hash"], entry["compressed"])
+        opener = gzip.open if entry["compressed"] else open
+
+        if backup_current and filepath.exists():
+            # Replaced by rename below, so the blob may be a hardlink
+            self.add(filepath, link=True)
+
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{filepath.name}.",
+            suffix=".tmp",
+            dir=filepath.parent
+        )
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, "wb") as out, opener(blob_path, "rb") as src:
+                for chunk in iter(lambda: src.read(_READ_SIZE), b""):
+                    digest.update(chunk)
+                    out.write(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+
+            if digest.hexdigest() != entry["hash"]:
+                raise ValueError(f"Backup blob {blob_path} is corrupted")
+
+            os.replace(tmp_path, filepath)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return entry
@@ -12,28 +12,66 @@ player_data = nbt.openfile()
 # process_player_data(player_data)
 
 nbt.savefile(player_data)
+
+# or, when only a few keys of the player compound were touched, re-encode
+# just those and copy the rest of the file byte for byte:
+nbt.savefile(player_data, changed={"attributes", "XpLevel"})
 """
-import sys
+import io
+import os
+import gzip
+import logging
 import shutil
+import tempfile
 from pathlib import Path
+from utils import profiler
+from utils.BackupStore import BackupStore
+from utils.NBTSplice import NBTSplice
+
+logger = logging.getLogger(__name__)
+
+GZIP_MAGIC = b"\x1f\x8b"
+# The game writes its files with zlib's default level; level 9 is several
+# times slower for a few percent smaller files
+GZIP_LEVEL = 6
+
+
+def load_nbtlib():
+    """
+    Import nbtlib on first use.
 
-try:
-    import nbtlib
-except ImportError:
-    print("Error: nbtlib is required. Install it with: pip install nbtlib")
-    sys.exit(1)
+    nbtlib pulls in numpy, which is most of the program's start up time,
+    so it is only imported once a file is actually opened.
+    """
+    try:
+        import nbtlib
+    except ImportError:
+        raise ImportError("nbtlib is required. Install it with: pip install nbtlib") from None
+    return nbtlib
 
 
 class NBTFile:
-    def __init__(self, filepath):
+    def __init__(self, filepath, backup_store=None):
+        """
+        Args:
+            filepath: NBT file to edit
+            backup_store: BackupStore receiving a revision before every
+                          save (default: BackupStore.default())
+        """
         self.filepath = Path(filepath)
         self.nbt_file = None
         self.player_data = None
         self.is_level_dat = False
+        # Uncompressed bytes of the file as last loaded or saved, and the
+        # spans of the player compound's children in them (built lazily)
+        self._raw = None
+        self._splice = None
+        self.backup_store = backup_store or BackupStore.default()
 
         if not self.filepath.exists():
             raise FileNotFoundError(f"File '{self.filepath}' not found")
 
+    @profiler.profiled("nbt.openfile")
     def openfile(self):
         """
         Loads the NBT file and returns player data.
@@ -41,22 +79,39 @@ class NBTFile:
         - level.dat (singleplayer)
         - playerdata/<uuid>.dat (multiplayer)
         """
-        print(f"Loading {self.filepath}...")
-        self.nbt_file = nbtlib.load(self.filepath)
+        logger.debug("Loading %s...", self.filepath)
+        # Only the first file pays for the import (numpy)
+        with profiler.span("nbt.import"):
+            nbtlib = load_nbtlib()
+
+        with profiler.span("nbt.read"):
+            data = self.filepath.read_bytes()
+        profiler.count("nbt.bytes_read", len(data))
+        gzipped = data[:2] == GZIP_MAGIC
+        if gzipped:
+            with profiler.span("nbt.gunzip"):
+                data = gzip.decompress(data)
+
+        with profiler.span("nbt.parse"):
+            self.nbt_file = nbtlib.File.parse(io.BytesIO(data))
+        self.nbt_file.filename = str(self.filepath)
+        self.nbt_file.gzipped = gzipped
+        self._raw = data
+        self._splice = None
 
         # Detect file type
         if 'Data' in self.nbt_file and 'Player' in self.nbt_file['Data']:
-            print("Detected: level.dat (singleplayer world)")
+            logger.debug("Detected: level.dat (singleplayer world)")
             self.player_data = self.nbt_file['Data']['Player']
             self.is_level_dat = True
 
         elif 'Inventory' in self.nbt_file or 'EnderItems' in self.nbt_file:
-            print("Detected: player.dat (multiplayer)")
+            logger.debug("Detected: player.dat (multiplayer)")
             self.player_data = self.nbt_file
             self.is_level_dat = False
             
         elif 'Data' in self.nbt_file:
-            print("Detected: level.dat (new version)")
+            logger.debug("Detected: level.dat (new version)")
             self.player_data = self.nbt_file
             self.is_level_dat = False
 
@@ -68,32 +123,157 @@ class NBTFile:
 
         return self.player_data
 
-    def savefile(self, player_data):
+    @profiler.profiled("nbt.savefile")
+    def savefile(self, player_data, atomic=True, changed=None):
         """
         Saves updated player data back to file.
-        Automatically creates a backup before saving.
+        Automatically stores a backup revision in the backup store first.
+
+        With atomic=True (default) the data is written to a temp file in the
+        same directory, fsynced and renamed over the original, so a crash
+        mid-write never leaves a truncated file. The backup blob is a
+        hardlink to the previous version instead of a byte copy.
+
+        With atomic=False the original is copied into the backup store and
+        then rewritten in place.
+
+        Args:
+            player_data: The player compound returned by openfile()
+            atomic: See above
+            changed: Keys of player_data that were modified. When given,
+                     only those keys are encoded again and the rest of the
+                     file is copied from the loaded bytes (see NBTSplice).
+                     None re-encodes the whole file.
+
+        Returns:
+            bool: False if the data is byte for byte what the file already
+                  holds; nothing is backed up or written then
         """
         if self.nbt_file is None:
             raise RuntimeError("File not opened. Call openfile() first.")
+        nbtlib = load_nbtlib()
+
+        # Only the compound openfile() handed out has recorded spans
+        can_splice = (
+            changed is not None
+            and player_data is self.player_data
+            and self._raw is not None
+            and self.nbt_file.byteorder == 'big'
+        )
 
         # Update internal reference
         if self.is_level_dat:
             self.nbt_file['Data']['Player'] = player_data
-        else:
+        elif isinstance(player_data, nbtlib.File):
             self.nbt_file = player_data
+        else:
+            self.nbt_file = nbtlib.File(
+                player_data,
+                gzipped=getattr(self.nbt_file, 'gzipped', True),
+                byteorder=getattr(self.nbt_file, 'byteorder', 'big')
+            )
+        self.player_data = player_data
 
-        # Create backup
-        backup_path = self.filepath.with_suffix(self.filepath.suffix + '.backup')
-        print(f"Creating backup: {backup_path}")
-        shutil.copy2(self.filepath, backup_path)
+        with profiler.span("nbt.encode", spliced=can_splice):
+            data = self._encode(changed if can_splice else None)
 
+        if data == self._raw:
+            logger.debug("No changes, %s not written", self.filepath)
+            profiler.count("nbt.saves_skipped")
+            return False
+
+        # Create backup (skipped by the store if this content is already there)
+        with profiler.span("nbt.backup"):
+            revision = self.backup_store.add(self.filepath, link=atomic)
+        logger.debug("Backup revision %s stored in %s", revision['revision'], self.backup_store.root)
+
+        if atomic:
+            self._save_atomic(data)
+        else:
+            try:
+                logger.debug("Saving changes to %s...", self.filepath)
+                with open(self.filepath, 'wb') as f:
+                    self._write(f, data)
+                logger.debug("✓ Save completed successfully")
+
+            except Exception as e:
+                logger.error("Error saving file: %s", e)
+                logger.error("Restoring backup...")
+                # The half-written file is not worth a revision
+                self.backup_store.restore(self.filepath, revision['revision'], backup_current=False)
+                raise
+
+        # The file now holds these bytes; spans are recorded again on the
+        # next spliced save
+        self._raw = data
+        self._splice = None
+        return True
+
+    def _encode(self, changed):
+        """
+        Uncompressed bytes of the whole file, spliced from the loaded bytes
+        when `changed` is given
+        """
+        if changed is not None:
+            try:
+                if self._splice is None:
+                    path = ('Data', 'Player') if self.is_level_dat else ()
+                    self._splice = NBTSplice(self._raw, path)
+                return self._splice.splice(self.player_data, changed)
+            except ValueError as e:
+                logger.warning("Cannot splice %s, encoding the whole file: %s", self.filepath, e)
+
+        buf = io.BytesIO()
+        self.nbt_file.write(buf, self.nbt_file.byteorder)
+        return buf.getvalue()
+
+    @profiler.profiled("nbt.write")
+    def _write(self, f, data):
+        """Write uncompressed NBT bytes, gzipping them like the original"""
+        profiler.count("nbt.bytes_written", len(data))
+        if self.nbt_file.gzipped:
+            # Empty filename and fixed mtime keep the gzip header free of
+            # the temp name, so equal data gives equal bytes
+            with gzip.GzipFile(filename='', mode='wb', fileobj=f, mtime=0,
+                               compresslevel=GZIP_LEVEL) as gz:
+                gz.write(data)
+        else:
+            f.write(data)
+
+    def _save_atomic(self, data):
+        """Write to a temp file, fsync it and rename it over the original"""
+        logger.debug("Saving changes to %s...", self.filepath)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{self.filepath.name}.",
+            suffix=".tmp",
+            dir=self.filepath.parent
+        )
         try:
-            print(f"Saving changes to {self.filepath}...")
-            self.nbt_file.save(self.filepath)
-            print("✓ Save completed successfully")
+            with os.fdopen(fd, 'wb') as raw:
+                self._write(raw, data)
+                raw.flush()
+                os.fsync(raw.fileno())
+            shutil.copymode(self.filepath, tmp_path)
 
+            os.replace(tmp_path, self.filepath)
         except Exception as e:
-            print(f"Error saving file: {e}")
-            print("Restoring backup...")
-            shutil.copy2(backup_path, self.filepath)
+            logger.error("Error saving file: %s", e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
             raise
+
+        self._fsync_directory()
+        logger.debug("✓ Save completed successfully")
+
+    def _fsync_directory(self):
+        """Make the rename durable (not supported on every platform)"""
+        try:
+            dir_fd = os.open(self.filepath.parent, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
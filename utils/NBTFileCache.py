@@ -0,0 +1,87 @@
+"""
+Docstring for utils.NBTFileCache
+
+Size-bounded LRU cache of opened NBTFile objects.
+
+Each entry remembers the mtime and size the file had when it was parsed;
+a lookup re-parses the file only if it changed on disk since then. After
+saving through a cached NBTFile call refresh() so the entry matches the
+freshly written file instead of being re-parsed.
+
+Usage
+
+cache = NBTFileCache(max_entries=8)
+nbt = cache.get("players/data/<uuid>.dat")   # parsed once
+player_data = nbt.player_data
+
+# --- your code to update stuff ---
+
+nbt.savefile(player_data)
+cache.refresh(nbt.filepath)
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from utils import profiler
+from utils.NBTFile import NBTFile
+
+
+class NBTFileCache:
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # {path: (stamp, NBTFile)}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(filepath):
+        return os.path.abspath(filepath)
+
+    @staticmethod
+    def _stamp(path):
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, filepath):
+        """
+        Return an opened NBTFile for filepath, parsing it only when it is
+        not cached or changed on disk since it was cached.
+        """
+        key = self._key(filepath)
+        with self._lock:
+            stamp = self._stamp(key)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                profiler.count("nbt.cache_hits")
+                return entry[1]
+
+            self.misses += 1
+            profiler.count("nbt.cache_misses")
+            nbt = NBTFile(key)
+            nbt.openfile()
+            self._entries[key] = (stamp, nbt)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return nbt
+
+    def refresh(self, filepath):
+        """Mark the cached object as matching the file currently on disk"""
+        key = self._key(filepath)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (self._stamp(key), entry[1])
+
+    def invalidate(self, filepath):
+        """Drop a file from the cache, e.g. after a failed save"""
+        with self._lock:
+            self._entries.pop(self._key(filepath), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
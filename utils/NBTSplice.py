@@ -0,0 +1,160 @@
+"""
+Docstring for utils.NBTSplice
+
+Re-encode only the parts of an NBT document that changed.
+
+NBTFile keeps the uncompressed bytes it loaded. NBTSplice records where
+every child of one compound (e.g. the Player compound of a level.dat)
+starts and ends in those bytes. On save, the children that did not change
+are copied byte for byte and only the changed ones are encoded again with
+nbtlib. Everything outside that compound (the rest of level.dat) is copied
+as is. Editing a few attributes in a large level.dat then costs a few small
+encodes plus memory copies instead of re-encoding the whole tree.
+
+Usage
+
+splice = NBTSplice(raw, ("Data", "Player"))
+new_raw = splice.splice(player_data, changed={"attributes", "XpLevel"})
+
+Only big-endian (Java edition) data is supported.
+"""
+import io
+import struct
+
+from utils.NBTStream import (
+    TAG_END, TAG_STRING, TAG_BYTE_ARRAY, TAG_LIST, TAG_COMPOUND,
+    TAG_INT_ARRAY, TAG_LONG_ARRAY, _FIXED_SIZES,
+)
+
+_USHORT = struct.Struct(">H")
+_INT = struct.Struct(">i")
+
+
+def _skip_payload(raw, pos, tag_type):
+    """Offset just past the payload of a tag_type tag starting at pos"""
+    size = _FIXED_SIZES.get(tag_type)
+    if size is not None:
+        return pos + size
+    if tag_type == TAG_STRING:
+        return pos + 2 + _USHORT.unpack_from(raw, pos)[0]
+    if tag_type == TAG_BYTE_ARRAY:
+        return pos + 4 + _INT.unpack_from(raw, pos)[0]
+    if tag_type == TAG_INT_ARRAY:
+        return pos + 4 + 4 * _INT.unpack_from(raw, pos)[0]
+    if tag_type == TAG_LONG_ARRAY:
+        return pos + 4 + 8 * _INT.unpack_from(raw, pos)[0]
+    if tag_type == TAG_LIST:
+        item_type = raw[pos]
+        length = _INT.unpack_from(raw, pos + 1)[0]
+        pos += 5
+        item_size = _FIXED_SIZES.get(item_type)
+        if item_size is not None:
+            return pos + item_size * length
+        for _ in range(length):
+            pos = _skip_payload(raw, pos, item_type)
+        return pos
+    if tag_type == TAG_COMPOUND:
+        while True:
+            item_type = raw[pos]
+            pos += 1
+            if item_type == TAG_END:
+                return pos
+            pos += 2 + _USHORT.unpack_from(raw, pos)[0]
+            pos = _skip_payload(raw, pos, item_type)
+    raise ValueError(f"Unknown NBT tag type {tag_type}")
+
+
+def _read_name(raw, pos):
+    """Decode a tag name at pos; returns (name, offset after it)"""
+    length = _USHORT.unpack_from(raw, pos)[0]
+    end = pos + 2 + length
+    return bytes(raw[pos + 2:end]).decode("utf-8", errors="replace"), end
+
+
+def encode_entry(name, tag):
+    """A named tag (type, name, payload) as it appears inside a compound"""
+    buf = io.BytesIO()
+    name_bytes = name.encode("utf-8")
+    buf.write(bytes((tag.tag_id,)))
+    buf.write(_USHORT.pack(len(name_bytes)))
+    buf.write(name_bytes)
+    tag.write(buf, "big")
+    return buf.getvalue()
+
+
+class NBTSplice:
+    def __init__(self, raw, path=()):
+        """
+        Record the byte spans of the children of one compound.
+
+        Args:
+            raw: Uncompressed NBT document (bytes)
+            path: Keys leading from the root to the compound,
+                  e.g. ("Data", "Player"); () for the root itself
+
+        Raises:
+            ValueError: If the data is not an NBT compound or the path
+                        does not lead to a compound
+        """
+        self.raw = raw
+
+        if not raw or raw[0] != TAG_COMPOUND:
+            raise ValueError("Root tag is not a compound")
+        _, pos = _read_name(raw, 1)
+
+        for key in path:
+            pos = self._find_compound(pos, key)
+
+        # Payload start of the compound, and {name: (entry start, entry end)}
+        # of its children; self.end points just past its TAG_END byte
+        self.start = pos
+        self.children = {}
+        while True:
+            entry_start = pos
+            tag_type = raw[pos]
+            pos += 1
+            if tag_type == TAG_END:
+                break
+            name, pos = _read_name(raw, pos)
+            pos = _skip_payload(raw, pos, tag_type)
+            self.children[name] = (entry_start, pos)
+        self.end = pos
+
+    def _find_compound(self, pos, key):
+        """Payload offset of the compound child `key` of the compound at pos"""
+        raw = self.raw
+        while True:
+            tag_type = raw[pos]
+            pos += 1
+            if tag_type == TAG_END:
+                raise ValueError(f"Compound '{key}' not found")
+            name, pos = _read_name(raw, pos)
+            if name == key and tag_type == TAG_COMPOUND:
+                return pos
+            pos = _skip_payload(raw, pos, tag_type)
+
+    def splice(self, compound, changed):
+        """
+        Build the new document with `compound` in place of the recorded one
+
+        Args:
+            compound: Current nbtlib Compound (the one loaded from raw,
+                      possibly edited)
+            changed: Keys of compound that were modified. Keys that are new
+                     or were removed are detected automatically; every other
+                     key must still hold the value it was loaded with.
+
+        Returns:
+            bytes: The whole uncompressed document
+        """
+        view = memoryview(self.raw)
+        parts = [view[:self.start]]
+        for name, tag in compound.items():
+            span = self.children.get(name)
+            if span is not None and name not in changed:
+                parts.append(view[span[0]:span[1]])
+            else:
+                parts.append(encode_entry(name, tag))
+        parts.append(bytes((TAG_END,)))
+        parts.append(view[self.end:])
+        return b"".join(parts)
@@ -0,0 +1,348 @@
+"""
+Docstring for utils.NBTStream
+
+Streaming, read-only NBT reader that only decodes the tags you ask for.
+
+NBTFile loads the whole tree into nbtlib objects. When you only need a
+couple of fields (e.g. level.dat's Data.singleplayer_uuid) that is wasteful:
+the embedded Player compound alone can be most of the file. NBTStream walks
+the (gzipped) byte stream tag by tag, skips every subtree that is not on a
+requested path by its encoded length, and stops reading as soon as all
+requested values have been found.
+
+Usage
+
+stream = NBTStream("level.dat")
+values = stream.fetch(["Data.singleplayer_uuid"], probe=["Data.Player"])
+
+values.get("Data.singleplayer_uuid")   # list of 4 ints, or missing
+values.get("Data.Player")              # True if the compound exists
+
+Values are returned as plain Python objects (int, float, str, bytes, list,
+dict), never as nbtlib tags.
+"""
+import gzip
+import struct
+from pathlib import Path
+
+
+TAG_END = 0
+TAG_BYTE = 1
+TAG_SHORT = 2
+TAG_INT = 3
+TAG_LONG = 4
+TAG_FLOAT = 5
+TAG_DOUBLE = 6
+TAG_BYTE_ARRAY = 7
+TAG_STRING = 8
+TAG_LIST = 9
+TAG_COMPOUND = 10
+TAG_INT_ARRAY = 11
+TAG_LONG_ARRAY = 12
+
+# Payload size of fixed-width tags
+_FIXED_SIZES = {
+    TAG_BYTE: 1,
+    TAG_SHORT: 2,
+    TAG_INT: 4,
+    TAG_LONG: 8,
+    TAG_FLOAT: 4,
+    TAG_DOUBLE: 8,
+}
+
+_NUMERIC_FORMATS = {
+    TAG_BYTE: ">b",
+    TAG_SHORT: ">h",
+    TAG_INT: ">i",
+    TAG_LONG: ">q",
+    TAG_FLOAT: ">f",
+    TAG_DOUBLE: ">d",
+}
+
+_USHORT = struct.Struct(">H")
+_INT = struct.Struct(">i")
+
+# Size of the blocks read from the (decompressed) stream
+_CHUNK_SIZE = 64 * 1024
+
+
+class _Done(Exception):
+    """Raised internally once every requested path has been found"""
+
+
+class _PathNode:
+    """Node of the requested-path trie"""
+
+    __slots__ = ("children", "mode", "path")
+
+    def __init__(self):
+        self.children = {}
+        self.mode = None  # None, "fetch" or "probe"
+        self.path = None
+
+
+class NBTStream:
+    def __init__(self, filepath=None, fileobj=None):
+        """
+        Args:
+            filepath: NBT file on disk, gzipped or not
+            fileobj: Already opened binary file object with uncompressed
+                     NBT data (used instead of filepath)
+        """
+        if filepath is None and fileobj is None:
+            raise ValueError("Either filepath or fileobj is required")
+
+        self.filepath = Path(filepath) if filepath is not None else None
+        self.fileobj = fileobj
+
+        if self.filepath is not None and not self.filepath.exists():
+            raise FileNotFoundError(f"File '{self.filepath}' not found")
+
+    def _open(self):
+        """Open the underlying file, transparently un-gzipping it"""
+        f = open(self.filepath, "rb")
+        magic_number = f.read(2)
+        f.seek(0)
+        if magic_number == b"\x1f\x8b":
+            return gzip.GzipFile(fileobj=f)
+        return f
+
+    def fetch(self, paths, probe=()):
+        """
+        Read only the requested paths from the NBT stream.
+
+        Args:
+            paths: Dotted paths whose values must be decoded,
+                   e.g. "Data.singleplayer_uuid"
+            probe: Dotted paths that only need an existence check.
+                   Their payload is skipped, never decoded.
+
+        Returns:
+            dict: {path: value} for fetched paths that exist and
+                  {path: True} for probed paths that exist.
+                  Missing paths are not in the result.
+        """
+        root = _PathNode()
+        for mode, requested in (("probe", probe), ("fetch", paths)):
+            for dotted in requested:
+                node = root
+                for key in dotted.split("."):
+                    node = node.children.setdefault(key, _PathNode())
+                # "fetch" wins when a path is both fetched and probed
+                node.mode = mode
+                node.path = dotted
+
+        self._remaining = len(set(paths) | set(probe))
+        self._result = {}
+
+        if self._remaining == 0:
+            return {}
+
+        self._buf = b""
+        self._pos = 0
+
+        if self.fileobj is not None:
+            self._f = self.fileobj
+            self._walk_root(root)
+        else:
+            with self._open() as f:
+                self._f = f
+                self._walk_root(root)
+        self._f = None
+        self._buf = b""
+
+        return self._result
+
+    def _walk_root(self, root):
+        """Read the root compound header and walk its children"""
+        tag_type = self._read_byte()
+        if tag_type != TAG_COMPOUND:
+            raise ValueError(f"Root tag is not a compound (type {tag_type})")
+        self._skip_string()
+
+        try:
+            self._walk_compound(root)
+        except _Done:
+            pass
+
+    # --- Low level readers -------------------------------------------------
+    #
+    # The stream is consumed in _CHUNK_SIZE blocks kept in self._buf, so tag
+    # headers are parsed by slicing bytes instead of one read() per field.
+
+    def _fill(self, size):
+        """Make sure at least `size` unread bytes are buffered"""
+        available = len(self._buf) - self._pos
+        chunks = [self._buf[self._pos:]]
+        while available < size:
+            chunk = self._f.read(max(_CHUNK_SIZE, size - available))
+            if not chunk:
+                raise EOFError("Unexpected end of NBT data")
+            chunks.append(chunk)
+            available += len(chunk)
+        self._buf = b"".join(chunks)
+        self._pos = 0
+
+    def _read(self, size):
+        pos = self._pos
+        if pos + size > len(self._buf):
+            self._fill(size)
+            pos = 0
+        self._pos = pos + size
+        return self._buf[pos:pos + size]
+
+    def _read_byte(self):
+        pos = self._pos
+        if pos >= len(self._buf):
+            self._fill(1)
+            pos = 0
+        self._pos = pos + 1
+        return self._buf[pos]
+
+    def _discard(self, size):
+        available = len(self._buf) - self._pos
+        if size <= available:
+            self._pos += size
+            return
+
+        # Drop the buffer and stream past the rest in chunks, so skipping
+        # a large subtree never holds it in memory
+        size -= available
+        self._buf = b""
+        self._pos = 0
+        while size > 0:
+            chunk = self._f.read(min(size, _CHUNK_SIZE))
+            if not chunk:
+                raise EOFError("Unexpected end of NBT data")
+            size -= len(chunk)
+
+    def _read_ushort(self):
+        return _USHORT.unpack(self._read(2))[0]
+
+    def _read_int(self):
+        return _INT.unpack(self._read(4))[0]
+
+    def _read_string(self):
+        length = self._read_ushort()
+        return self._read(length).decode("utf-8", errors="replace")
+
+    def _skip_string(self):
+        self._discard(self._read_ushort())
+
+    # --- Tree walking ------------------------------------------------------
+
+    def _record(self, node, value):
+        self._result[node.path] = value
+        self._remaining -= 1
+
+    def _check_done(self):
+        if self._remaining == 0:
+            raise _Done()
+
+    def _walk_compound(self, node):
+        """Walk a compound payload, descending only into requested keys"""
+        while True:
+            tag_type = self._read_byte()
+            if tag_type == TAG_END:
+                return
+
+            name = self._read_string()
+            child = node.children.get(name)
+
+            if child is None:
+                self._skip_payload(tag_type)
+            elif child.mode == "fetch":
+                value = self._read_payload(tag_type)
+                self._record(child, value)
+                self._resolve_subpaths(child, value)
+                self._check_done()
+            elif child.children and tag_type == TAG_COMPOUND:
+                if child.mode == "probe":
+                    self._record(child, True)
+                self._walk_compound(child)
+            else:
+                self._skip_payload(tag_type)
+                if child.mode == "probe":
+                    self._record(child, True)
+                    self._check_done()
+
+    def _resolve_subpaths(self, node, value):
+        """Record requested paths below a node that was fully decoded"""
+        for key, child in node.children.items():
+            if not isinstance(value, dict) or key not in value:
+                continue
+            sub_value = value[key]
+            if child.mode == "fetch":
+                self._record(child, sub_value)
+            elif child.mode == "probe":
+                self._record(child, True)
+            self._resolve_subpaths(child, sub_value)
+
+    def _skip_payload(self, tag_type):
+        """Skip a tag payload without building any Python objects"""
+        size = _FIXED_SIZES.get(tag_type)
+        if size is not None:
+            self._discard(size)
+        elif tag_type == TAG_STRING:
+            self._skip_string()
+        elif tag_type == TAG_BYTE_ARRAY:
+            self._discard(self._read_int())
+        elif tag_type == TAG_INT_ARRAY:
+            self._discard(4 * self._read_int())
+        elif tag_type == TAG_LONG_ARRAY:
+            self._discard(8 * self._read_int())
+        elif tag_type == TAG_LIST:
+            item_type = self._read_byte()
+            length = self._read_int()
+            item_size = _FIXED_SIZES.get(item_type)
+            if item_size is not None:
+                self._discard(item_size * length)
+            else:
+                for _ in range(length):
+                    self._skip_payload(item_type)
+        elif tag_type == TAG_COMPOUND:
+            fixed_sizes = _FIXED_SIZES
+            while True:
+                item_type = self._read_byte()
+                if item_type == TAG_END:
+                    break
+                # Skip the name and, for fixed-width tags, the payload
+                # in a single step
+                name_length = self._read_ushort()
+                size = fixed_sizes.get(item_type)
+                if size is not None:
+                    self._discard(name_length + size)
+                else:
+                    self._discard(name_length)
+                    self._skip_payload(item_type)
+        else:
+            raise ValueError(f"Unknown NBT tag type {tag_type}")
+
+    def _read_payload(self, tag_type):
+        """Decode a tag payload into plain Python objects"""
+        fmt = _NUMERIC_FORMATS.get(tag_type)
+        if fmt is not None:
+            return struct.unpack(fmt, self._read(_FIXED_SIZES[tag_type]))[0]
+        if tag_type == TAG_STRING:
+            return self._read_string()
+        if tag_type == TAG_BYTE_ARRAY:
+            return self._read(self._read_int())
+        if tag_type == TAG_INT_ARRAY:
+            length = self._read_int()
+            return list(struct.unpack(f">{length}i", self._read(4 * length)))
+        if tag_type == TAG_LONG_ARRAY:
+            length = self._read_int()
+            return list(struct.unpack(f">{length}q", self._read(8 * length)))
+        if tag_type == TAG_LIST:
+            item_type = self._read_byte()
+            length = self._read_int()
+            return [self._read_payload(item_type) for _ in range(length)]
+        if tag_type == TAG_COMPOUND:
+            compound = {}
+            while True:
+                item_type = self._read_byte()
+                if item_type == TAG_END:
+                    return compound
+                name = self._read_string()
+                compound[name] = self._read_payload(item_type)
+        raise ValueError(f"Unknown NBT tag type {tag_type}")
@@ -0,0 +1,190 @@
+"""
+Docstring for utils.RegionFile
+
+Read-only access to Anvil region files (region/r.<x>.<z>.mca).
+
+A region file holds up to 32x32 chunks. It starts with a 4 KiB location
+table (one big-endian entry per chunk: 3 bytes sector offset, 1 byte sector
+count) and a 4 KiB timestamp table, followed by the chunks in 4 KiB
+sectors. Each chunk is a 4 byte length, a 1 byte compression type and the
+compressed NBT.
+
+RegionFile mmaps the file, so opening it costs nothing whatever its size,
+and only the sectors of the chunks you ask for are read and decompressed.
+Chunk NBT is parsed with NBTStream, so only the requested paths are
+decoded (e.g. block entities, never the block sections).
+
+Usage
+
+with RegionFile("world/region/r.0.0.mca") as region:
+    for chunk_x, chunk_z in region.chunks():
+        values = region.fetch(chunk_x, chunk_z, ["block_entities"])
+"""
+import io
+import os
+import re
+import gzip
+import mmap
+import zlib
+import struct
+from pathlib import Path
+
+from utils.NBTStream import NBTStream
+
+
+SECTOR_SIZE = 4096
+CHUNKS_PER_REGION = 32 * 32
+
+COMPRESSION_GZIP = 1
+COMPRESSION_ZLIB = 2
+COMPRESSION_NONE = 3
+COMPRESSION_LZ4 = 4
+# Set on the compression type when the chunk is stored in a c.<x>.<z>.mcc
+# file next to the region (chunks over 1 MiB)
+COMPRESSION_EXTERNAL = 128
+
+_LOCATIONS = struct.Struct(f">{CHUNKS_PER_REGION}I")
+_CHUNK_HEADER = struct.Struct(">iB")
+
+_REGION_NAME = re.compile(r"^r\.(-?\d+)\.(-?\d+)\.mca$")
+
+
+class RegionFile:
+    def __init__(self, filepath):
+        """
+        Args:
+            filepath: Region file (r.<x>.<z>.mca)
+        """
+        self.filepath = Path(filepath)
+
+        if not self.filepath.exists():
+            raise FileNotFoundError(f"File '{self.filepath}' not found")
+
+        match = _REGION_NAME.match(self.filepath.name)
+        # Region coordinates are only needed to find external chunk files
+        self.region_x = int(match.group(1)) if match else None
+        self.region_z = int(match.group(2)) if match else None
+
+        self._file = None
+        self._mmap = None
+        self._locations = None
+
+    def open(self):
+        """Map the file and read its location table"""
+        if self._mmap is not None:
+            return self
+
+        self._file = open(self.filepath, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < 2 * SECTOR_SIZE:
+            # Empty or truncated region: no chunks (an empty file cannot be mapped)
+            self._locations = (0,) * CHUNKS_PER_REGION
+            return self
+
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._locations = _LOCATIONS.unpack_from(self._mmap, 0)
+        return self
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._locations = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def chunks(self):
+        """
+        Local (x, z) coordinates (0-31) of every chunk present in the region,
+        in file order so the mapped pages are read front to back
+        """
+        if self._locations is None:
+            raise RuntimeError("Region not opened. Use open() or a with block.")
+
+        present = [
+            (location >> 8, index)
+            for index, location in enumerate(self._locations)
+            if location
+        ]
+        present.sort()
+        return [(index % 32, index // 32) for _, index in present]
+
+    def read_chunk(self, chunk_x, chunk_z):
+        """
+        Decompress one chunk
+
+        Args:
+            chunk_x, chunk_z: Local chunk coordinates inside the region (0-31)
+
+        Returns:
+            bytes: Uncompressed chunk NBT, or None if the chunk does not exist
+        """
+        if self._locations is None:
+            raise RuntimeError("Region not opened. Use open() or a with block.")
+
+        location = self._locations[(chunk_x & 31) + (chunk_z & 31) * 32]
+        if not location:
+            return None
+
+        start = (location >> 8) * SECTOR_SIZE
+        if self._mmap is None or start + _CHUNK_HEADER.size > len(self._mmap):
+            raise ValueError(f"Chunk ({chunk_x}, {chunk_z}) points outside {self.filepath}")
+
+        length, compression = _CHUNK_HEADER.unpack_from(self._mmap, start)
+        data_start = start + _CHUNK_HEADER.size
+        # length counts the compression byte
+        data = self._mmap[data_start:data_start + length - 1]
+
+        if compression & COMPRESSION_EXTERNAL:
+            compression &= ~COMPRESSION_EXTERNAL
+            data = self._read_external(chunk_x, chunk_z)
+
+        if compression == COMPRESSION_ZLIB:
+            return zlib.decompress(data)
+        if compression == COMPRESSION_GZIP:
+            return gzip.decompress(data)
+        if compression == COMPRESSION_NONE:
+            return bytes(data)
+        if compression == COMPRESSION_LZ4:
+            raise ValueError("LZ4 compressed chunks are not supported")
+        raise ValueError(f"Unknown chunk compression type {compression}")
+
+    def _read_external(self, chunk_x, chunk_z):
+        """Compressed data of an oversized chunk stored in c.<x>.<z>.mcc"""
+        if self.region_x is None:
+            raise ValueError(f"Cannot locate external chunk: unexpected region name {self.filepath.name}")
+        absolute_x = self.region_x * 32 + (chunk_x & 31)
+        absolute_z = self.region_z * 32 + (chunk_z & 31)
+        return (self.filepath.parent / f"c.{absolute_x}.{absolute_z}.mcc").read_bytes()
+
+    def fetch(self, chunk_x, chunk_z, paths, probe=()):
+        """
+        Read only the requested paths of one chunk (see NBTStream.fetch)
+
+        Returns:
+            dict: {path: value}, empty if the chunk does not exist
+        """
+        data = self.read_chunk(chunk_x, chunk_z)
+        if data is None:
+            return {}
+        return NBTStream(fileobj=io.BytesIO(data)).fetch(paths, probe)
+
+
+def region_files(region_dir):
+    """Sorted region files of a region directory (no parsing)"""
+    try:
+        with os.scandir(region_dir) as entries:
+            files = [
+                entry.path for entry in entries
+                if _REGION_NAME.match(entry.name) and entry.is_file()
+            ]
+    except OSError:
+        return []
+    return sorted(files)
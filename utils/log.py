@@ -0,0 +1,50 @@
+"""
+Docstring for utils.log
+
+Logging setup shared by the GUI and the command line tools.
+
+Modules get their logger with `logging.getLogger(__name__)` and log:
+- DEBUG   per-item details (every modified slot, every file detected)
+- INFO    one line per file / operation
+- WARNING problems that do not stop the operation
+- ERROR   failed operations
+
+Usage
+
+from utils.log import setup_logging
+setup_logging(verbose=args.verbose, quiet=args.quiet)
+"""
+import logging
+
+
+def setup_logging(verbose=False, quiet=False):
+    """
+    Configure the root logger once for a program run.
+
+    Args:
+        verbose: Also show DEBUG messages (per-slot details)
+        quiet: Only show warnings and errors; use this for batch runs
+    """
+    if quiet:
+        level = logging.WARNING
+    elif verbose:
+        level = logging.DEBUG
+    else:
+        level = logging.INFO
+
+    logging.basicConfig(level=level, format="%(message)s", force=True)
+
+
+def add_logging_arguments(parser):
+    """Add the standard -v/--verbose and -q/--quiet flags to an argparse parser"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Show per-slot details"
+    )
+    group.add_argument(
+        "-q", "--quiet",
+        action="store_true",
+        help="Only show warnings and errors"
+    )
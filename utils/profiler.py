@@ -0,0 +1,294 @@
+"""
+Docstring for utils.profiler
+
+Lightweight timers and counters to see where the time goes.
+
+Profiling is off by default; while it is off span() and profiled() cost a
+flag check. Once enabled, every span records its duration. Spans nest per
+thread, so a world load shows how much of it went to reading, gunzipping,
+parsing, ... Results can be printed as a table or exported as a Chrome
+trace (open it in chrome://tracing or https://ui.perfetto.dev).
+
+Usage
+
+from utils import profiler
+
+profiler.enable()
+
+with profiler.span("nbt.parse", file=path):
+    ...
+
+@profiler.profiled("world.load_world_data")
+def load_world_data(...):
+    ...
+
+profiler.count("nbt.bytes_read", len(data))
+
+print(profiler.format_summary())
+profiler.write_trace("trace.json")
+"""
+import os
+import sys
+import json
+import time
+import functools
+import threading
+from collections import deque
+from contextlib import nullcontext
+
+# Trace events kept in memory; older ones are dropped past this
+MAX_EVENTS = 200000
+
+_enabled = False
+_lock = threading.Lock()
+_local = threading.local()
+_origin_ns = time.perf_counter_ns()
+
+_events = []  # [(name, thread id, start ns, duration ns, args)]
+_totals = {}  # {name: [count, total ns, max ns]}
+_counters = {}  # {name: value}
+_thread_names = {}  # {thread id: name}
+# Last finished top-level spans: (name, duration ns, {child name: ns})
+_recent = deque(maxlen=32)
+
+_NULL_SPAN = nullcontext()
+
+
+def enable():
+    """Start recording spans and counters"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Forget everything recorded so far"""
+    with _lock:
+        _events.clear()
+        _totals.clear()
+        _counters.clear()
+        _recent.clear()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start", "children")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.children = {}
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter_ns() - self.start
+        stack = _local.stack
+        stack.pop()
+
+        thread = threading.current_thread()
+        with _lock:
+            totals = _totals.get(self.name)
+            if totals is None:
+                _totals[self.name] = [1, duration, duration]
+            else:
+                totals[0] += 1
+                totals[1] += duration
+                totals[2] = max(totals[2], duration)
+
+            if len(_events) >= MAX_EVENTS:
+                del _events[:MAX_EVENTS // 10]
+            _events.append((self.name, thread.ident, self.start, duration, self.args))
+            _thread_names[thread.ident] = thread.name
+
+            if stack:
+                parent = stack[-1].children
+                parent[self.name] = parent.get(self.name, 0) + duration
+            else:
+                _recent.append((self.name, duration, self.children))
+        return False
+
+
+def span(name, **args):
+    """
+    Time a block of code
+
+    Args:
+        name: Span name, "<area>.<what>" (e.g. "nbt.parse")
+        **args: Extra values shown with the span in the trace
+
+    Returns:
+        A context manager (a no-op one while profiling is off)
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args or None)
+
+
+def profiled(name):
+    """Decorator timing every call of a function as span `name`"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name, None):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, value=1):
+    """Add value to counter `name` (e.g. bytes read, cache hits)"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def stats():
+    """
+    Returns:
+        dict: {span name: {"count", "total_ms", "max_ms"}}
+    """
+    with _lock:
+        return {
+            name: {
+                "count": n,
+                "total_ms": total / 1e6,
+                "max_ms": longest / 1e6,
+            }
+            for name, (n, total, longest) in _totals.items()
+        }
+
+
+def counters():
+    with _lock:
+        return dict(_counters)
+
+
+def format_summary():
+    """Spans (slowest total first) and counters as a text table"""
+    rows = sorted(stats().items(), key=lambda item: -item[1]["total_ms"])
+    lines = [f"{'span':<36} {'calls':>7} {'total ms':>10} {'max ms':>10}"]
+    for name, row in rows:
+        lines.append(
+            f"{name:<36} {row['count']:>7} {row['total_ms']:>10.1f} {row['max_ms']:>10.1f}"
+        )
+    for name, value in sorted(counters().items()):
+        lines.append(f"{name:<36} {value:>7}")
+    return "\n".join(lines)
+
+
+def last_readout(children=3, ui_prefix="ui."):
+    """
+    One line describing the last operation and the UI work that followed
+    it, e.g.
+    "world.load_world_data 142 ms (nbt.parse 90, nbt.gunzip 21) + ui 35 ms"
+
+    Args:
+        children: Number of slowest nested spans to list
+        ui_prefix: Spans counted as UI work rather than as an operation
+
+    Returns:
+        str: The readout, "" if nothing was recorded
+    """
+    with _lock:
+        recent = list(_recent)
+
+    ui_ns = 0
+    for name, duration, parts in reversed(recent):
+        if name.startswith(ui_prefix):
+            ui_ns += duration
+            continue
+        text = f"{name} {duration / 1e6:.0f} ms"
+        slowest = sorted(parts.items(), key=lambda item: -item[1])[:children]
+        if slowest:
+            text += " (" + ", ".join(f"{child} {ns / 1e6:.0f}" for child, ns in slowest) + ")"
+        if ui_ns:
+            text += f" + ui {ui_ns / 1e6:.0f} ms"
+        return text
+    return f"ui {ui_ns / 1e6:.0f} ms" if ui_ns else ""
+
+
+def write_trace(path):
+    """
+    Write the recorded spans as a Chrome trace (JSON object format)
+
+    Args:
+        path: Output file
+    """
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        thread_names = dict(_thread_names)
+        final_counters = dict(_counters)
+
+    trace = [
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+        for tid, name in thread_names.items()
+    ]
+    for name, tid, start, duration, args in events:
+        event = {
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "pid": pid,
+            "tid": tid,
+            "ts": (start - _origin_ns) / 1000,
+            "dur": duration / 1000,
+        }
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+        trace.append(event)
+    if final_counters:
+        end = max((start + duration for _, _, start, duration, _ in events), default=_origin_ns)
+        trace.append({
+            "name": "counters", "ph": "C", "pid": pid, "tid": 0,
+            "ts": (end - _origin_ns) / 1000, "args": final_counters,
+        })
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+
+def add_profile_arguments(parser):
+    """Add the standard --profile and --trace flags to an argparse parser"""
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print where the time went when done"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Write a Chrome trace (chrome://tracing, ui.perfetto.dev) to FILE when done"
+    )
+
+
+def setup_profiling(args):
+    """Enable profiling if --profile or --trace was given"""
+    if args.profile or args.trace:
+        enable()
+
+
+def finish_profiling(args, stream=None):
+    """Print the summary and write the trace requested on the command line"""
+    if args.profile:
+        print(format_summary(), file=stream or sys.stderr)
+    if args.trace:
+        write_trace(args.trace)
+        print(f"Trace written to {args.trace}", file=stream or sys.stderr)